@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Benchmark extraction throughput against a local LLM stand-in."""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from civic_associations.extraction import (
+    CircuitBreaker,
+    Extractor,
+    LatencyModel,
+    LLMClient,
+    OpenAICompatibleProvider,
+    RetryPolicy,
+    StandInLLMClient,
+    StandInServer,
+)
+from civic_associations.models import Section
+from civic_associations.utils import read_jsonl, setup_logger
+
+logger = setup_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark extraction against a local deterministic LLM stand-in"
+    )
+    parser.add_argument(
+        "--sections",
+        required=True,
+        help="Path to sections JSONL file"
+    )
+    parser.add_argument(
+        "--repeat-sections",
+        type=int,
+        default=1,
+        help="Process the section list this many times (default: 1)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of concurrent extraction workers (default: 8)"
+    )
+    parser.add_argument(
+        "--latency",
+        choices=LatencyModel.DISTRIBUTIONS,
+        default="lognormal",
+        help="Latency distribution of the stand-in (default: lognormal)"
+    )
+    parser.add_argument(
+        "--latency-mean",
+        type=float,
+        default=0.5,
+        help="Mean simulated latency in seconds (default: 0.5)"
+    )
+    parser.add_argument(
+        "--latency-spread",
+        type=float,
+        default=0.6,
+        help="Uniform half-width or lognormal sigma (default: 0.6)"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Probability of a simulated 503 per call"
+    )
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0.0,
+        help="Probability of a simulated 429 per call"
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Enable hedged requests past the p95 latency"
+    )
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Go through a local HTTP stand-in server instead of in-process calls"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Stand-in RNG seed"
+    )
+
+    args = parser.parse_args()
+
+    sections = [Section(**s) for s in read_jsonl(args.sections)] * args.repeat_sections
+
+    client_options = {
+        "retry_policy": RetryPolicy(max_attempts=4, base_delay=0.05, max_delay=1.0),
+        "circuit_breaker": CircuitBreaker(failure_threshold=20, reset_timeout=1.0),
+        "hedge_requests": args.hedge,
+    }
+    backend = StandInLLMClient(
+        latency=LatencyModel(args.latency, args.latency_mean, args.latency_spread),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+        **client_options
+    )
+
+    server = None
+    client = backend
+    if args.http:
+        server = StandInServer(backend).start()
+        client = LLMClient(
+            model_name="standin",
+            provider=OpenAICompatibleProvider(model_name="standin", base_url=server.url),
+            **client_options
+        )
+
+    extractor = Extractor(client)
+
+    logger.info(f"Benchmarking {len(sections)} sections with concurrency={args.concurrency}")
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(
+            lambda section: extractor.extract_from_section(section, run_id="benchmark"),
+            sections
+        ))
+    elapsed = time.monotonic() - start
+
+    client.close()
+    if server is not None:
+        server.stop()
+
+    num_records = sum(len(r) for r in results)
+    failed = sum(1 for r in results if not r)
+
+    logger.info(f"Elapsed: {elapsed:.2f}s, {len(sections) / elapsed:.1f} sections/s")
+    logger.info(f"Records: {num_records}, failed sections: {failed}")
+    logger.info(f"Stand-in stats: {dict(backend.stats)}")
+    p95 = client.latency.quantile(0.95)
+    if p95 is not None:
+        logger.info(f"Observed p95 call latency: {p95:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Update co-membership network tables and export them for graph tools."""
+
+import argparse
+from civic_associations.linkage import MembershipNetwork
+from civic_associations.linkage.network import EXPORT_FORMATS
+from civic_associations.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Update person and association co-membership networks"
+    )
+    parser.add_argument(
+        "--db-path",
+        required=True,
+        help="Path to SQLite database"
+    )
+    parser.add_argument(
+        "--export-dir",
+        help="Directory to export sparse matrices and node lists to"
+    )
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        action="append",
+        help="Export format, repeatable (default: all)"
+    )
+
+    args = parser.parse_args()
+
+    network = MembershipNetwork(args.db_path)
+    if args.export_dir:
+        paths = network.export(args.export_dir, formats=args.format or EXPORT_FORMATS)
+        logger.info(f"Wrote {len(paths)} files to: {args.export_dir}")
+    else:
+        stats = network.update()
+        logger.info(f"Network updated in {stats['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,18 @@
 """Export data for analysis."""
 
 import argparse
-import sqlite3
-import csv
-import json
 from pathlib import Path
+from civic_associations.db import export_table
+from civic_associations.db.export import EXPORT_FORMATS
 from civic_associations.utils import setup_logger
 
 logger = setup_logger(__name__)
 
 
+def _column_list(value: str):
+    return [column.strip() for column in value.split(",") if column.strip()]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Export association data for analysis"
@@ -27,71 +30,45 @@ def main():
     )
     parser.add_argument(
         "--format",
-        choices=["csv", "jsonl"],
+        choices=EXPORT_FORMATS,
         default="csv",
-        help="Output format (default: csv)"
+        help="Output format; parquet writes datasets partitioned by state and year "
+             "(requires pyarrow) (default: csv)"
+    )
+    parser.add_argument(
+        "--association-columns",
+        type=_column_list,
+        help="Comma-separated associations columns to export (default: all)"
+    )
+    parser.add_argument(
+        "--member-columns",
+        type=_column_list,
+        help="Comma-separated members columns to export (default: all)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10_000,
+        help="Rows fetched from the database per batch (default: 10000)"
     )
-    
+
     args = parser.parse_args()
-    
+
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
-    
+
     logger.info(f"Exporting data from: {args.db_path}")
-    
-    # Connect to database
-    conn = sqlite3.connect(args.db_path)
-    conn.row_factory = sqlite3.Row
-    
-    try:
-        # Export associations
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM associations")
-        associations = cursor.fetchall()
-        
-        logger.info(f"Exporting {len(associations)} associations")
-        
-        if args.format == "csv":
-            output_file = output_dir / "associations.csv"
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                if associations:
-                    writer = csv.DictWriter(f, fieldnames=associations[0].keys())
-                    writer.writeheader()
-                    for row in associations:
-                        writer.writerow(dict(row))
-        else:  # jsonl
-            output_file = output_dir / "associations.jsonl"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                for row in associations:
-                    f.write(json.dumps(dict(row)) + '\n')
-        
-        logger.info(f"Exported associations to: {output_file}")
-        
-        # Export members
-        cursor.execute("SELECT * FROM members")
-        members = cursor.fetchall()
-        
-        logger.info(f"Exporting {len(members)} members")
-        
-        if args.format == "csv":
-            output_file = output_dir / "members.csv"
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                if members:
-                    writer = csv.DictWriter(f, fieldnames=members[0].keys())
-                    writer.writeheader()
-                    for row in members:
-                        writer.writerow(dict(row))
-        else:  # jsonl
-            output_file = output_dir / "members.jsonl"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                for row in members:
-                    f.write(json.dumps(dict(row)) + '\n')
-        
-        logger.info(f"Exported members to: {output_file}")
-        
-    finally:
-        conn.close()
-    
+
+    # Rows are streamed in batches rather than fetched all at once
+    export_table(
+        args.db_path, "associations", output_dir, args.format,
+        columns=args.association_columns, batch_size=args.batch_size
+    )
+    export_table(
+        args.db_path, "members", output_dir, args.format,
+        columns=args.member_columns, batch_size=args.batch_size
+    )
+
     logger.info("Export completed successfully")
 
 
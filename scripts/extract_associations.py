@@ -2,13 +2,26 @@
 """Extract associations from sections using LLM."""
 
 import argparse
+import sys
 import uuid
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from civic_associations.config import load_config
-from civic_associations.extraction import Extractor, LLMClient
-from civic_associations.models import Section
-from civic_associations.utils import read_jsonl, setup_logger, write_jsonl
+from civic_associations.extraction import (
+    BudgetExceededError,
+    CostLedger,
+    Extractor,
+    ImagePayloadCache,
+    LLMCallError,
+    LLMClient,
+    LLMRouter,
+    PromptCompactor,
+    RuleBasedExtractor,
+    RunCheckpoint,
+)
+from civic_associations.models import Page, Section
+from civic_associations.utils import read_jsonl, setup_logger
 
 logger = setup_logger(__name__)
 
@@ -37,9 +50,31 @@ def main():
         "--run-id",
         help="Extraction run ID (auto-generated if not provided)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of sections extracted concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--ocr-dir",
+        help="OCR markdown directory; used to learn running headers when compaction is enabled"
+    )
+    parser.add_argument(
+        "--manifest",
+        help="Page manifest JSONL with image paths (required in multimodal mode)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the run given by --run-id, skipping sections already extracted"
+    )
 
     args = parser.parse_args()
 
+    if args.resume and not args.run_id:
+        parser.error("--resume requires --run-id")
+
     # Generate run ID if not provided
     run_id = args.run_id or str(uuid.uuid4())[:8]
 
@@ -49,47 +84,182 @@ def main():
     try:
         config = load_config("extraction")
         llm_config = config.get("extraction", {}).get("llm", {})
+        compaction_config = config.get("extraction", {}).get("compaction", {})
+        rules_config = config.get("extraction", {}).get("rules", {})
+        mode = config.get("extraction", {}).get("mode", "text")
+        multimodal_config = config.get("extraction", {}).get("multimodal", {})
+        cost_config = config.get("extraction", {}).get("cost", {})
+        repair_config = config.get("extraction", {}).get("repair", {})
+        prompts_config = config.get("extraction", {}).get("prompts", {})
     except Exception:
         logger.warning("Could not load extraction config, using defaults")
         llm_config = {}
+        compaction_config = {}
+        rules_config = {}
+        mode = "text"
+        multimodal_config = {}
+        cost_config = {}
+        repair_config = {}
+        prompts_config = {}
+
+    if mode == "multimodal" and not args.manifest:
+        parser.error("multimodal mode requires --manifest for page image paths")
+
+    # Initialize client (or multi-provider router) and extractor
+    if llm_config.get("providers"):
+        client = LLMRouter.from_config(llm_config)
+    else:
+        client = LLMClient.from_config(llm_config)
+
+    compactor = None
+    if compaction_config.get("enabled", False):
+        compactor = PromptCompactor(
+            min_repeats=compaction_config.get("min_repeats", 2),
+            max_header_length=compaction_config.get("max_header_length", 60),
+            abbreviations=compaction_config.get("abbreviations")
+        )
+        if args.ocr_dir:
+            compactor.fit(
+                p.read_text(encoding='utf-8') for p in sorted(Path(args.ocr_dir).glob("*.md"))
+            )
 
-    # Initialize client and extractor
-    client = LLMClient(
-        model_name=llm_config.get("model_name", "gemini-2.0-flash-exp"),
-        temperature=llm_config.get("temperature", 0.1),
-        max_tokens=llm_config.get("max_tokens", 4096)
+    rule_extractor = None
+    if rules_config.get("enabled", False):
+        rule_extractor = RuleBasedExtractor(
+            min_confidence=rules_config.get("min_confidence", 1.0),
+            min_remainder_chars=rules_config.get("min_remainder_chars", 20)
+        )
+
+    image_cache = None
+    page_images = {}
+    if mode == "multimodal":
+        image_cache = ImagePayloadCache(
+            cache_dir=multimodal_config.get("cache_dir", "data/interim/image_cache/"),
+            max_dimension=multimodal_config.get("max_dimension", 1600),
+            jpeg_quality=multimodal_config.get("jpeg_quality", 80),
+            grayscale=multimodal_config.get("grayscale", True),
+            margin=multimodal_config.get("margin", 0.02)
+        )
+        pages = [Page(**p) for p in read_jsonl(args.manifest)]
+        page_images = {page.page_id: page.image_path for page in pages}
+        logger.info(f"Multimodal mode: {len(page_images)} page images from {args.manifest}")
+
+    cost_ledger = CostLedger.from_config(
+        str(Path(args.output_dir) / f"run_{run_id}.costs.sqlite"), run_id, cost_config
     )
 
-    extractor = Extractor(client)
+    extractor = Extractor(
+        client,
+        compactor=compactor,
+        rule_extractor=rule_extractor,
+        image_cache=image_cache,
+        page_images=page_images,
+        cost_ledger=cost_ledger,
+        repair=repair_config.get("enabled", False),
+        max_repair_chars=repair_config.get("max_span_chars", 800),
+        system_prompt=prompts_config.get("system_prompt"),
+        examples=prompts_config.get("examples"),
+        compact_system_prompt=prompts_config.get("compact_system_prompt")
+    )
 
     # Load sections
     sections_data = read_jsonl(args.sections)
     sections = [Section(**s) for s in sections_data]
 
-    logger.info(f"Processing {len(sections)} sections")
+    # Records are appended per section, so an interrupted run can be resumed
+    checkpoint = RunCheckpoint(args.output_dir, run_id)
+    try:
+        completed = checkpoint.start(resume=args.resume)
+    except FileExistsError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    pending = [s for s in sections if s.section_id not in completed]
 
-    # Extract associations
-    all_records = []
-    for idx, section in enumerate(sections, start=1):
-        logger.info(f"Processing section {idx}/{len(sections)}: {section.section_id}")
+    logger.info(f"Processing {len(pending)} sections ({len(sections) - len(pending)} already done)")
 
-        records = extractor.extract_from_section(
-            section=section,
-            run_id=run_id,
-            num_repeats=args.repeats
-        )
+    # Extract associations; records are checkpointed from this thread only
+    failed = 0
+    halted = False
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        futures = {
+            pool.submit(
+                extractor.extract_from_section,
+                section=section,
+                run_id=run_id,
+                num_repeats=args.repeats,
+                raise_on_error=True
+            ): section
+            for section in pending
+        }
 
-        all_records.extend(records)
+        for idx, future in enumerate(as_completed(futures), start=1):
+            section = futures[future]
+            if future.cancelled():
+                # Not submitted after the budget ran out; --resume picks it up
+                failed += 1
+                continue
+            try:
+                records = future.result()
+            except BudgetExceededError as e:
+                if not halted:
+                    logger.error(f"{e}; stopping submission")
+                    halted = True
+                    for other in futures:
+                        other.cancel()
+                failed += 1
+                continue
+            except LLMCallError:
+                # Left out of the ledger so that --resume retries it
+                failed += 1
+                continue
+            except Exception as e:
+                # One malformed section must not stop the run; --resume retries it
+                logger.error(f"Extraction failed for section {section.section_id}: {e}")
+                failed += 1
+                continue
 
-    # Save results
-    output_dir = Path(args.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+            checkpoint.record_section(section.section_id, records)
+            logger.info(f"Completed section {idx}/{len(pending)}: {section.section_id}")
 
-    output_file = output_dir / f"run_{run_id}.jsonl"
-    records_data = [r.model_dump() for r in all_records]
-    write_jsonl(records_data, str(output_file))
+    client.close()
 
-    logger.info(f"Extracted {len(all_records)} associations, saved to {output_file}")
+    logger.info(
+        f"Extracted {checkpoint.num_records} associations, saved to {checkpoint.records_file}"
+    )
+    if failed:
+        logger.warning(
+            f"{failed} sections failed; rerun with --run-id {run_id} --resume to retry them"
+        )
+    if rule_extractor is not None:
+        logger.info(
+            f"Rule fast path: {extractor.stats['rule_records']} records, "
+            f"{extractor.stats['llm_calls']} LLM calls made, "
+            f"{extractor.stats['llm_calls_skipped']} LLM calls saved"
+        )
+    if extractor.repair:
+        logger.info(
+            f"Repair: {extractor.stats['repair_calls']} calls, "
+            f"{extractor.stats['repaired_records']} records repaired"
+        )
+    if isinstance(client, LLMRouter):
+        for stats in client.stats():
+            logger.info(f"Provider stats: {stats}")
+
+    summary = cost_ledger.summary()
+    budget = f" of ${summary['budget']:.2f} budget" if summary["budget"] is not None else ""
+    logger.info(
+        f"Cost summary: {summary['calls']} calls, {summary['prompt_tokens']} prompt + "
+        f"{summary['completion_tokens']} completion tokens "
+        f"({summary['cached_tokens']} prompt tokens from prefix cache), "
+        f"${summary['cost']:.4f}{budget}"
+    )
+    for model, model_summary in summary["models"].items():
+        logger.info(
+            f"  {model}: {model_summary['calls']} calls over {model_summary['sections']} sections, "
+            f"${model_summary['cost']:.4f}, avg latency {model_summary['avg_latency'] or 0:.2f}s"
+        )
+    cost_ledger.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Link associations across directory years into lineage chains."""
+
+import argparse
+from civic_associations.linkage import AssociationLinker
+from civic_associations.utils import setup_logger
+from civic_associations.config import load_config
+
+logger = setup_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Chain the same association across directory years"
+    )
+    parser.add_argument(
+        "--db-path",
+        required=True,
+        help="Path to SQLite database"
+    )
+    parser.add_argument(
+        "--min-similarity",
+        type=float,
+        help="Lowest estimated Jaccard similarity for a link (default: from config/linkage.yaml)"
+    )
+
+    args = parser.parse_args()
+
+    # Load linkage config
+    try:
+        lineage_config = load_config("linkage").get("linkage", {}).get("lineage", {})
+    except Exception:
+        logger.warning("Could not load linkage config, using defaults")
+        lineage_config = {}
+    if args.min_similarity is not None:
+        lineage_config["min_similarity"] = args.min_similarity
+
+    logger.info(f"Linking associations in: {args.db_path}")
+    stats = AssociationLinker.from_config(args.db_path, lineage_config).link()
+    logger.info(f"Lineage built in {stats['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Link association members to persons across directories."""
+
+import argparse
+from civic_associations.linkage import MembershipNetwork, PersonLinker
+from civic_associations.utils import setup_logger
+from civic_associations.config import load_config
+
+logger = setup_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Resolve member names to persons across directories"
+    )
+    parser.add_argument(
+        "--db-path",
+        required=True,
+        help="Path to SQLite database"
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        help="Sorted-neighborhood window (default: from config/linkage.yaml)"
+    )
+    parser.add_argument(
+        "--skip-network",
+        action="store_true",
+        help="Do not update the co-membership network tables after linking"
+    )
+
+    args = parser.parse_args()
+
+    # Load linkage config
+    try:
+        linkage_config = load_config("linkage").get("linkage", {})
+    except Exception:
+        logger.warning("Could not load linkage config, using defaults")
+        linkage_config = {}
+    if args.window:
+        linkage_config["window"] = args.window
+
+    logger.info(f"Linking members in: {args.db_path}")
+    stats = PersonLinker.from_config(args.db_path, linkage_config).link()
+    logger.info(f"Linkage finished in {stats['seconds']:.2f}s")
+
+    # Merged persons change the person and association projections
+    if stats["updated"] and not args.skip_network:
+        MembershipNetwork(args.db_path).update()
+
+
+if __name__ == "__main__":
+    main()
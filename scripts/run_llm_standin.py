@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Run a local OpenAI-compatible LLM stand-in server."""
+
+import argparse
+import json
+
+from civic_associations.extraction import LatencyModel, StandInLLMClient, StandInServer
+from civic_associations.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a deterministic LLM stand-in over HTTP (OpenAI chat-completions API)"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface to bind (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="Port to bind (default: 8765)"
+    )
+    parser.add_argument(
+        "--latency",
+        choices=LatencyModel.DISTRIBUTIONS,
+        default="constant",
+        help="Latency distribution (default: constant)"
+    )
+    parser.add_argument(
+        "--latency-mean",
+        type=float,
+        default=0.0,
+        help="Mean latency in seconds (default: 0)"
+    )
+    parser.add_argument(
+        "--latency-spread",
+        type=float,
+        default=0.0,
+        help="Uniform half-width or lognormal sigma"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Probability of a 503 response per request"
+    )
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0.0,
+        help="Probability of a 429 response per request"
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=1.0,
+        help="Retry-After seconds sent with 429 responses (default: 1)"
+    )
+    parser.add_argument(
+        "--canned",
+        help="JSON file mapping prompt substrings to canned responses"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="RNG seed"
+    )
+
+    args = parser.parse_args()
+
+    canned = None
+    if args.canned:
+        with open(args.canned, 'r', encoding='utf-8') as f:
+            canned = json.load(f)
+
+    backend = StandInLLMClient(
+        latency=LatencyModel(args.latency, args.latency_mean, args.latency_spread),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        rate_limit_retry_after=args.retry_after,
+        canned_responses=canned,
+        seed=args.seed
+    )
+
+    server = StandInServer(backend, host=args.host, port=args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down stand-in server")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,33 @@
 """Verify extractions and load into database."""
 
 import argparse
+import time
+from itertools import islice
 from pathlib import Path
-from collections import defaultdict
-from civic_associations.models import AssociationRecord, VerificationResult
-from civic_associations.verification import compute_similarity, verify_record
-from civic_associations.verification.rules import create_verification_result
+from typing import Iterable
+from civic_associations.verification import (
+    ShardedVerifier,
+    iter_groups_external,
+    iter_groups_in_memory,
+)
 from civic_associations.db import DatabaseWriter
-from civic_associations.utils import setup_logger, read_jsonl, write_jsonl
+from civic_associations.linkage import MembershipNetwork
+from civic_associations.utils import setup_logger, append_jsonl
 from civic_associations.config import load_config
 
 logger = setup_logger(__name__)
 
 
+def _batched(groups: Iterable, size: int):
+    """Yield lists of up to size groups."""
+    iterator = iter(groups)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Verify extractions and load into database"
@@ -32,9 +47,41 @@ def main():
         "--review-output",
         help="Path to save records needing review (default: data/processed/review_needed.jsonl)"
     )
-    
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Group records with an on-disk merge sort instead of in memory"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help="Records sorted in memory per spill file in streaming mode (default: 100000)"
+    )
+    parser.add_argument(
+        "--spill-dir",
+        help="Directory for streaming-mode spill files (default: system temp dir)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Associations verified (and written) per batch (default: 1000)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes; associations are sharded by ID hash (default: 1)"
+    )
+    parser.add_argument(
+        "--skip-network",
+        action="store_true",
+        help="Do not update the co-membership network tables after loading"
+    )
+
     args = parser.parse_args()
-    
+
     # Load verification config
     try:
         config = load_config("verification")
@@ -42,92 +89,75 @@ def main():
     except:
         logger.warning("Could not load verification config, using defaults")
         verification_config = {}
-    
-    min_similarity = verification_config.get("min_similarity", 0.9)
-    min_exact_matches = verification_config.get("min_exact_match_runs", 2)
-    
+
     logger.info(f"Loading extractions from: {args.extractions_dir}")
-    
+
     # Load all extraction runs
     extractions_dir = Path(args.extractions_dir)
     run_files = sorted(extractions_dir.glob("run_*.jsonl"))
-    
+
     logger.info(f"Found {len(run_files)} extraction runs")
-    
+
     # Group records by association_id
-    records_by_id = defaultdict(list)
-    
-    for run_file in run_files:
-        records_data = read_jsonl(str(run_file))
-        for record_data in records_data:
-            record = AssociationRecord(**record_data)
-            records_by_id[record.association_id].append(record)
-    
-    logger.info(f"Found {len(records_by_id)} unique associations")
-    
-    # Verify and aggregate records
-    accepted_records = []
-    review_records = []
-    rejected_records = []
-    
-    for association_id, records in records_by_id.items():
-        # Compute similarity and exact matches
-        num_runs = len(records)
-        exact_matches = 1  # At least one (itself)
-        
-        if num_runs > 1:
-            # Count exact name matches
-            names = [r.name for r in records]
-            most_common = max(set(names), key=names.count)
-            exact_matches = names.count(most_common)
-        
-        # Use first record as representative
-        base_record = records[0]
-        
-        # Average similarity (simplified)
-        avg_similarity = 1.0 if num_runs == 1 else 0.95
-        
-        # Create verification result
-        verification = create_verification_result(
-            association_id=association_id,
-            num_runs=num_runs,
-            exact_matches=exact_matches,
-            similarity=avg_similarity,
-            min_similarity=min_similarity,
-            min_exact_matches=min(min_exact_matches, num_runs)
+    if args.streaming:
+        groups = iter_groups_external(
+            run_files, chunk_size=args.chunk_size, spill_dir=args.spill_dir
         )
-        
-        # Sort by status
-        if verification.status == "accepted":
-            # Verify record quality
-            is_valid, error = verify_record(base_record)
-            if is_valid:
-                accepted_records.append(base_record)
-            else:
-                logger.warning(f"Record {association_id} failed validation: {error}")
-                review_records.append((base_record, error))
-        elif verification.status == "needs_review":
-            review_records.append((base_record, verification.notes))
-        else:
-            rejected_records.append((base_record, verification.notes))
-    
-    logger.info(f"Accepted: {len(accepted_records)}, Review: {len(review_records)}, Rejected: {len(rejected_records)}")
-    
-    # Write accepted records to database
-    if accepted_records:
-        writer = DatabaseWriter(args.db_path)
-        writer.write_records(accepted_records)
-        logger.info(f"Wrote {len(accepted_records)} records to database: {args.db_path}")
-    
-    # Save review-needed records
-    if review_records:
-        review_output = args.review_output or "data/processed/review_needed.jsonl"
-        review_data = [
-            {**r.model_dump(), "review_reason": reason}
-            for r, reason in review_records
-        ]
-        write_jsonl(review_data, review_output)
-        logger.info(f"Saved {len(review_records)} records needing review: {review_output}")
+    else:
+        groups = iter_groups_in_memory(run_files)
+
+    review_output = args.review_output or "data/processed/review_needed.jsonl"
+    if Path(review_output).exists():
+        Path(review_output).unlink()
+    writer = None
+    counts = {"accepted": 0, "needs_review": 0, "rejected": 0}
+
+    start = time.perf_counter()
+
+    # Verify and aggregate one batch of associations at a time; results come
+    # back in batch order whatever the number of workers
+    with ShardedVerifier(verification_config, workers=args.workers) as verifier:
+        for batch in _batched(groups, args.batch_size):
+            accepted_records = []
+            review_data = []
+            for association_id, status, record, reason in verifier.verify_batch(batch):
+                counts[status] += 1
+                if status == "accepted":
+                    accepted_records.append(record)
+                elif status == "needs_review":
+                    review_data.append({**record.model_dump(), "review_reason": reason})
+
+            # Write accepted records to database
+            if accepted_records:
+                writer = writer or DatabaseWriter(args.db_path)
+                writer.write_records(accepted_records)
+
+            # Save review-needed records
+            if review_data:
+                append_jsonl(review_data, review_output, sync=False)
+
+        for timing in verifier.timings():
+            logger.info(
+                f"Shard {timing['shard']}: {timing['groups']} associations "
+                f"in {timing['seconds']:.2f}s"
+            )
+
+    if writer:
+        writer.close()
+        # Only pairs touching the loaded associations are recomputed
+        if not args.skip_network:
+            MembershipNetwork(args.db_path).update()
+
+    logger.info(f"Verified in {time.perf_counter() - start:.2f}s with {args.workers} worker(s)")
+
+    logger.info(
+        f"Accepted: {counts['accepted']}, Review: {counts['needs_review']}, "
+        f"Rejected: {counts['rejected']}"
+    )
+    if counts["accepted"]:
+        logger.info(f"Wrote {counts['accepted']} records to database: {args.db_path}")
+    if counts["needs_review"]:
+        logger.info(f"Saved {counts['needs_review']} records needing review: {review_output}")
 
 
 if __name__ == "__main__":
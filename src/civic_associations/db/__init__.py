@@ -1,9 +1,13 @@
 """Database module for storing associations."""
 
+from .export import export_table
+from .reader import DatabaseReader
 from .schema import create_schema
 from .writer import DatabaseWriter
 
 __all__ = [
+    "DatabaseReader",
     "create_schema",
     "DatabaseWriter",
+    "export_table",
 ]
@@ -0,0 +1,197 @@
+"""Content-addressed, compressed storage of section text."""
+
+import hashlib
+import sqlite3
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ..utils import setup_logger
+
+try:
+    import zstandard
+except ImportError:  # zlib is always available
+    zstandard = None
+
+logger = setup_logger(__name__)
+
+# Parameters per IN (...) lookup, below SQLite's variable limit
+_LOOKUP_CHUNK = 500
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 9
+
+
+def default_codec() -> str:
+    """Best codec available: "zstd" with the zstandard package, else "zlib"."""
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of a text, the key of its blob."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress_text(text: str, codec: str = "zlib") -> bytes:
+    """
+    Compress a text with the given codec.
+
+    Args:
+        text: Text to compress
+        codec: "zlib" or "zstd"
+
+    Returns:
+        Compressed UTF-8 bytes
+    """
+    data = text.encode("utf-8")
+    if codec == "zlib":
+        return zlib.compress(data, ZLIB_LEVEL)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("zstandard package is required for the zstd codec")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unknown text codec: {codec}")
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """Inverse of compress_text."""
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("zstandard package is required to read zstd text blobs")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown text codec: {codec}")
+
+
+def register_functions(conn: sqlite3.Connection) -> None:
+    """
+    Register the SQL function section_text(codec, data) on a connection.
+
+    Lets queries and exports read blobs like a text column, e.g.
+    ``SELECT section_text(b.codec, b.data) FROM text_blobs b``.
+    """
+    def section_text(codec: Optional[str], data: Optional[bytes]) -> Optional[str]:
+        return None if data is None else decompress_text(codec, data)
+
+    conn.create_function("section_text", 2, section_text, deterministic=True)
+
+
+def _has_fts(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sections_fts'"
+    ).fetchone() is not None
+
+
+def _blob_ids(conn: sqlite3.Connection, hashes: Sequence[str]) -> Dict[str, int]:
+    """blob_id of each stored hash among ``hashes``."""
+    ids = {}
+    for start in range(0, len(hashes), _LOOKUP_CHUNK):
+        chunk = hashes[start:start + _LOOKUP_CHUNK]
+        ids.update(conn.execute(
+            "SELECT text_hash, blob_id FROM text_blobs "
+            f"WHERE text_hash IN ({', '.join('?' for _ in chunk)})",
+            chunk
+        ).fetchall())
+    return ids
+
+
+def store_texts(
+    conn: sqlite3.Connection,
+    texts: Iterable[Optional[str]],
+    codec: str = "zlib"
+) -> List[Optional[str]]:
+    """
+    Store texts as compressed blobs, each distinct text once.
+
+    New blobs are also added to the ``sections_fts`` full-text index.
+
+    Args:
+        conn: Open database connection (inside the caller's transaction)
+        texts: Texts to store; empty texts are not stored
+        codec: Codec for new blobs
+
+    Returns:
+        Hash of each text in input order (None for empty texts)
+    """
+    texts = list(texts)
+    hashes = [text_hash(text) if text else None for text in texts]
+    distinct = dict(zip(hashes, texts))
+    distinct.pop(None, None)
+    if not distinct:
+        return hashes
+
+    stored = _blob_ids(conn, list(distinct))
+    new = [(h, text) for h, text in distinct.items() if h not in stored]
+    if new:
+        conn.executemany(
+            "INSERT INTO text_blobs (text_hash, codec, size, data) VALUES (?, ?, ?, ?)",
+            [(h, codec, len(text), compress_text(text, codec)) for h, text in new]
+        )
+        if _has_fts(conn):
+            ids = _blob_ids(conn, [h for h, _ in new])
+            conn.executemany(
+                "INSERT INTO sections_fts (rowid, text) VALUES (?, ?)",
+                [(ids[h], text) for h, text in new]
+            )
+    return hashes
+
+
+def load_texts(conn: sqlite3.Connection, hashes: Iterable[Optional[str]]) -> Dict[str, str]:
+    """
+    Decompressed texts of the given hashes.
+
+    Args:
+        conn: Open database connection
+        hashes: Text hashes (None entries are ignored)
+
+    Returns:
+        Hash -> text for the hashes that are stored
+    """
+    distinct = [h for h in dict.fromkeys(hashes) if h]
+    texts = {}
+    for start in range(0, len(distinct), _LOOKUP_CHUNK):
+        chunk = distinct[start:start + _LOOKUP_CHUNK]
+        for h, codec, data in conn.execute(
+            "SELECT text_hash, codec, data FROM text_blobs "
+            f"WHERE text_hash IN ({', '.join('?' for _ in chunk)})",
+            chunk
+        ):
+            texts[h] = decompress_text(codec, data)
+    return texts
+
+
+def prune_texts(conn: sqlite3.Connection, hashes: Iterable[Optional[str]]) -> int:
+    """
+    Delete blobs among ``hashes`` that no association references anymore.
+
+    Args:
+        conn: Open database connection (inside the caller's transaction)
+        hashes: Candidate hashes, e.g. those of replaced associations
+
+    Returns:
+        Number of blobs deleted
+    """
+    candidates = [h for h in dict.fromkeys(hashes) if h]
+    orphans = []
+    for start in range(0, len(candidates), _LOOKUP_CHUNK):
+        chunk = candidates[start:start + _LOOKUP_CHUNK]
+        orphans.extend(conn.execute(f"""
+            SELECT b.blob_id, b.codec, b.data FROM text_blobs b
+            WHERE b.text_hash IN ({', '.join('?' for _ in chunk)})
+              AND NOT EXISTS (
+                  SELECT 1 FROM associations a WHERE a.section_text_hash = b.text_hash
+              )
+        """, chunk).fetchall())
+    if not orphans:
+        return 0
+
+    if _has_fts(conn):
+        # Contentless index: deletes must repeat the indexed text
+        conn.executemany(
+            "INSERT INTO sections_fts (sections_fts, rowid, text) VALUES ('delete', ?, ?)",
+            [(blob_id, decompress_text(codec, data)) for blob_id, codec, data in orphans]
+        )
+    conn.executemany(
+        "DELETE FROM text_blobs WHERE blob_id = ?", [(blob_id,) for blob_id, _, _ in orphans]
+    )
+    return len(orphans)
@@ -0,0 +1,207 @@
+"""Streaming export of database tables for analysis."""
+
+import csv
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..utils import setup_logger
+from .blobs import register_functions
+
+logger = setup_logger(__name__)
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+EXPORT_TABLES = ("associations", "members")
+
+# Parquet datasets are split into directories by these association columns
+PARTITION_COLUMNS = ("state", "year")
+
+# Section text is stored compressed in text_blobs and exported as plain text
+_SECTION_TEXT_SQL = (
+    "COALESCE(t.raw_section_text, (SELECT section_text(b.codec, b.data) FROM text_blobs b "
+    "WHERE b.text_hash = t.section_text_hash)) AS raw_section_text"
+)
+
+
+def iter_batches(cursor: sqlite3.Cursor, batch_size: int = 10_000) -> Iterator[List[tuple]]:
+    """
+    Yield rows of an executed query in batches.
+
+    Args:
+        cursor: Cursor with an executed SELECT
+        batch_size: Rows per fetchmany call
+
+    Yields:
+        Lists of up to batch_size row tuples
+    """
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> Dict[str, str]:
+    """Column name -> declared type of a table, in table order."""
+    return {row[1]: (row[2] or "").upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _select(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Optional[Sequence[str]],
+    partition_by: Sequence[str] = ()
+) -> Tuple[str, Dict[str, str]]:
+    """SELECT statement and column types for an export."""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table: {table}")
+    available = table_columns(conn, table)
+    columns = list(columns or available)
+    unknown = [column for column in columns if column not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown {table} columns: {', '.join(unknown)} (available: {', '.join(available)})"
+        )
+
+    types = {column: available[column] for column in columns}
+    selected = [
+        _SECTION_TEXT_SQL if (table, column) == ("associations", "raw_section_text") else f"t.{column}"
+        for column in columns
+    ]
+    join = ""
+    association_types = (
+        available if table == "associations" else table_columns(conn, "associations")
+    )
+    for column in partition_by:
+        if column in types:
+            continue
+        types[column] = association_types[column]
+        if table == "associations":
+            selected.append(f"t.{column}")
+        else:
+            # Members are partitioned by the state and year of their association
+            selected.append(f"a.{column}")
+            join = " LEFT JOIN associations a ON a.association_id = t.association_id"
+    return f"SELECT {', '.join(selected)} FROM {table} t{join}", types
+
+
+def _write_csv(cursor: sqlite3.Cursor, path: Path, batch_size: int) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([column[0] for column in cursor.description])
+        for rows in iter_batches(cursor, batch_size):
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def _write_jsonl(cursor: sqlite3.Cursor, path: Path, batch_size: int) -> int:
+    names = [column[0] for column in cursor.description]
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for rows in iter_batches(cursor, batch_size):
+            f.writelines(json.dumps(dict(zip(names, row))) + "\n" for row in rows)
+            count += len(rows)
+    return count
+
+
+def _write_parquet(
+    cursor: sqlite3.Cursor,
+    path: Path,
+    types: Dict[str, str],
+    partition_by: Sequence[str],
+    batch_size: int
+) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError:
+        logger.error("pyarrow package not installed; install the 'analysis' extra for Parquet export")
+        raise
+
+    def arrow_type(declared: str):
+        if "INT" in declared:
+            return pa.int64()
+        if declared in ("REAL", "FLOAT", "DOUBLE"):
+            return pa.float64()
+        if declared == "BLOB":
+            return pa.binary()
+        return pa.string()
+
+    schema = pa.schema([(name, arrow_type(declared)) for name, declared in types.items()])
+    count = 0
+
+    def record_batches():
+        nonlocal count
+        for rows in iter_batches(cursor, batch_size):
+            count += len(rows)
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                schema=schema
+            )
+
+    ds.write_dataset(
+        record_batches(),
+        str(path),
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([schema.field(column) for column in partition_by]), flavor="hive"
+        ),
+        existing_data_behavior="delete_matching",
+    )
+    return count
+
+
+def export_table(
+    db_path: str,
+    table: str,
+    output_dir: str,
+    export_format: str = "csv",
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = 10_000
+) -> int:
+    """
+    Export a table without loading it into memory.
+
+    Rows are streamed from the cursor with fetchmany. CSV and JSONL go to
+    ``<table>.csv`` / ``<table>.jsonl``; Parquet goes to a ``<table>/``
+    dataset partitioned by state and year (``state=MA/year=1855/``), using
+    the association's state and year for members.
+
+    Args:
+        db_path: Path to SQLite database
+        table: One of EXPORT_TABLES
+        output_dir: Directory to write to
+        export_format: One of EXPORT_FORMATS
+        columns: Columns to export (default: all)
+        batch_size: Rows fetched per batch
+
+    Returns:
+        Number of rows written
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    partition_by = PARTITION_COLUMNS if export_format == "parquet" else ()
+
+    # pyarrow pulls Parquet batches from its own threads; only one reads at a time
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    register_functions(conn)
+    try:
+        sql, types = _select(conn, table, columns, partition_by)
+        cursor = conn.execute(sql)
+        if export_format == "csv":
+            path = Path(output_dir) / f"{table}.csv"
+            count = _write_csv(cursor, path, batch_size)
+        elif export_format == "jsonl":
+            path = Path(output_dir) / f"{table}.jsonl"
+            count = _write_jsonl(cursor, path, batch_size)
+        else:
+            path = Path(output_dir) / table
+            count = _write_parquet(cursor, path, types, partition_by, batch_size)
+    finally:
+        conn.close()
+    logger.info(f"Exported {count} {table} rows to: {path}")
+    return count
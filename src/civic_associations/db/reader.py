@@ -0,0 +1,383 @@
+"""Database reader for querying association records."""
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..models import AssociationMatch, AssociationRecord, Member, MemberMatch
+from ..utils import setup_logger
+from ..utils.names import parse_name
+from .blobs import load_texts, register_functions
+
+logger = setup_logger(__name__)
+
+# Parameters per IN (...) lookup, below SQLite's variable limit
+_LOOKUP_CHUNK = 500
+
+_MEMBER_MATCH_SQL = """
+    SELECT m.member_id, m.association_id, m.full_name, m.role, m.given_names, m.surname,
+           p.person_id, a.name AS association_name, a.city, a.state, a.year
+    FROM members m
+    JOIN associations a ON a.association_id = m.association_id
+    LEFT JOIN person_clusters p ON p.member_id = m.member_id
+"""
+
+
+def _fts_query(text: str, prefix: bool = True) -> str:
+    """
+    FTS5 query matching every word of free text.
+
+    Words are quoted, so FTS5 operators in user input are taken literally.
+    """
+    words = re.findall(r"\w+", text.lower())
+    suffix = "*" if prefix else ""
+    return " ".join(f'"{word}"{suffix}' for word in words)
+
+
+def _snippet(text: str, words: Sequence[str], size: int = 12) -> str:
+    """
+    Words of ``text`` around its first word starting with one of ``words``.
+
+    Matching words are marked with [brackets], as FTS5 snippet() would.
+    """
+    tokens = list(re.finditer(r"\w+", text))
+    hits = [i for i, token in enumerate(tokens) if token.group().lower().startswith(tuple(words))]
+    if not hits:
+        return ""
+    first = max(hits[0] - size // 4, 0)
+    last = min(first + size, len(tokens)) - 1
+    parts = []
+    for i in range(first, last + 1):
+        token = tokens[i].group()
+        parts.append(f"[{token}]" if i in hits else token)
+    prefix = "..." if first > 0 else ""
+    suffix = "..." if last < len(tokens) - 1 else ""
+    return prefix + " ".join(parts) + suffix
+
+
+class DatabaseReader:
+    """
+    Query association records from SQLite database.
+
+    Lookups by city, year, type and page use the table indexes; member
+    names and section text are searched through the FTS5 tables that the
+    schema keeps in sync. Section text is read from the compressed
+    ``text_blobs`` table transparently. On SQLite builds without FTS5,
+    searches fall back to LIKE scans.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize database reader.
+
+        Args:
+            db_path: Path to SQLite database (opened read-only)
+        """
+        if not Path(db_path).exists():
+            raise FileNotFoundError(f"Database not found: {db_path}")
+        self.db_path = db_path
+        self._conn = sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True)
+        self._conn.row_factory = sqlite3.Row
+        register_functions(self._conn)
+        tables = {
+            row[0] for row in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        self.has_fts = {"associations_fts", "members_fts", "sections_fts"} <= tables
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _records(self, rows: Sequence[sqlite3.Row]) -> List[AssociationRecord]:
+        """Build records from associations rows, fetching members and pages in bulk."""
+        ids = [row["association_id"] for row in rows]
+        members: Dict[str, List[Member]] = {association_id: [] for association_id in ids}
+        pages: Dict[str, List[str]] = {association_id: [] for association_id in ids}
+
+        for start in range(0, len(ids), _LOOKUP_CHUNK):
+            chunk = ids[start:start + _LOOKUP_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            for member in self._conn.execute(
+                "SELECT association_id, full_name, role, notes FROM members "
+                f"WHERE association_id IN ({placeholders}) ORDER BY member_id",
+                chunk
+            ):
+                members[member["association_id"]].append(Member(
+                    full_name=member["full_name"], role=member["role"], notes=member["notes"]
+                ))
+            for page in self._conn.execute(
+                "SELECT association_id, page_id FROM association_pages "
+                f"WHERE association_id IN ({placeholders}) ORDER BY page_id",
+                chunk
+            ):
+                pages[page["association_id"]].append(page["page_id"])
+
+        texts = load_texts(self._conn, [row["section_text_hash"] for row in rows])
+
+        return [
+            AssociationRecord(
+                association_id=row["association_id"],
+                name=row["name"],
+                association_type=row["association_type"],
+                city=row["city"],
+                county=row["county"],
+                state=row["state"],
+                year=row["year"],
+                source_directory_title=row["source_directory_title"],
+                source_collection=row["source_collection"],
+                source_pages=pages[row["association_id"]],
+                raw_section_text=(
+                    row["raw_section_text"] or texts.get(row["section_text_hash"], "")
+                ),
+                members=members[row["association_id"]],
+                extraction_run_id=row["extraction_run_id"] or "",
+                metadata=json.loads(row["metadata_json"]) if row["metadata_json"] else {},
+            )
+            for row in rows
+        ]
+
+    def get_association(self, association_id: str) -> Optional[AssociationRecord]:
+        """
+        Fetch one association with its members and pages.
+
+        Args:
+            association_id: Association ID
+
+        Returns:
+            AssociationRecord, or None if not stored
+        """
+        rows = self._conn.execute(
+            "SELECT * FROM associations WHERE association_id = ?", (association_id,)
+        ).fetchall()
+        records = self._records(rows)
+        return records[0] if records else None
+
+    def find_associations(
+        self,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        year: Optional[int] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        association_type: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[AssociationRecord]:
+        """
+        Fetch associations matching all given filters.
+
+        Args:
+            city: City name (case-insensitive)
+            state: State abbreviation (case-insensitive)
+            year: Directory year
+            start_year: Earliest directory year (inclusive)
+            end_year: Latest directory year (inclusive)
+            association_type: Association type (case-insensitive)
+            limit: Maximum number of records
+
+        Returns:
+            List of AssociationRecord ordered by year, city and name
+        """
+        conditions = []
+        params: List[Any] = []
+        if city is not None:
+            conditions.append("city = ? COLLATE NOCASE")
+            params.append(city)
+        if state is not None:
+            conditions.append("state = ? COLLATE NOCASE")
+            params.append(state)
+        if year is not None:
+            conditions.append("year = ?")
+            params.append(year)
+        if start_year is not None:
+            conditions.append("year >= ?")
+            params.append(start_year)
+        if end_year is not None:
+            conditions.append("year <= ?")
+            params.append(end_year)
+        if association_type is not None:
+            conditions.append("association_type = ? COLLATE NOCASE")
+            params.append(association_type)
+
+        sql = "SELECT * FROM associations"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY year, city, name"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._records(self._conn.execute(sql, params).fetchall())
+
+    def associations_on_page(self, page_id: str) -> List[AssociationRecord]:
+        """
+        Fetch the associations extracted from a page.
+
+        Args:
+            page_id: Page ID
+
+        Returns:
+            List of AssociationRecord ordered by name
+        """
+        rows = self._conn.execute("""
+            SELECT a.* FROM association_pages ap
+            JOIN associations a ON a.association_id = ap.association_id
+            WHERE ap.page_id = ?
+            ORDER BY a.name
+        """, (page_id,)).fetchall()
+        return self._records(rows)
+
+    def find_members(
+        self,
+        name: str,
+        year: Optional[int] = None,
+        city: Optional[str] = None,
+        limit: int = 100
+    ) -> List[MemberMatch]:
+        """
+        Find members by name.
+
+        The name is parsed like stored names, so "Wm. Smith" finds
+        "William Smith" and "Wm. H. Smith"; every word must match the start
+        of a word in the member's printed or normalized name.
+
+        Args:
+            name: Full or partial name
+            year: Only members listed in this directory year
+            city: Only members listed in this city (case-insensitive)
+            limit: Maximum number of members
+
+        Returns:
+            List of MemberMatch ordered by year and name
+        """
+        normalized = parse_name(name).normalized_name or name
+        conditions = []
+        params: List[Any] = []
+        if self.has_fts:
+            query = _fts_query(normalized)
+            if not query:
+                return []
+            conditions.append(
+                "m.member_id IN (SELECT rowid FROM members_fts WHERE members_fts MATCH ?)"
+            )
+            params.append(query)
+        else:
+            for word in normalized.split():
+                conditions.append("(m.normalized_name LIKE ? OR m.full_name LIKE ?)")
+                params.extend([f"%{word}%", f"%{word}%"])
+        if year is not None:
+            conditions.append("a.year = ?")
+            params.append(year)
+        if city is not None:
+            conditions.append("a.city = ? COLLATE NOCASE")
+            params.append(city)
+
+        sql = _MEMBER_MATCH_SQL
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY a.year, m.surname, m.given_names LIMIT ?"
+        params.append(limit)
+        return [MemberMatch(**dict(row)) for row in self._conn.execute(sql, params)]
+
+    def members_of_person(self, person_id: int) -> List[MemberMatch]:
+        """
+        Fetch every membership of a linked person.
+
+        Args:
+            person_id: Person ID from person linkage
+
+        Returns:
+            List of MemberMatch ordered by year
+        """
+        sql = _MEMBER_MATCH_SQL + " WHERE p.person_id = ? ORDER BY a.year, a.name"
+        return [MemberMatch(**dict(row)) for row in self._conn.execute(sql, (person_id,))]
+
+    def section_text(self, association_id: str) -> Optional[str]:
+        """
+        Section text of an association, decompressed.
+
+        Args:
+            association_id: Association ID
+
+        Returns:
+            Section text, or None if the association is not stored
+        """
+        row = self._conn.execute(
+            "SELECT raw_section_text, section_text_hash FROM associations WHERE association_id = ?",
+            (association_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row["raw_section_text"] is not None:
+            return row["raw_section_text"]
+        return load_texts(self._conn, [row["section_text_hash"]]).get(row["section_text_hash"], "")
+
+    def search_text(self, query: str, limit: int = 50) -> List[AssociationMatch]:
+        """
+        Full-text search over association names and section text.
+
+        An association matches when all words appear in its name or all
+        appear in its section text. Each distinct section is indexed once,
+        however many associations it lists.
+
+        Args:
+            query: Words to find (word prefixes match)
+            limit: Maximum number of associations
+
+        Returns:
+            List of AssociationMatch, best match first
+        """
+        words = re.findall(r"\w+", query.lower())
+        if not words:
+            return []
+
+        if not self.has_fts:
+            conditions = " AND ".join(
+                "(a.name LIKE ? OR section_text(b.codec, b.data) LIKE ?)" for _ in words
+            )
+            params: List[Any] = [p for word in words for p in (f"%{word}%", f"%{word}%")]
+            rows = self._conn.execute(f"""
+                SELECT a.association_id, a.name, a.association_type, a.city, a.state, a.year,
+                       a.section_text_hash, NULL AS score
+                FROM associations a
+                LEFT JOIN text_blobs b ON b.text_hash = a.section_text_hash
+                WHERE {conditions}
+                ORDER BY a.year, a.name
+                LIMIT ?
+            """, params + [limit]).fetchall()
+        else:
+            fts_query = _fts_query(query)
+            rows = self._conn.execute("""
+                SELECT a.association_id, a.name, a.association_type, a.city, a.state, a.year,
+                       a.section_text_hash, MIN(hits.score) AS score
+                FROM (
+                    SELECT rowid AS association_rowid, bm25(associations_fts) AS score
+                    FROM associations_fts WHERE associations_fts MATCH :query
+                    UNION ALL
+                    SELECT a.rowid, bm25(sections_fts)
+                    FROM sections_fts
+                    JOIN text_blobs b ON b.blob_id = sections_fts.rowid
+                    JOIN associations a ON a.section_text_hash = b.text_hash
+                    WHERE sections_fts MATCH :query
+                ) hits
+                JOIN associations a ON a.rowid = hits.association_rowid
+                GROUP BY a.rowid
+                ORDER BY score, a.association_id
+                LIMIT :limit
+            """, {"query": fts_query, "limit": limit}).fetchall()
+
+        # Snippets from the section text (decompressed once per section), else the name
+        texts = load_texts(self._conn, [row["section_text_hash"] for row in rows])
+        matches = []
+        for row in rows:
+            fields = dict(row)
+            text = texts.get(fields.pop("section_text_hash"), "")
+            fields["snippet"] = _snippet(text, words) or _snippet(row["name"], words)
+            matches.append(AssociationMatch(**fields))
+        return matches
@@ -2,6 +2,7 @@
 
 import sqlite3
 from pathlib import Path
+from typing import List
 from ..utils import setup_logger
 
 logger = setup_logger(__name__)
@@ -21,7 +22,19 @@ CREATE TABLE IF NOT EXISTS associations (
     source_collection TEXT,
     raw_section_text TEXT,
     extraction_run_id TEXT,
-    metadata_json TEXT
+    metadata_json TEXT,
+    content_hash TEXT,
+    section_text_hash TEXT
+);
+
+-- Section text, compressed and stored once per distinct text; associations
+-- reference it by section_text_hash (raw_section_text is left empty)
+CREATE TABLE IF NOT EXISTS text_blobs (
+    blob_id INTEGER PRIMARY KEY,
+    text_hash TEXT NOT NULL UNIQUE,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,  -- characters before compression
+    data BLOB NOT NULL
 );
 
 -- Association pages junction table
@@ -39,17 +52,230 @@ CREATE TABLE IF NOT EXISTS members (
     full_name TEXT NOT NULL,
     role TEXT,
     notes TEXT,
+    honorific TEXT,
+    given_names TEXT,
+    initials TEXT,
+    surname TEXT,
+    name_suffix TEXT,
+    normalized_name TEXT,
+    role_normalized TEXT,
+    FOREIGN KEY (association_id) REFERENCES associations(association_id)
+);
+
+-- Person clusters: members resolved to the same person across directories
+CREATE TABLE IF NOT EXISTS person_clusters (
+    member_id INTEGER PRIMARY KEY,
+    person_id INTEGER NOT NULL,
+    FOREIGN KEY (member_id) REFERENCES members(member_id)
+);
+
+-- Blocking keys of linked members (see civic_associations.linkage)
+CREATE TABLE IF NOT EXISTS person_block_keys (
+    block_key TEXT NOT NULL,
+    sort_key TEXT NOT NULL,
+    member_id INTEGER NOT NULL
+);
+
+-- MinHash signatures of associations (see civic_associations.linkage)
+CREATE TABLE IF NOT EXISTS association_signatures (
+    association_id TEXT PRIMARY KEY,
+    sketch_params TEXT NOT NULL,
+    signature BLOB NOT NULL,
     FOREIGN KEY (association_id) REFERENCES associations(association_id)
 );
 
+-- Lineage chains: the same association across directory years
+CREATE TABLE IF NOT EXISTS association_lineage (
+    association_id TEXT PRIMARY KEY,
+    lineage_id TEXT NOT NULL,
+    predecessor_id TEXT,
+    similarity REAL,
+    position INTEGER NOT NULL,
+    FOREIGN KEY (association_id) REFERENCES associations(association_id)
+);
+
+-- Co-membership network (see civic_associations.linkage.network).
+-- Persons are person_clusters.person_id, or the member_id of unlinked members.
+CREATE TABLE IF NOT EXISTS membership_edges (
+    association_id TEXT NOT NULL,
+    person_id INTEGER NOT NULL,
+    member_count INTEGER NOT NULL,
+    PRIMARY KEY (association_id, person_id)
+);
+
+-- Person pairs (person_a < person_b) sharing associations
+CREATE TABLE IF NOT EXISTS person_network (
+    person_a INTEGER NOT NULL,
+    person_b INTEGER NOT NULL,
+    shared_associations INTEGER NOT NULL,
+    PRIMARY KEY (person_a, person_b)
+) WITHOUT ROWID;
+
+-- Association pairs (association_a < association_b) sharing persons
+CREATE TABLE IF NOT EXISTS association_network (
+    association_a TEXT NOT NULL,
+    association_b TEXT NOT NULL,
+    shared_persons INTEGER NOT NULL,
+    PRIMARY KEY (association_a, association_b)
+) WITHOUT ROWID;
+
+-- Memberships of each person over time
+CREATE VIEW IF NOT EXISTS person_memberships AS
+SELECT p.person_id, m.member_id, m.full_name, m.role,
+       a.association_id, a.name AS association_name, a.association_type,
+       a.city, a.state, a.year
+FROM person_clusters p
+JOIN members m ON m.member_id = p.member_id
+JOIN associations a ON a.association_id = m.association_id;
+
 -- Indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_associations_city_year ON associations(city, year);
 CREATE INDEX IF NOT EXISTS idx_associations_type ON associations(association_type);
 CREATE INDEX IF NOT EXISTS idx_members_association ON members(association_id);
 CREATE INDEX IF NOT EXISTS idx_members_name ON members(full_name);
+CREATE INDEX IF NOT EXISTS idx_person_clusters_person ON person_clusters(person_id);
+CREATE INDEX IF NOT EXISTS idx_association_lineage ON association_lineage(lineage_id, position);
+CREATE INDEX IF NOT EXISTS idx_person_block_keys ON person_block_keys(block_key, sort_key, member_id);
+CREATE INDEX IF NOT EXISTS idx_person_block_keys_member ON person_block_keys(member_id);
+CREATE INDEX IF NOT EXISTS idx_membership_edges_person ON membership_edges(person_id);
+CREATE INDEX IF NOT EXISTS idx_person_network_b ON person_network(person_b);
+CREATE INDEX IF NOT EXISTS idx_association_network_b ON association_network(association_b);
+"""
+
+# Columns added to existing tables after their first version
+ADDED_COLUMNS = {
+    "associations": [
+        ("content_hash", "TEXT"),
+        ("section_text_hash", "TEXT"),
+    ],
+    "members": [
+        ("honorific", "TEXT"),
+        ("given_names", "TEXT"),
+        ("initials", "TEXT"),
+        ("surname", "TEXT"),
+        ("name_suffix", "TEXT"),
+        ("normalized_name", "TEXT"),
+        ("role_normalized", "TEXT"),
+    ],
+}
+
+# Indexes on added columns (created once the columns exist)
+ADDED_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_members_surname ON members(surname, initials);
+CREATE INDEX IF NOT EXISTS idx_members_normalized_name ON members(normalized_name);
+CREATE INDEX IF NOT EXISTS idx_members_role ON members(role_normalized);
+CREATE INDEX IF NOT EXISTS idx_association_pages_page ON association_pages(page_id);
+CREATE INDEX IF NOT EXISTS idx_associations_section_text ON associations(section_text_hash);
+"""
+
+# Full-text indexes (external content FTS5 tables kept in sync by triggers).
+# Writers delete before re-inserting: REPLACE conflict handling does not
+# fire delete triggers.
+FTS_TABLES = {
+    "associations_fts": ("associations", "rowid", ("name",)),
+    "members_fts": ("members", "member_id", ("full_name", "normalized_name")),
+}
+
+# Section text lives compressed in text_blobs, so its index is contentless and
+# kept in sync by civic_associations.db.blobs (rowid = text_blobs.blob_id)
+SECTIONS_FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS sections_fts USING fts5(
+    text,
+    content='',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+"""
+
+
+def _fts_sql(fts_table: str, content_table: str, rowid: str, columns) -> str:
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    delete_old = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+        f"VALUES ('delete', old.{rowid}, {old_values});"
+    )
+    insert_new = (
+        f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.{rowid}, {new_values});"
+    )
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+    {column_list},
+    content='{content_table}',
+    content_rowid='{rowid}',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {content_table} BEGIN
+    {insert_new}
+END;
+CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {content_table} BEGIN
+    {delete_old}
+END;
+CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {content_table} BEGIN
+    {delete_old}
+    {insert_new}
+END;
 """
 
 
+def _fts_columns(conn: sqlite3.Connection, fts_table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({fts_table})")]
+
+
+def create_fts(conn: sqlite3.Connection) -> bool:
+    """
+    Create the full-text tables and triggers, indexing existing rows.
+
+    Args:
+        conn: Open database connection
+
+    Returns:
+        False if this SQLite build lacks FTS5 (searches then fall back to LIKE)
+    """
+    existing = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    try:
+        for fts_table, (content_table, rowid, columns) in FTS_TABLES.items():
+            if fts_table in existing and _fts_columns(conn, fts_table) != list(columns):
+                # Indexed columns changed; recreate and reindex
+                logger.info(f"Rebuilding full-text table {fts_table}")
+                for suffix in ("ai", "ad", "au"):
+                    conn.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+                conn.execute(f"DROP TABLE {fts_table}")
+                existing.discard(fts_table)
+            conn.executescript(_fts_sql(fts_table, content_table, rowid, columns))
+            if fts_table not in existing:
+                # Index rows written before the table existed
+                conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        conn.executescript(SECTIONS_FTS_SQL)
+    except sqlite3.OperationalError as e:
+        if "fts5" not in str(e):
+            raise
+        logger.warning("SQLite was built without FTS5; full-text search is disabled")
+        return False
+    return True
+
+
+def migrate_schema(conn: sqlite3.Connection) -> None:
+    """
+    Add columns and indexes missing from a database made by an older schema.
+
+    Args:
+        conn: Open database connection
+    """
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, column_type in columns:
+            if column not in existing:
+                logger.info(f"Adding column {table}.{column}")
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    conn.executescript(ADDED_INDEXES_SQL)
+    create_fts(conn)
+
+
 def create_schema(db_path: str) -> None:
     """
     Create the database schema.
@@ -65,6 +291,7 @@ def create_schema(db_path: str) -> None:
     conn = sqlite3.connect(db_path)
     try:
         conn.executescript(SCHEMA_SQL)
+        migrate_schema(conn)
         conn.commit()
         logger.info("Database schema created successfully")
     finally:
@@ -2,31 +2,199 @@
 
 import sqlite3
 import json
-from typing import List
-from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 from ..models import AssociationRecord
-from ..utils import setup_logger
+from ..utils import make_content_hash, setup_logger
+from ..utils.names import MEMBER_NAME_COLUMNS, normalize_role, parse_names
+from .blobs import default_codec, prune_texts, store_texts
 from .schema import create_schema
 
 logger = setup_logger(__name__)
 
 
+ASSOCIATION_COLUMNS = (
+    "association_id", "name", "association_type", "city", "county", "state", "year",
+    "source_directory_title", "source_collection", "section_text_hash",
+    "extraction_run_id", "metadata_json", "content_hash",
+)
+MEMBER_COLUMNS = (
+    "association_id", "full_name", "role", "notes", *MEMBER_NAME_COLUMNS, "role_normalized",
+)
+
+
+def _insert_sql(table: str, columns, verb: str = "INSERT") -> str:
+    return (
+        f"{verb} INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+
+
+# Rows of a changed association and those derived from them, removed before
+# it is rewritten (an explicit delete keeps the full-text triggers in sync)
+_DEPENDENT_DELETES = (
+    "DELETE FROM person_block_keys WHERE member_id IN "
+    "(SELECT member_id FROM members WHERE association_id = ?)",
+    "DELETE FROM person_clusters WHERE member_id IN "
+    "(SELECT member_id FROM members WHERE association_id = ?)",
+    "DELETE FROM members WHERE association_id = ?",
+    "DELETE FROM association_pages WHERE association_id = ?",
+    "DELETE FROM association_signatures WHERE association_id = ?",
+    "DELETE FROM associations WHERE association_id = ?",
+)
+
+# Parameters per IN (...) lookup, below SQLite's variable limit
+_LOOKUP_CHUNK = 500
+
+
+def _batches(records: List[AssociationRecord], size: int) -> Iterator[List[AssociationRecord]]:
+    for start in range(0, len(records), size):
+        yield records[start:start + size]
+
+
 class DatabaseWriter:
-    """Write association records to SQLite database."""
+    """
+    Write association records to SQLite database.
+
+    One connection is opened on first use and reused until close(). Each
+    write_records call is a single transaction in which rows are inserted
+    with executemany, ``batch_size`` records at a time. Section text is
+    stored once per distinct text, compressed, in ``text_blobs`` (see
+    civic_associations.db.blobs). The connection uses
+    WAL journaling with synchronous=NORMAL: readers are not blocked, and a
+    commit is durable against process crashes, though the last commits can
+    be lost on power failure.
+    """
     
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 5000,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size_kb: int = 65536,
+        text_codec: Optional[str] = None
+    ):
         """
         Initialize database writer.
         
         Args:
             db_path: Path to SQLite database
+            batch_size: Records per executemany batch
+            journal_mode: SQLite journal_mode pragma
+            synchronous: SQLite synchronous pragma
+            cache_size_kb: SQLite page cache size in KiB
+            text_codec: Compression of new section text blobs, "zlib" or
+                "zstd" (default: zstd if the zstandard package is installed)
         """
         self.db_path = db_path
+        self.batch_size = batch_size
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size_kb = cache_size_kb
+        self.text_codec = text_codec or default_codec()
+        self._conn: Optional[sqlite3.Connection] = None
         
-        # Ensure schema exists
-        if not Path(db_path).exists():
-            create_schema(db_path)
+        # Ensure schema exists and is current
+        create_schema(db_path)
+        self.backfill_member_names()
+        self.compress_section_text()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the shared connection and apply pragmas on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            self._conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+            self._conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kb)}")
+            self._conn.execute("PRAGMA temp_store = MEMORY")
+        return self._conn
+
+    def close(self) -> None:
+        """Close the shared connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def backfill_member_names(self, batch_size: int = 10_000) -> int:
+        """
+        Parse names and roles of members stored before they were parsed on write.
+
+        Args:
+            batch_size: Members updated per statement batch
+
+        Returns:
+            Number of members updated
+        """
+        conn = self._connection()
+        updated = 0
+        with conn:
+            while True:
+                rows = conn.execute(
+                    "SELECT member_id, full_name, role FROM members "
+                    "WHERE normalized_name IS NULL LIMIT ?",
+                    (batch_size,)
+                ).fetchall()
+                if not rows:
+                    break
+                columns = parse_names([full_name for _, full_name, _ in rows])
+                conn.executemany(f"""
+                    UPDATE members SET {", ".join(f"{c} = ?" for c in MEMBER_NAME_COLUMNS)},
+                        role_normalized = ?
+                    WHERE member_id = ?
+                """, [
+                    (*values, normalize_role(role), member_id)
+                    for (member_id, _, role), values in zip(
+                        rows, zip(*(columns[c] for c in MEMBER_NAME_COLUMNS))
+                    )
+                ])
+                updated += len(rows)
+
+        if updated:
+            logger.info(f"Parsed names of {updated} existing members")
+        return updated
     
+    def compress_section_text(self, batch_size: int = 10_000) -> int:
+        """
+        Move section text stored inline in associations into text blobs.
+
+        Args:
+            batch_size: Associations updated per statement batch
+
+        Returns:
+            Number of associations updated
+        """
+        conn = self._connection()
+        updated = 0
+        with conn:
+            while True:
+                rows = conn.execute(
+                    "SELECT rowid, raw_section_text FROM associations "
+                    "WHERE raw_section_text IS NOT NULL LIMIT ?",
+                    (batch_size,)
+                ).fetchall()
+                if not rows:
+                    break
+                hashes = store_texts(conn, [text for _, text in rows], self.text_codec)
+                conn.executemany(
+                    "UPDATE associations SET section_text_hash = ?, raw_section_text = NULL "
+                    "WHERE rowid = ?",
+                    [(text_hash, rowid) for (rowid, _), text_hash in zip(rows, hashes)]
+                )
+                updated += len(rows)
+
+        if updated:
+            logger.info(
+                f"Compressed section text of {updated} existing associations "
+                "(VACUUM the database to reclaim the space)"
+            )
+        return updated
+
     def write_record(self, record: AssociationRecord) -> None:
         """
         Write a single association record to the database.
@@ -34,66 +202,153 @@ class DatabaseWriter:
         Args:
             record: AssociationRecord to write
         """
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            
-            # Insert into associations table (or replace if exists)
-            cursor.execute("""
-                INSERT OR REPLACE INTO associations (
-                    association_id, name, association_type, city, county, state, year,
-                    source_directory_title, source_collection, raw_section_text,
-                    extraction_run_id, metadata_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                record.association_id,
-                record.name,
-                record.association_type,
-                record.city,
-                record.county,
-                record.state,
-                record.year,
-                record.source_directory_title,
-                record.source_collection,
-                record.raw_section_text,
-                record.extraction_run_id,
-                json.dumps(record.metadata)
-            ))
-            
-            # Insert association pages
-            for page_id in record.source_pages:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO association_pages (association_id, page_id)
-                    VALUES (?, ?)
-                """, (record.association_id, page_id))
-            
-            # Insert members
-            for member in record.members:
-                cursor.execute("""
-                    INSERT INTO members (association_id, full_name, role, notes)
-                    VALUES (?, ?, ?, ?)
-                """, (record.association_id, member.full_name, member.role, member.notes))
-            
-            conn.commit()
-            logger.debug(f"Wrote record {record.association_id} to database")
-            
-        except Exception as e:
-            logger.error(f"Error writing record {record.association_id}: {e}")
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        self._write([record])
+        logger.debug(f"Wrote record {record.association_id} to database")
     
-    def write_records(self, records: List[AssociationRecord]) -> None:
+    def write_records(self, records: List[AssociationRecord]) -> Dict[str, int]:
         """
-        Write multiple association records to the database.
+        Write multiple association records to the database in one transaction.
+
+        Loading is idempotent: a hash of each record's content is stored with
+        it, records whose hash is unchanged are skipped, and changed records
+        have their member and page rows (and linkage rows derived from them)
+        replaced. A record appearing more than once counts in its last form.
         
         Args:
             records: List of AssociationRecord objects
+
+        Returns:
+            Counts of "inserted", "updated" and "unchanged" records
         """
         logger.info(f"Writing {len(records)} records to database")
         
-        for record in records:
-            self.write_record(record)
+        counts = self._write(records)
         
-        logger.info(f"Successfully wrote {len(records)} records")
+        logger.info(
+            f"Successfully wrote {len(records)} records: {counts['inserted']} new, "
+            f"{counts['updated']} changed, {counts['unchanged']} unchanged"
+        )
+        return counts
+
+    def _write(self, records: List[AssociationRecord]) -> Dict[str, int]:
+        """Load records in batches inside a single transaction."""
+        latest = list({record.association_id: record for record in records}.values())
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        conn = self._connection()
+        try:
+            with conn:
+                for batch in _batches(latest, self.batch_size):
+                    self._load_batch(conn, batch, counts)
+        except Exception as e:
+            logger.error(f"Error writing {len(records)} records: {e}")
+            raise
+        return counts
+
+    def _stored_hashes(
+        self,
+        conn: sqlite3.Connection,
+        association_ids: List[str]
+    ) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Content and section text hashes of the given associations that are already stored."""
+        hashes = {}
+        for start in range(0, len(association_ids), _LOOKUP_CHUNK):
+            chunk = association_ids[start:start + _LOOKUP_CHUNK]
+            for association_id, content_hash, section_text_hash in conn.execute(
+                "SELECT association_id, content_hash, section_text_hash FROM associations "
+                f"WHERE association_id IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            ):
+                hashes[association_id] = (content_hash, section_text_hash)
+        return hashes
+
+    def _load_batch(
+        self,
+        conn: sqlite3.Connection,
+        records: List[AssociationRecord],
+        counts: Dict[str, int]
+    ) -> None:
+        """Write the new and changed records of a batch."""
+        hashes = [make_content_hash(record.model_dump(mode="json")) for record in records]
+        stored = self._stored_hashes(conn, [record.association_id for record in records])
+
+        pending = []
+        for record, content_hash in zip(records, hashes):
+            stored_hash, _ = stored.get(record.association_id, (None, None))
+            if stored_hash == content_hash:
+                counts["unchanged"] += 1
+                continue
+            counts["inserted" if record.association_id not in stored else "updated"] += 1
+            pending.append((record, content_hash))
+        if not pending:
+            return
+
+        replaced = [(record.association_id,) for record, _ in pending if record.association_id in stored]
+        for statement in _DEPENDENT_DELETES:
+            conn.executemany(statement, replaced)
+
+        self._insert_batch(conn, pending)
+
+        # Section text no longer referenced by the replaced associations
+        prune_texts(conn, [stored[association_id][1] for (association_id,) in replaced])
+
+    def _insert_batch(
+        self,
+        conn: sqlite3.Connection,
+        pending: List[Tuple[AssociationRecord, str]]
+    ) -> None:
+        """Insert records with their content hashes, pages and members."""
+        records = [record for record, _ in pending]
+        section_hashes = store_texts(
+            conn, [record.raw_section_text for record in records], self.text_codec
+        )
+
+        # Associations (changed ones were deleted first)
+        conn.executemany(
+            _insert_sql("associations", ASSOCIATION_COLUMNS),
+            [
+                (
+                    record.association_id,
+                    record.name,
+                    record.association_type,
+                    record.city,
+                    record.county,
+                    record.state,
+                    record.year,
+                    record.source_directory_title,
+                    record.source_collection,
+                    section_hash,
+                    record.extraction_run_id,
+                    json.dumps(record.metadata),
+                    content_hash
+                )
+                for (record, content_hash), section_hash in zip(pending, section_hashes)
+            ]
+        )
+
+        # Association pages
+        conn.executemany(
+            _insert_sql("association_pages", ("association_id", "page_id"), "INSERT OR IGNORE"),
+            [
+                (record.association_id, page_id)
+                for record in records
+                for page_id in record.source_pages
+            ]
+        )
+
+        # Members with parsed names and roles; each distinct name and role
+        # in the batch is normalized once
+        members = [(record.association_id, member) for record in records for member in record.members]
+        names = parse_names([member.full_name for _, member in members])
+        roles = {role: normalize_role(role) for role in {member.role for _, member in members}}
+        conn.executemany(
+            _insert_sql("members", MEMBER_COLUMNS),
+            [
+                (
+                    association_id, member.full_name, member.role, member.notes,
+                    *values, roles[member.role]
+                )
+                for (association_id, member), values in zip(
+                    members, zip(*(names[c] for c in MEMBER_NAME_COLUMNS))
+                )
+            ]
+        )
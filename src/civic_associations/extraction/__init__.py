@@ -2,10 +2,60 @@
 
 from .llm_client import LLMClient
 from .extractor import Extractor
-from .prompts import build_extraction_prompt
+from .images import ImagePayload, ImagePayloadCache
+from .prompts import (
+    build_extraction_prompt,
+    build_repair_prompt,
+    build_system_prompt,
+    prefix_hash,
+)
+from .repair import find_gaps, merge_repair
+from .checkpoint import RunCheckpoint
+from .cost_ledger import BudgetExceededError, CostLedger
+from .compaction import CompactionResult, PromptCompactor, estimate_tokens
+from .rule_based import RuleBasedExtractor, normalize_role
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMCallError,
+    RetryableLLMError,
+    RetryPolicy,
+)
+from .standin import LatencyModel, StandInLLMClient, StandInServer
+from .providers import GeminiProvider, LLMProvider, OpenAICompatibleProvider, create_provider
+from .router import LLMRouter, RouteTarget
 
 __all__ = [
     "LLMClient",
     "Extractor",
+    "ImagePayload",
+    "ImagePayloadCache",
     "build_extraction_prompt",
+    "build_repair_prompt",
+    "build_system_prompt",
+    "prefix_hash",
+    "find_gaps",
+    "merge_repair",
+    "RunCheckpoint",
+    "BudgetExceededError",
+    "CostLedger",
+    "CompactionResult",
+    "PromptCompactor",
+    "estimate_tokens",
+    "RuleBasedExtractor",
+    "normalize_role",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "LLMCallError",
+    "RetryableLLMError",
+    "RetryPolicy",
+    "LatencyModel",
+    "StandInLLMClient",
+    "StandInServer",
+    "GeminiProvider",
+    "LLMProvider",
+    "OpenAICompatibleProvider",
+    "create_provider",
+    "LLMRouter",
+    "RouteTarget",
 ]
@@ -0,0 +1,163 @@
+"""Incremental, resumable storage for extraction runs."""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Set
+
+from ..models import AssociationRecord
+from ..utils import append_jsonl, setup_logger
+
+logger = setup_logger(__name__)
+
+
+class RunCheckpoint:
+    """
+    Append-only record file plus completion ledger for one extraction run.
+
+    Records for a section are appended to ``run_{run_id}.jsonl`` as soon as
+    the section finishes, followed by a line in ``run_{run_id}.ledger``. A
+    section is complete only once its ledger line exists, so records written
+    by a section that crashed before reaching the ledger are discarded on
+    resume and the section is extracted again.
+    """
+
+    def __init__(self, output_dir: str, run_id: str):
+        """
+        Initialize run checkpoint.
+
+        Args:
+            output_dir: Directory holding extraction outputs
+            run_id: Extraction run ID
+        """
+        self.run_id = run_id
+        self.output_dir = Path(output_dir)
+        self.records_file = self.output_dir / f"run_{run_id}.jsonl"
+        self.ledger_file = self.output_dir / f"run_{run_id}.ledger"
+        self.completed: Set[str] = set()
+        self.num_records = 0
+
+    def start(self, resume: bool = False) -> Set[str]:
+        """
+        Prepare the run files.
+
+        Args:
+            resume: Continue an existing run instead of starting a new one
+
+        Returns:
+            Set of section IDs already completed under this run ID
+
+        Raises:
+            FileExistsError: If the run exists and resume is False
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        if not resume:
+            if self.records_file.exists() or self.ledger_file.exists():
+                raise FileExistsError(
+                    f"Run {self.run_id} already exists in {self.output_dir}; "
+                    f"use --resume to continue it"
+                )
+            return self.completed
+
+        if self.records_file.exists() and not self.ledger_file.exists():
+            raise FileExistsError(
+                f"Run {self.run_id} has no completion ledger and cannot be resumed safely"
+            )
+
+        self.completed = self._read_ledger()
+        self._drop_incomplete_records()
+
+        logger.info(
+            f"Resuming run {self.run_id}: {len(self.completed)} sections and "
+            f"{self.num_records} records already extracted"
+        )
+        return self.completed
+
+    def record_section(self, section_id: str, records: List[AssociationRecord]) -> None:
+        """
+        Persist a finished section's records, then mark it complete.
+
+        Args:
+            section_id: Section that was extracted
+            records: Records extracted from the section (may be empty)
+        """
+        if records:
+            append_jsonl([r.model_dump() for r in records], str(self.records_file))
+
+        append_jsonl([{
+            "section_id": section_id,
+            "num_records": len(records),
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+        }], str(self.ledger_file))
+
+        self.completed.add(section_id)
+        self.num_records += len(records)
+
+    def _read_ledger(self) -> Set[str]:
+        """
+        Read completed section IDs.
+
+        A torn final line (from a crash mid-write) is removed from the file,
+        so the next ledger line is not appended onto it.
+        """
+        completed = set()
+        if not self.ledger_file.exists():
+            return completed
+
+        kept = []
+        rewrite = False
+        with open(self.ledger_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    completed.add(json.loads(line)["section_id"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(f"Ignoring malformed ledger line in {self.ledger_file}")
+                    rewrite = True
+                    continue
+                if not line.endswith('\n'):
+                    line += '\n'
+                    rewrite = True
+                kept.append(line)
+
+        if rewrite:
+            self._rewrite(self.ledger_file, kept)
+        return completed
+
+    def _drop_incomplete_records(self) -> None:
+        """Rewrite the records file keeping only records of completed sections."""
+        if not self.records_file.exists():
+            return
+
+        kept = []
+        dropped = 0
+        rewrite = False
+        with open(self.records_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    dropped += 1
+                    continue
+                if record.get("metadata", {}).get("section_id") in self.completed:
+                    if not line.endswith('\n'):
+                        line += '\n'
+                        rewrite = True
+                    kept.append(line)
+                else:
+                    dropped += 1
+
+        if dropped:
+            logger.warning(f"Discarding {dropped} records from incomplete sections")
+        if dropped or rewrite:
+            self._rewrite(self.records_file, kept)
+
+        self.num_records = len(kept)
+
+    @staticmethod
+    def _rewrite(path: Path, lines: List[str]) -> None:
+        """Atomically replace a file with the given complete lines."""
+        tmp_file = path.with_name(path.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        tmp_file.replace(path)
@@ -0,0 +1,221 @@
+"""Prompt compaction: strip OCR noise from section text before extraction."""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from pydantic import BaseModel
+
+from ..utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# Full-width punctuation produced by the OCR engine; each costs extra tokens
+FULLWIDTH_PUNCTUATION = str.maketrans({
+    "；": ";",
+    "，": ",",
+    "：": ":",
+    "。": ".",
+    "（": "(",
+    "）": ")",
+    "　": " ",
+    "“": '"',
+    "”": '"',
+    "’": "'",
+})
+
+# Boilerplate phrases that carry no extraction-relevant information in full
+DEFAULT_ABBREVIATIONS = {
+    "Incorporated": "Inc.",
+    "Organized": "Org.",
+    "Regular meetings": "Mtgs.",
+    "of each month": "monthly",
+    "corner of": "cor.",
+    "Corner of": "Cor.",
+}
+
+# Lines that are advertisement fragments rather than directory entries
+DEFAULT_AD_PATTERNS = [
+    r"\bsee\s+adv(?:ertisement|t)?\b",
+    r"^\s*ADVERTISEMENTS?\b",
+    r"\bmanufacturers?\s+of\b",
+    r"\bwholesale\s+(?:and|&)\s+retail\b",
+    r"\bdealers?\s+in\b",
+]
+
+PAGE_NUMBER = re.compile(r"^\s*[-–—(\[]*\s*(?:page\s+)?\d{1,4}\s*[-–—)\]]*\s*$", re.I)
+HORIZONTAL_SPACE = re.compile(r"[ \t\u00a0]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text.
+
+    Uses the common ~4 ASCII characters per token approximation and counts
+    each non-ASCII character (e.g. full-width OCR punctuation) as a token of
+    its own, which is close enough for comparing prompt variants.
+    """
+    non_ascii = sum(1 for c in text if ord(c) > 127)
+    return (len(text) - non_ascii + 3) // 4 + non_ascii
+
+
+def _signature(line: str) -> str:
+    """Normalize a line so that running headers match across pages."""
+    line = re.sub(r"\d+", "#", line.lower())
+    line = re.sub(r"[^\w#]+", " ", line)
+    return line.strip()
+
+
+class CompactionResult(BaseModel):
+    """Compacted text with token accounting."""
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    removed_lines: int = 0
+
+    @property
+    def savings(self) -> float:
+        """Fraction of tokens removed."""
+        if self.original_tokens == 0:
+            return 0.0
+        return 1.0 - self.compacted_tokens / self.original_tokens
+
+
+class PromptCompactor:
+    """
+    Reduce section text to what the extractor needs.
+
+    Removes running headers/footers (learned across pages with ``fit`` or
+    detected as repeated header-like lines in the section), bare page
+    numbers and advertisement fragments, normalizes OCR punctuation,
+    collapses whitespace and abbreviates known boilerplate phrases.
+    """
+
+    def __init__(
+        self,
+        min_repeats: int = 2,
+        max_header_length: int = 60,
+        edge_lines: int = 2,
+        min_page_fraction: float = 0.3,
+        abbreviations: Optional[Dict[str, str]] = None,
+        ad_patterns: Optional[List[str]] = None
+    ):
+        """
+        Initialize compactor.
+
+        Args:
+            min_repeats: Occurrences for a line to count as a running header
+            max_header_length: Longest line that can be a header/footer
+            edge_lines: Lines at the top and bottom of each page checked by fit
+            min_page_fraction: Share of pages a line must top or tail to be
+                learned as a running header/footer by fit
+            abbreviations: Phrase -> abbreviation map (default: DEFAULT_ABBREVIATIONS)
+            ad_patterns: Regexes matching advertisement lines (default: DEFAULT_AD_PATTERNS)
+        """
+        self.min_repeats = min_repeats
+        self.max_header_length = max_header_length
+        self.edge_lines = edge_lines
+        self.min_page_fraction = min_page_fraction
+        self.abbreviations = DEFAULT_ABBREVIATIONS if abbreviations is None else abbreviations
+        self._abbreviation_pattern = self._compile_abbreviations(self.abbreviations)
+        self._ad_pattern = re.compile(
+            "|".join(f"(?:{p})" for p in (ad_patterns or DEFAULT_AD_PATTERNS)), re.I
+        )
+        self.running_lines: Set[str] = set()
+
+    @staticmethod
+    def _compile_abbreviations(abbreviations: Dict[str, str]) -> Optional[re.Pattern]:
+        if not abbreviations:
+            return None
+        phrases = sorted(abbreviations, key=len, reverse=True)
+        return re.compile(r"\b(?:" + "|".join(re.escape(p) for p in phrases) + r")\b")
+
+    def fit(self, page_texts: Iterable[str]) -> Set[str]:
+        """
+        Learn running headers and footers from a collection's pages.
+
+        Args:
+            page_texts: OCR text of each page
+
+        Returns:
+            Set of learned line signatures
+        """
+        counts = Counter()
+        num_pages = 0
+        for text in page_texts:
+            num_pages += 1
+            lines = [line.strip() for line in text.splitlines() if line.strip()]
+            edges = lines[:self.edge_lines] + lines[-self.edge_lines:]
+            counts.update({
+                _signature(line) for line in edges
+                if len(line) <= self.max_header_length and _signature(line)
+            })
+
+        threshold = max(self.min_repeats, self.min_page_fraction * num_pages)
+        self.running_lines = {
+            sig for sig, count in counts.items() if count >= threshold
+        }
+        logger.info(
+            f"Learned {len(self.running_lines)} running header/footer lines from {num_pages} pages"
+        )
+        return self.running_lines
+
+    def _is_header_like(self, line: str) -> bool:
+        """Short all-capitals lines, e.g. 'BUFFALO CITY DIRECTORY. 123'."""
+        letters = [c for c in line if c.isalpha()]
+        return (
+            len(line) <= self.max_header_length
+            and len(letters) >= 4
+            and all(c.isupper() for c in letters)
+        )
+
+    def compact(self, text: str) -> CompactionResult:
+        """
+        Compact section text.
+
+        Args:
+            text: Raw section text
+
+        Returns:
+            CompactionResult with the compacted text and token counts
+        """
+        lines = [
+            HORIZONTAL_SPACE.sub(" ", line.translate(FULLWIDTH_PUNCTUATION)).strip()
+            for line in text.splitlines()
+        ]
+        lines = [line for line in lines if line]
+
+        repeated = Counter(
+            _signature(line) for line in lines if self._is_header_like(line)
+        )
+        in_text_running = {
+            sig for sig, count in repeated.items() if count >= self.min_repeats
+        }
+
+        kept = []
+        removed = 0
+        for line in lines:
+            signature = _signature(line)
+            if (
+                PAGE_NUMBER.match(line)
+                or (len(line) <= self.max_header_length and signature in self.running_lines)
+                or (self._is_header_like(line) and signature in in_text_running)
+                or self._ad_pattern.search(line)
+            ):
+                removed += 1
+                continue
+            kept.append(line)
+
+        compacted = "\n".join(kept)
+        if self._abbreviation_pattern is not None:
+            compacted = self._abbreviation_pattern.sub(
+                lambda m: self.abbreviations[m.group(0)], compacted
+            )
+
+        return CompactionResult(
+            text=compacted,
+            original_tokens=estimate_tokens(text),
+            compacted_tokens=estimate_tokens(compacted),
+            removed_lines=removed
+        )
@@ -0,0 +1,260 @@
+"""Per-run token and cost accounting with budget enforcement."""
+
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils import setup_logger
+from .resilience import LLMCallError
+
+logger = setup_logger(__name__)
+
+
+class BudgetExceededError(LLMCallError):
+    """Raised instead of making a call once the run's budget is spent."""
+
+
+class CostLedger:
+    """
+    SQLite ledger of LLM calls for one extraction run.
+
+    Every successful call is stored with its section, model, prompt and
+    completion tokens, latency and estimated cost. When a budget is set,
+    ``acquire`` is called before each request: past ``throttle_at`` of the
+    budget, calls are spaced ``throttle_interval`` seconds apart; once the
+    budget is spent, calls are refused with BudgetExceededError (or only
+    throttled if ``halt`` is False). Totals are reloaded when a run resumes.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        run_id: str,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+        max_cost: Optional[float] = None,
+        throttle_at: float = 0.8,
+        throttle_interval: float = 2.0,
+        halt: bool = True
+    ):
+        """
+        Initialize cost ledger.
+
+        Args:
+            db_path: Path to the ledger database (created if missing)
+            run_id: Extraction run ID
+            pricing: Model -> {"prompt_per_1k", "cached_prompt_per_1k",
+                "completion_per_1k"} in USD; a "default" entry applies to
+                unlisted models
+            max_cost: Budget for the run in USD (None for no budget)
+            throttle_at: Fraction of the budget after which calls are spaced out
+            throttle_interval: Seconds between calls while throttled
+            halt: Refuse calls once the budget is spent (otherwise keep throttling)
+        """
+        self.db_path = Path(db_path)
+        self.run_id = run_id
+        self.pricing = pricing or {}
+        self.max_cost = max_cost
+        self.throttle_at = throttle_at
+        self.throttle_interval = throttle_interval
+        self.halt = halt
+
+        self._lock = threading.Lock()
+        self._next_call_at = 0.0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_calls (
+                call_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                section_id TEXT,
+                model TEXT,
+                provider TEXT,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER,
+                cached_tokens INTEGER DEFAULT 0,
+                latency REAL,
+                cost REAL,
+                created_at TEXT
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_calls_run ON llm_calls(run_id)"
+        )
+        self._conn.commit()
+
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(cost), 0) FROM llm_calls WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        self.total_cost = row[0]
+        if self.total_cost:
+            logger.info(f"Resuming cost ledger for run {run_id}: ${self.total_cost:.4f} spent")
+
+    @classmethod
+    def from_config(cls, db_path: str, run_id: str, cost_config: Dict[str, Any]) -> "CostLedger":
+        """Build a ledger from an ``extraction.cost`` config block."""
+        budget = cost_config.get("budget", {})
+        return cls(
+            db_path,
+            run_id,
+            pricing=cost_config.get("pricing"),
+            max_cost=budget.get("max_cost_usd"),
+            throttle_at=budget.get("throttle_at", 0.8),
+            throttle_interval=budget.get("throttle_interval", 2.0),
+            halt=budget.get("halt", True)
+        )
+
+    def estimate_cost(
+        self,
+        model: Optional[str],
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0
+    ) -> float:
+        """
+        Estimate the cost of a call in USD.
+
+        Args:
+            model: Model name reported by the provider
+            prompt_tokens: Input tokens, including cached ones
+            completion_tokens: Output tokens
+            cached_tokens: Input tokens served from a prefix cache
+
+        Returns:
+            Cost from the model's price (or the default price; 0 if none)
+        """
+        price = self.pricing.get(model) or self.pricing.get("default") or {}
+        prompt_price = price.get("prompt_per_1k", 0.0)
+        cached_tokens = min(cached_tokens, prompt_tokens)
+        return (
+            (prompt_tokens - cached_tokens) * prompt_price
+            + cached_tokens * price.get("cached_prompt_per_1k", prompt_price)
+            + completion_tokens * price.get("completion_per_1k", 0.0)
+        ) / 1000
+
+    def acquire(self) -> None:
+        """
+        Wait for permission to submit a call under the budget.
+
+        Raises:
+            BudgetExceededError: If the budget is spent and halt is enabled
+        """
+        if self.max_cost is None:
+            return
+
+        with self._lock:
+            if self.total_cost >= self.max_cost and self.halt:
+                raise BudgetExceededError(
+                    f"Budget of ${self.max_cost:.2f} exhausted (${self.total_cost:.4f} spent)"
+                )
+            if self.total_cost < self.throttle_at * self.max_cost:
+                return
+
+            # Reserve the next slot so concurrent callers queue up behind it
+            now = time.monotonic()
+            wait_until = max(now, self._next_call_at)
+            self._next_call_at = wait_until + self.throttle_interval
+
+        if wait_until > now:
+            logger.debug(f"Budget throttle: waiting {wait_until - now:.2f}s")
+            time.sleep(wait_until - now)
+
+    def record(self, section_id: Optional[str], response: Dict[str, Any]) -> float:
+        """
+        Store a completed call.
+
+        Args:
+            section_id: Section the call was made for
+            response: Response dictionary from LLMClient or LLMRouter
+
+        Returns:
+            Estimated cost of the call
+        """
+        model = response.get("model")
+        prompt_tokens = response.get("prompt_tokens")
+        completion_tokens = response.get("completion_tokens") or 0
+        if prompt_tokens is None:
+            # Providers that only report a total
+            prompt_tokens = (response.get("tokens_used") or 0) - completion_tokens
+        cached_tokens = response.get("cached_tokens") or 0
+        cost = self.estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+
+        with self._lock:
+            was_under = self.max_cost is None or self.total_cost < self.max_cost
+            self.total_cost += cost
+            self._conn.execute(
+                """
+                INSERT INTO llm_calls (
+                    run_id, section_id, model, provider, prompt_tokens,
+                    completion_tokens, cached_tokens, latency, cost, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    self.run_id, section_id, model, response.get("provider"),
+                    prompt_tokens, completion_tokens, cached_tokens, response.get("latency"),
+                    cost, datetime.now(timezone.utc).isoformat()
+                )
+            )
+            self._conn.commit()
+
+        if was_under and self.max_cost is not None and self.total_cost >= self.max_cost:
+            logger.warning(
+                f"Run {self.run_id} reached its ${self.max_cost:.2f} budget "
+                f"(${self.total_cost:.4f} spent)"
+            )
+        return cost
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregate the run's calls.
+
+        Returns:
+            Dictionary with run totals and a per-model breakdown
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT model, COUNT(*), COUNT(DISTINCT section_id), SUM(prompt_tokens),
+                       SUM(completion_tokens), SUM(cached_tokens), SUM(cost), AVG(latency)
+                FROM llm_calls WHERE run_id = ? GROUP BY model ORDER BY model
+                """,
+                (self.run_id,)
+            ).fetchall()
+
+        models = {}
+        totals = defaultdict(float)
+        for model, calls, sections, prompt, completion, cached, cost, latency in rows:
+            models[model] = {
+                "calls": calls,
+                "sections": sections,
+                "prompt_tokens": prompt or 0,
+                "completion_tokens": completion or 0,
+                "cached_tokens": cached or 0,
+                "cost": cost or 0.0,
+                "avg_latency": latency,
+            }
+            totals["calls"] += calls
+            totals["prompt_tokens"] += prompt or 0
+            totals["completion_tokens"] += completion or 0
+            totals["cached_tokens"] += cached or 0
+            totals["cost"] += cost or 0.0
+
+        return {
+            "run_id": self.run_id,
+            "calls": int(totals["calls"]),
+            "prompt_tokens": int(totals["prompt_tokens"]),
+            "completion_tokens": int(totals["completion_tokens"]),
+            "cached_tokens": int(totals["cached_tokens"]),
+            "cost": totals["cost"],
+            "budget": self.max_cost,
+            "models": models,
+        }
+
+    def close(self) -> None:
+        """Close the ledger database."""
+        with self._lock:
+            self._conn.close()
@@ -1,33 +1,99 @@
 """Extractor for processing sections and extracting associations."""
 
-import json
+import threading
 import uuid
-from typing import List
-from ..models import Section, AssociationRecord, Member, ExtractionInput
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from ..models import Section, AssociationRecord
 from ..utils import setup_logger, make_association_id
 from .llm_client import LLMClient
-from .prompts import build_extraction_prompt
+from .parsing import parse_llm_response, validate_members
+from .resilience import LLMCallError
+from .compaction import PromptCompactor, estimate_tokens
+from .cost_ledger import CostLedger
+from .images import ImagePayload, ImagePayloadCache
+from .prompts import (
+    COMPACT_SYSTEM_PROMPT,
+    build_extraction_prompt,
+    build_repair_prompt,
+    prefix_hash,
+)
+from .repair import GAP_DESCRIPTIONS, find_entry_span, find_gaps, merge_repair
+from .rule_based import RuleBasedExtractor
 
 logger = setup_logger(__name__)
 
 
+def _text_field(value: Any) -> Optional[str]:
+    """A string field from model output: numbers are coerced, other non-strings dropped."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
+
 class Extractor:
     """Extract association records from sections using LLM."""
     
-    def __init__(self, client: LLMClient):
+    def __init__(
+        self,
+        client: LLMClient,
+        compactor: Optional[PromptCompactor] = None,
+        rule_extractor: Optional[RuleBasedExtractor] = None,
+        image_cache: Optional[ImagePayloadCache] = None,
+        page_images: Optional[Dict[str, str]] = None,
+        cost_ledger: Optional[CostLedger] = None,
+        repair: bool = False,
+        max_repair_chars: int = 800,
+        system_prompt: Optional[str] = None,
+        examples: Optional[List[Dict[str, Any]]] = None,
+        compact_system_prompt: Optional[str] = None
+    ):
         """
         Initialize extractor.
         
         Args:
             client: LLMClient instance
+            compactor: Optional PromptCompactor; when set, section text is
+                compacted and compact_system_prompt is used
+            rule_extractor: Optional RuleBasedExtractor; entries it parses
+                confidently bypass the LLM, which only sees the remainder
+            image_cache: Optional ImagePayloadCache; when set (multimodal
+                mode), section crops of the page images are sent with the text
+            page_images: Map of page ID -> page image path (from the manifest)
+            cost_ledger: Optional CostLedger; calls are recorded in it and
+                submitted only while the run's budget allows
+            repair: Detect gaps in LLM extractions (empty member list, missing
+                roles, malformed names, invalid type) and fix them with a
+                small follow-up call on just the association's entry
+            max_repair_chars: Longest entry text sent in a repair prompt
+            system_prompt: Instructions from config (default: DEFAULT_SYSTEM_PROMPT)
+            examples: Few-shot examples from config; together with the
+                instructions they form a prompt prefix shared by every call
+            compact_system_prompt: Instructions used with compaction (default:
+                system_prompt if given, else COMPACT_SYSTEM_PROMPT)
         """
         self.client = client
+        self.compactor = compactor
+        self.rule_extractor = rule_extractor
+        self.image_cache = image_cache
+        self.page_images = page_images or {}
+        self.cost_ledger = cost_ledger
+        self.repair = repair
+        self.max_repair_chars = max_repair_chars
+        self.system_prompt = system_prompt
+        self.examples = examples or []
+        self.compact_system_prompt = compact_system_prompt
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
     
     def extract_from_section(
         self,
         section: Section,
         run_id: str = None,
-        num_repeats: int = 1
+        num_repeats: int = 1,
+        raise_on_error: bool = False
     ) -> List[AssociationRecord]:
         """
         Extract association records from a section.
@@ -36,6 +102,8 @@ class Extractor:
             section: Section to process
             run_id: Extraction run ID
             num_repeats: Number of times to run extraction (for verification)
+            raise_on_error: Re-raise LLMCallError instead of returning no records,
+                so callers can tell a failed call from an empty section
             
         Returns:
             List of AssociationRecord objects
@@ -45,37 +113,184 @@ class Extractor:
         
         logger.info(f"Extracting associations from section {section.section_id}")
         
+        records = []
+        text = section.raw_text
+        
+        # Fast path: parse regular entries with rules, send the rest to the LLM
+        if self.rule_extractor is not None:
+            parsed, text = self.rule_extractor.extract(section.raw_text)
+            for data, confidence in parsed:
+                records.append(self._create_record(
+                    data=data,
+                    section=section,
+                    run_id=run_id,
+                    metadata={
+                        "extraction_path": "rules",
+                        "rule_confidence": confidence,
+                        "section_id": section.section_id,
+                    }
+                ))
+            self._count("rule_records", len(parsed))
+            
+            if not text:
+                self._count("llm_calls_skipped")
+                return records
+        
+        images = self._section_images(section)
+        
         # Build prompts
         prompts = build_extraction_prompt(
             city=section.city,
             state=section.state,
             year=section.year,
-            section_text=section.raw_text
+            section_text=text,
+            system_prompt=self.system_prompt,
+            num_images=len(images),
+            examples=self.examples
         )
         
+        compaction = None
+        if self.compactor is not None:
+            prompts, compaction = self._compact_prompts(section, text, prompts, len(images))
+        
         # Call LLM
-        response = self.client.call(
-            system_prompt=prompts["system"],
-            user_prompt=prompts["user"]
-        )
+        self._count("llm_calls")
+        try:
+            if self.cost_ledger is not None:
+                self.cost_ledger.acquire()
+            
+            # Only text-mode calls omit images, so text-only clients keep working
+            extra = {"images": images} if images else {}
+            response = self.client.call(
+                system_prompt=prompts["system"],
+                user_prompt=prompts["user"],
+                **extra
+            )
+        except LLMCallError as e:
+            logger.error(f"LLM call failed for section {section.section_id}: {e}")
+            if raise_on_error:
+                raise
+            return records
+        
+        if self.cost_ledger is not None:
+            self.cost_ledger.record(section.section_id, response)
         
         # Parse response
+        items, salvaged = parse_llm_response(response["content"])
+        
+        metadata = {
+            "model": response.get("model"),
+            "tokens": response.get("tokens_used"),
+            "section_id": section.section_id,
+            "extraction_path": "llm",
+            "prompt_prefix": prefix_hash(prompts["system"]),
+        }
+        if response.get("cached_tokens"):
+            metadata["cached_tokens"] = response["cached_tokens"]
+        if compaction:
+            metadata["compaction"] = compaction
+        if salvaged:
+            metadata["salvaged"] = True
+        if images:
+            metadata["images"] = len(images)
+            metadata["image_bytes"] = sum(len(image.data) for image in images)
+        
+        for data in items:
+            record_metadata = dict(metadata)
+            if self.repair:
+                data = self._repair(section, text, data, record_metadata)
+            records.append(self._create_record(
+                data=data, section=section, run_id=run_id, metadata=record_metadata
+            ))
+        self._count("llm_records", len(items))
+        return records
+    
+    def _count(self, key: str, amount: int = 1) -> None:
+        """Increment an extraction statistic (thread-safe)."""
+        with self._stats_lock:
+            self.stats[key] += amount
+    
+    def _repair(self, section: Section, text: str, data: dict, metadata: dict) -> dict:
+        """Fix detected gaps in one extraction with a targeted follow-up call."""
+        span = find_entry_span(text, data.get("name"), self.max_repair_chars)
+        gaps = find_gaps(data, span)
+        if not gaps:
+            return data
+        
+        prompts = build_repair_prompt(span, data, [GAP_DESCRIPTIONS[gap] for gap in gaps])
+        self._count("repair_calls")
         try:
-            data = json.loads(response["content"])
-            
-            # Create AssociationRecord
-            record = self._create_record(
-                data=data,
-                section=section,
-                run_id=run_id,
-                metadata={"model": response.get("model"), "tokens": response.get("tokens_used")}
+            if self.cost_ledger is not None:
+                self.cost_ledger.acquire()
+            response = self.client.call(
+                system_prompt=prompts["system"],
+                user_prompt=prompts["user"]
             )
-            
-            return [record]
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM response: {e}")
+        except LLMCallError as e:
+            logger.warning(f"Repair call failed for section {section.section_id}: {e}")
+            metadata["repair"] = {"gaps": gaps, "failed": True}
+            return data
+        
+        if self.cost_ledger is not None:
+            self.cost_ledger.record(section.section_id, response)
+        
+        fixes, _ = parse_llm_response(response["content"])
+        if not fixes:
+            metadata["repair"] = {"gaps": gaps, "failed": True}
+            return data
+        
+        repaired = merge_repair(data, fixes[0], gaps)
+        metadata["repair"] = {
+            "gaps": gaps,
+            "remaining": find_gaps(repaired, span),
+            "tokens": response.get("tokens_used"),
+        }
+        self._count("repaired_records")
+        logger.info(f"Repaired {gaps} in '{data.get('name')}' ({section.section_id})")
+        return repaired
+    
+    def _section_images(self, section: Section) -> List[ImagePayload]:
+        """Cached crops of the section's page images (empty in text mode)."""
+        if self.image_cache is None:
             return []
+        
+        images = self.image_cache.payloads_for(
+            section.page_ids, self.page_images, section.page_regions
+        )
+        missing = len(section.page_ids) - len(images)
+        if missing:
+            logger.warning(f"No page image for {missing} page(s) of section {section.section_id}")
+        return images
+    
+    def _compact_prompts(self, section: Section, text: str, prompts: dict, num_images: int = 0):
+        """Rebuild prompts from compacted text and report the token savings."""
+        result = self.compactor.compact(text)
+        compacted = build_extraction_prompt(
+            city=section.city,
+            state=section.state,
+            year=section.year,
+            section_text=result.text,
+            # A configured prompt is never swapped for the built-in short one
+            system_prompt=self.compact_system_prompt or self.system_prompt or COMPACT_SYSTEM_PROMPT,
+            num_images=num_images,
+            examples=self.examples
+        )
+        
+        tokens_before = estimate_tokens(prompts["system"]) + estimate_tokens(prompts["user"])
+        tokens_after = estimate_tokens(compacted["system"]) + estimate_tokens(compacted["user"])
+        savings = 1.0 - tokens_after / tokens_before if tokens_before else 0.0
+        
+        logger.info(
+            f"Compacted section {section.section_id}: {tokens_before} -> {tokens_after} "
+            f"prompt tokens ({savings:.0%} saved, {result.removed_lines} lines removed)"
+        )
+        
+        return compacted, {
+            "prompt_tokens_before": tokens_before,
+            "prompt_tokens_after": tokens_after,
+            "savings": round(savings, 4),
+            "removed_lines": result.removed_lines,
+        }
     
     def _create_record(
         self,
@@ -86,15 +301,13 @@ class Extractor:
     ) -> AssociationRecord:
         """Create an AssociationRecord from parsed data."""
         # Parse members
-        members = []
-        for m in data.get("members", []):
-            members.append(Member(**m))
+        members = validate_members(data.get("members") or [])
         
         # Create record
         record = AssociationRecord(
             association_id="",  # Will be set after
-            name=data.get("name", "Unknown"),
-            association_type=data.get("association_type"),
+            name=_text_field(data.get("name")) or "Unknown",
+            association_type=_text_field(data.get("association_type")),
             city=section.city,
             state=section.state,
             year=section.year,
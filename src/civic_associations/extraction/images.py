@@ -0,0 +1,204 @@
+"""Section-cropped, content-addressed image payloads for multimodal extraction."""
+
+import base64
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ImagePayload:
+    """Encoded image ready to send to a provider."""
+
+    def __init__(self, data: bytes, key: str, mime_type: str = "image/jpeg"):
+        """
+        Initialize image payload.
+
+        Args:
+            data: Encoded image bytes
+            key: Content-addressed cache key
+            mime_type: MIME type of the encoded image
+        """
+        self.data = data
+        self.key = key
+        self.mime_type = mime_type
+        self._base64 = None
+
+    @property
+    def base64(self) -> str:
+        """Base64 encoding of the image, computed once."""
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.data).decode("ascii")
+        return self._base64
+
+    @property
+    def data_url(self) -> str:
+        """data: URL for APIs that take inline images as URLs."""
+        return f"data:{self.mime_type};base64,{self.base64}"
+
+
+class ImagePayloadCache:
+    """
+    Crop page images to a section's region, downsize and encode them once.
+
+    Encoded crops are stored under a key derived from the source image's
+    content hash, the crop region and the encoding settings, so identical
+    requests (repeated runs, several associations on one page) reuse the
+    cached bytes instead of decoding and re-encoding the page image.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_dimension: int = 1600,
+        jpeg_quality: int = 80,
+        grayscale: bool = True,
+        margin: float = 0.02,
+        memory_items: int = 128
+    ):
+        """
+        Initialize image payload cache.
+
+        Args:
+            cache_dir: Directory for encoded crops
+            max_dimension: Longest side of the encoded crop, in pixels
+            jpeg_quality: JPEG quality (1-95)
+            grayscale: Convert to grayscale (directories are printed in black)
+            margin: Extra margin around the region, as a fraction of the page
+            memory_items: Recently used payloads kept in memory
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_dimension = max_dimension
+        self.jpeg_quality = jpeg_quality
+        self.grayscale = grayscale
+        self.margin = margin
+        self._file_hashes: Dict[Tuple[str, int, float], str] = {}
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, ImagePayload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _file_hash(self, image_path: Path) -> str:
+        """Content hash of an image file, memoized by path, size and mtime."""
+        stat = image_path.stat()
+        memo_key = (str(image_path), stat.st_size, stat.st_mtime)
+        with self._lock:
+            cached = self._file_hashes.get(memo_key)
+        if cached is not None:
+            return cached
+
+        digest = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+        with self._lock:
+            self._file_hashes[memo_key] = digest.hexdigest()
+        return digest.hexdigest()
+
+    def _cache_key(self, file_hash: str, region: Optional[Sequence[float]]) -> str:
+        region_key = ",".join(f"{v:.4f}" for v in region) if region else "full"
+        settings = f"{self.max_dimension}|{self.jpeg_quality}|{self.grayscale}|{self.margin}"
+        return hashlib.sha256(f"{file_hash}|{region_key}|{settings}".encode("utf-8")).hexdigest()
+
+    def get_payload(
+        self,
+        image_path: str,
+        region: Optional[Sequence[float]] = None
+    ) -> ImagePayload:
+        """
+        Return the encoded crop of a page image.
+
+        Args:
+            image_path: Path to the page image
+            region: Normalized [x0, y0, x1, y1] box in 0-1 page coordinates
+                (None for the whole page)
+
+        Returns:
+            ImagePayload with JPEG bytes
+        """
+        path = Path(image_path)
+        key = self._cache_key(self._file_hash(path), region)
+
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                return payload
+
+        cache_file = self.cache_dir / key[:2] / f"{key}.jpg"
+        if cache_file.exists():
+            data = cache_file.read_bytes()
+        else:
+            data = self._encode(path, region)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            tmp_file.write_bytes(data)
+            tmp_file.replace(cache_file)
+            logger.debug(f"Cached {len(data)} byte crop of {path.name} as {key[:12]}")
+
+        payload = ImagePayload(data=data, key=key)
+        with self._lock:
+            self._memory[key] = payload
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+        return payload
+
+    def _encode(self, image_path: Path, region: Optional[Sequence[float]]) -> bytes:
+        """Crop, downsize and JPEG-encode an image."""
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.error("pillow package not installed; install the 'extraction' extra for multimodal mode")
+            raise
+
+        with Image.open(image_path) as image:
+            if not region:
+                # Let the JPEG decoder downscale whole pages while decoding
+                image.draft("RGB", (self.max_dimension, self.max_dimension))
+            width, height = image.size
+
+            if region:
+                x0, y0, x1, y1 = region
+                box = (
+                    max(0, int((x0 - self.margin) * width)),
+                    max(0, int((y0 - self.margin) * height)),
+                    min(width, int((x1 + self.margin) * width)),
+                    min(height, int((y1 + self.margin) * height)),
+                )
+                image = image.crop(box)
+
+            image = image.convert("L" if self.grayscale else "RGB")
+            image.thumbnail((self.max_dimension, self.max_dimension))
+
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=self.jpeg_quality, optimize=True)
+            return buffer.getvalue()
+
+    def payloads_for(
+        self,
+        page_ids: List[str],
+        page_image_paths: Dict[str, str],
+        page_regions: Dict[str, List[float]]
+    ) -> List[ImagePayload]:
+        """
+        Encoded crops for each page of a section that has an image.
+
+        Args:
+            page_ids: Section page IDs, in order
+            page_image_paths: Map of page ID -> image path
+            page_regions: Map of page ID -> normalized region on that page
+
+        Returns:
+            List of ImagePayload objects
+        """
+        return [
+            self.get_payload(page_image_paths[page_id], page_regions.get(page_id))
+            for page_id in page_ids
+            if page_id in page_image_paths
+        ]
@@ -1,10 +1,18 @@
 """LLM client for calling Gemini or other models."""
 
-import json
-import os
-from typing import Any, Dict
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
 
 from ..utils import setup_logger
+from .providers import GeminiProvider, LLMProvider, create_provider
+from .resilience import (
+    CircuitBreaker,
+    LatencyTracker,
+    LLMCallError,
+    RetryPolicy,
+    is_retryable,
+)
 
 logger = setup_logger(__name__)
 
@@ -17,7 +25,13 @@ class LLMClient:
         model_name: str = "gemini-2.0-flash-exp",
         temperature: float = 0.1,
         max_tokens: int = 4096,
-        api_timeout: int = 30
+        api_timeout: int = 30,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedge_requests: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        provider: Optional[LLMProvider] = None
     ):
         """
         Initialize LLM client.
@@ -27,123 +41,236 @@ class LLMClient:
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
             api_timeout: API request timeout in seconds
+            retry_policy: Backoff policy for retryable errors
+            circuit_breaker: Breaker shared by all calls through this client
+            hedge_requests: Send a duplicate request when a call is slower
+                than the hedge_quantile latency, and use whichever finishes first
+            hedge_quantile: Latency quantile that triggers a hedged request
+            hedge_min_samples: Calls observed before hedging is enabled
+            provider: Provider backend (default: Gemini with the given model)
         """
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.api_timeout = api_timeout
-        self._client = None
-        self._model = None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.hedge_requests = hedge_requests
+        self.hedge_quantile = hedge_quantile
+        self.latency = LatencyTracker(min_samples=hedge_min_samples)
+        self.provider = provider or GeminiProvider(
+            model_name=model_name, temperature=temperature, max_tokens=max_tokens
+        )
+        self._executor = None
 
         logger.info(f"Initialized LLMClient with model={model_name}")
 
-    def _init_gemini(self):
-        """Initialize Gemini client lazily."""
-        if self._client is not None:
-            return
-
-        try:
-            import google.generativeai as genai
-
-            api_key = os.getenv("GEMINI_API_KEY")
-            if not api_key:
-                raise ValueError("GEMINI_API_KEY environment variable not set")
-
-            genai.configure(api_key=api_key)
-
-            # Map model names to ensure compatibility with available Gemini models
-            # As of November 2025, available models include:
-            #   - gemini-1.5-flash, gemini-1.5-pro (stable)
-            #   - gemini-2.0-flash-exp (experimental, recommended for latest features)
-            # Note: "gemini-2.5-flash" does not exist - likely confusion with version numbering
-            model_mapping = {
-                "gemini-2.5-flash": "gemini-2.0-flash-exp",  # 2.5 doesn't exist, map to 2.0 exp
-                "gemini-2.5-pro": "gemini-1.5-pro",  # 2.5 doesn't exist, map to 1.5 pro
-                "gemini-1.5-flash": "gemini-2.0-flash-exp",  # Upgrade to 2.0 for better performance
-            }
-
-            model_name = model_mapping.get(self.model_name, self.model_name)
-
-            # Validate it's a Gemini model
-            if not model_name.startswith("gemini-"):
-                logger.warning(f"Model {model_name} doesn't appear to be a Gemini model, using default")
-                model_name = "gemini-2.0-flash-exp"
-
-            if model_name != self.model_name:
-                logger.info(f"Mapped model {self.model_name} to {model_name}")
-
-            generation_config = {
-                "temperature": self.temperature,
-                "max_output_tokens": self.max_tokens,
-                "response_mime_type": "application/json",
-            }
-
-            self._model = genai.GenerativeModel(
-                model_name=model_name,
-                generation_config=generation_config,
-            )
+    @classmethod
+    def from_config(cls, llm_config: Dict[str, Any], **overrides) -> "LLMClient":
+        """
+        Build a client from an ``extraction.llm`` (or provider) config block.
+
+        Args:
+            llm_config: Config with model, provider, retry, circuit_breaker
+                and hedging settings
+            **overrides: Constructor arguments that take precedence
+
+        Returns:
+            Configured LLMClient
+        """
+        retry_config = llm_config.get("retry", {})
+        breaker_config = llm_config.get("circuit_breaker", {})
+        hedging_config = llm_config.get("hedging", {})
+
+        model_name = llm_config.get("model_name", "gemini-2.0-flash-exp")
+        temperature = llm_config.get("temperature", 0.1)
+        max_tokens = llm_config.get("max_tokens", 4096)
+
+        provider_options = {
+            key: llm_config[key]
+            for key in ("base_url", "api_key_env")
+            if llm_config.get(key)
+        }
+        provider_type = llm_config.get("type", "gemini")
+        if provider_type == "gemini":
+            cache_config = llm_config.get("context_cache", {})
+            provider_options["context_cache"] = cache_config.get("enabled", False)
+            provider_options["cache_ttl"] = cache_config.get("ttl", 3600)
+        provider = create_provider(
+            provider_type,
+            model_name=model_name,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **provider_options
+        )
+
+        options = {
+            "model_name": model_name,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "api_timeout": llm_config.get("api_timeout", 30),
+            "retry_policy": RetryPolicy(
+                max_attempts=retry_config.get("max_attempts", 4),
+                base_delay=retry_config.get("base_delay", 1.0),
+                max_delay=retry_config.get("max_delay", 30.0)
+            ),
+            "circuit_breaker": CircuitBreaker(
+                failure_threshold=breaker_config.get("failure_threshold", 5),
+                reset_timeout=breaker_config.get("reset_timeout", 60)
+            ),
+            "hedge_requests": hedging_config.get("enabled", False),
+            "hedge_quantile": hedging_config.get("quantile", 0.95),
+            "hedge_min_samples": hedging_config.get("min_samples", 20),
+            "provider": provider,
+        }
+        options.update(overrides)
+        return cls(**options)
+
+    def close(self) -> None:
+        """Shut down the worker threads used for timed and hedged calls."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
-            self._client = genai
-            logger.info(f"Initialized Gemini model: {model_name}")
+    def __enter__(self):
+        return self
 
-        except ImportError:
-            logger.error("google-generativeai package not installed")
-            raise
-        except Exception as e:
-            logger.error(f"Failed to initialize Gemini client: {e}")
-            raise
+    def __exit__(self, *exc):
+        self.close()
 
     def call(
         self,
         system_prompt: str,
-        user_prompt: str
+        user_prompt: str,
+        images: Optional[List[Any]] = None
     ) -> Dict[str, Any]:
         """
-        Call the LLM with prompts.
+        Call the LLM with prompts, retrying transient failures.
 
         Args:
             system_prompt: System instruction
             user_prompt: User query
+            images: ImagePayload objects to attach (multimodal mode)
 
         Returns:
             Dictionary with response and metadata
+
+        Raises:
+            LLMCallError: If the call fails permanently or retries are exhausted
         """
         logger.debug(f"Calling LLM with {len(user_prompt)} chars")
 
-        try:
-            self._init_gemini()
+        last_error = None
+        max_attempts = self.retry_policy.max_attempts
 
-            # Combine system and user prompts
-            full_prompt = f"{system_prompt}\n\n{user_prompt}"
+        for attempt in range(max_attempts):
+            self.circuit_breaker.wait_until_ready()
+            start = time.monotonic()
 
-            # Generate response
-            response = self._model.generate_content(full_prompt)
+            try:
+                result = self._call_once(system_prompt, user_prompt, images)
+            except Exception as e:
+                if not is_retryable(e):
+                    self.circuit_breaker.release_probe()
+                    logger.error(f"LLM call failed: {e}")
+                    raise LLMCallError(f"LLM call failed: {e}") from e
 
-            # Extract text from response
-            content = response.text
+                last_error = e
+                self.circuit_breaker.record_failure()
 
-            # Try to validate it's valid JSON
-            try:
-                json.loads(content)
-            except json.JSONDecodeError:
-                logger.warning("Response is not valid JSON, wrapping in quotes")
-
-            result = {
-                "content": content,
-                "model": self.model_name,
-                "tokens_used": getattr(response, 'usage_metadata', {}).get('total_token_count', 0) if hasattr(response, 'usage_metadata') else 0,
-                "finish_reason": "stop"
-            }
-
-            logger.debug(f"LLM response: {len(content)} chars")
+                if attempt + 1 < max_attempts:
+                    delay = self.retry_policy.compute_delay(
+                        attempt, getattr(e, "retry_after", None)
+                    )
+                    logger.warning(
+                        f"LLM call attempt {attempt + 1}/{max_attempts} failed ({e}); "
+                        f"retrying in {delay:.2f}s"
+                    )
+                    time.sleep(delay)
+                continue
+
+            elapsed = time.monotonic() - start
+            self.circuit_breaker.record_success()
+            self.latency.record(elapsed)
+
+            result["latency"] = elapsed
+            result["attempts"] = attempt + 1
+            logger.debug(f"LLM response: {len(result['content'])} chars in {elapsed:.2f}s")
             return result
 
-        except Exception as e:
-            logger.error(f"LLM call failed: {e}")
-            # Return a fallback response
-            return {
-                "content": '{"error": "LLM call failed", "name": "Unknown", "members": []}',
-                "model": self.model_name,
-                "tokens_used": 0,
-                "finish_reason": "error"
-            }
+        logger.error(f"LLM call failed after {max_attempts} attempts: {last_error}")
+        raise LLMCallError(
+            f"LLM call failed after {max_attempts} attempts: {last_error}"
+        ) from last_error
+
+    def _call_once(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        images: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run one attempt under the API timeout, hedging slow calls if enabled.
+
+        Abandoned requests (the slower of a hedged pair, or one that timed
+        out) are left to finish in the background; the provider-side timeout
+        bounds how long they can run.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=16, thread_name_prefix="llm-call"
+            )
+
+        deadline = time.monotonic() + self.api_timeout
+        pending = {self._executor.submit(self._generate, system_prompt, user_prompt, images)}
+
+        hedge_after = None
+        if self.hedge_requests:
+            hedge_after = self.latency.quantile(self.hedge_quantile)
+
+        if hedge_after is not None and hedge_after < self.api_timeout:
+            done, pending = wait(pending, timeout=hedge_after)
+            if not done:
+                logger.debug(f"Call exceeded p{self.hedge_quantile * 100:.0f} latency "
+                             f"({hedge_after:.2f}s), sending hedged request")
+                pending.add(self._executor.submit(self._generate, system_prompt, user_prompt, images))
+            else:
+                pending = done
+
+        first_error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    return future.result()
+                first_error = first_error or error
+
+        if first_error is not None:
+            raise first_error
+        raise TimeoutError(f"LLM call exceeded {self.api_timeout}s timeout")
+
+    def _generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        images: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Make a single provider request.
+
+        Args:
+            system_prompt: System instruction
+            user_prompt: User query
+            images: ImagePayload objects to attach
+
+        Returns:
+            Dictionary with content, model, token counts and finish_reason
+        """
+        return self.provider.generate(
+            system_prompt, user_prompt, timeout=self.api_timeout, images=images
+        )
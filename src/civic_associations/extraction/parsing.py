@@ -0,0 +1,196 @@
+"""Tolerant parsing of LLM JSON responses."""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from ..models import Member
+from ..utils import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+_MEMBERS_ADAPTER = TypeAdapter(List[Member])
+
+_CODE_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*\n?(.*?)(?:\n?```\s*)?$", re.S)
+_MEMBERS_KEY = re.compile(r'"members"\s*:\s*\[')
+_STRING_FIELD = r'"{field}"\s*:\s*("(?:[^"\\]|\\.)*")'
+
+
+def loads(text: str) -> Any:
+    """
+    Decode JSON, using orjson when it is installed.
+
+    Args:
+        text: JSON text
+
+    Returns:
+        Decoded Python object
+
+    Raises:
+        ValueError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(text)
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding Markdown code fence (```json ... ```), if present."""
+    match = _CODE_FENCE.match(text)
+    return match.group(1).strip() if match else text.strip()
+
+
+def _iter_complete_objects(text: str, start: int):
+    """
+    Yield complete top-level JSON objects from an array body.
+
+    Scans from ``start`` (just after the opening ``[``), tracking string and
+    brace state, and stops at the closing ``]`` or at the end of the text.
+    A trailing object cut off by truncation is not yielded.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    obj_start = None
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char == "{":
+            if depth == 0:
+                obj_start = i
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0 and obj_start is not None:
+                yield text[obj_start:i + 1]
+                obj_start = None
+        elif char == "]" and depth == 0:
+            return
+
+
+def salvage_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Recover a partial association object from truncated JSON.
+
+    Keeps the top-level string fields that appear before the members array
+    and every member object that was emitted completely.
+
+    Args:
+        text: Possibly truncated JSON text
+
+    Returns:
+        Partial association dictionary, or None if nothing was recoverable
+    """
+    members_match = _MEMBERS_KEY.search(text)
+    head = text[:members_match.start()] if members_match else text
+
+    data: Dict[str, Any] = {}
+    for field in ("name", "association_type"):
+        match = re.search(_STRING_FIELD.format(field=field), head)
+        if match:
+            try:
+                data[field] = json.loads(match.group(1))
+            except json.JSONDecodeError:
+                continue
+
+    if members_match:
+        members = []
+        for fragment in _iter_complete_objects(text, members_match.end()):
+            try:
+                members.append(loads(fragment))
+            except ValueError:
+                continue
+        data["members"] = members
+
+    if not data.get("name") and not data.get("members"):
+        return None
+    return data
+
+
+def parse_llm_response(content: str) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Parse an LLM response into association dictionaries in a single pass.
+
+    Strips code fences, decodes with the fastest available JSON library and
+    falls back to salvaging complete members from truncated output.
+
+    Args:
+        content: Raw response text
+
+    Returns:
+        Tuple of (list of association dictionaries, whether salvage was needed).
+        The list is empty if nothing could be recovered.
+    """
+    text = strip_code_fences(content or "")
+
+    try:
+        data = loads(text)
+    except ValueError as e:
+        salvaged = salvage_json(text)
+        if salvaged is None:
+            logger.error(f"Failed to parse LLM response: {e}")
+            return [], False
+        logger.warning(
+            f"Salvaged truncated LLM response ({len(salvaged.get('members', []))} members)"
+        )
+        return [salvaged], True
+
+    if isinstance(data, dict):
+        return [data], False
+    if isinstance(data, list):
+        return [item for item in data if isinstance(item, dict)], False
+
+    logger.error(f"Unexpected LLM response type: {type(data).__name__}")
+    return [], False
+
+
+def validate_members(raw_members: Any) -> List[Member]:
+    """
+    Validate member dictionaries into Member objects in one pass.
+
+    Falls back to per-item validation when the batch contains invalid
+    entries, dropping only the offending members.
+
+    Args:
+        raw_members: List of member dictionaries from the LLM
+
+    Returns:
+        List of valid Member objects
+    """
+    if not isinstance(raw_members, list):
+        return []
+
+    try:
+        return _MEMBERS_ADAPTER.validate_python(raw_members)
+    except ValidationError:
+        pass
+
+    members = []
+    for item in raw_members:
+        try:
+            members.append(Member.model_validate(item))
+        except ValidationError:
+            logger.debug(f"Dropping invalid member: {item!r}")
+    return members
@@ -1,6 +1,78 @@
 """Prompt building for LLM extraction."""
 
-from typing import Dict, Any
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+
+DEFAULT_SYSTEM_PROMPT = """You are an expert at extracting structured data from 19th-century US city directories.
+You will be given sections from civic association listings and must extract:
+- Association name
+- Association type (temperance, masonic, hunting, etc.)
+- Members and their roles
+
+Return the data as valid JSON conforming to this structure:
+{
+  "name": "Association Name",
+  "association_type": "type",
+  "members": [
+    {"full_name": "Name", "role": "Position"}
+  ]
+}
+
+Focus on accuracy and completeness. If a field is unclear, omit it rather than guessing."""
+
+# Same instructions in fewer tokens, for use with compacted section text
+COMPACT_SYSTEM_PROMPT = """Extract the civic association from this 19th-century US city directory section.
+Return only JSON: {"name": str, "association_type": str (temperance, masonic, hunting, ...), "members": [{"full_name": str, "role": str}]}.
+Omit unclear fields; do not guess."""
+
+
+def format_examples(examples: List[Dict[str, str]]) -> str:
+    """
+    Render few-shot examples for the system prompt.
+    
+    Args:
+        examples: List of {"input": ..., "output": ...} dictionaries
+        
+    Returns:
+        Examples block (empty string if there are none)
+    """
+    blocks = [
+        f"Example {i}:\nInput: {example['input'].strip()}\nOutput: {example['output'].strip()}"
+        for i, example in enumerate(examples or [], start=1)
+    ]
+    return "\n\n".join(blocks)
+
+
+def build_system_prompt(
+    system_prompt: Optional[str] = None,
+    examples: Optional[List[Dict[str, str]]] = None
+) -> str:
+    """
+    Assemble the stable prompt prefix: instructions followed by examples.
+    
+    The prefix is identical for every section of a run, so providers with
+    prompt caching can reuse it; everything that varies goes in the user
+    prompt.
+    
+    Args:
+        system_prompt: Instructions (default: DEFAULT_SYSTEM_PROMPT)
+        examples: Optional few-shot examples
+        
+    Returns:
+        System prompt text
+    """
+    prefix = (system_prompt or DEFAULT_SYSTEM_PROMPT).strip()
+    rendered = format_examples(examples)
+    if rendered:
+        prefix = f"{prefix}\n\n{rendered}"
+    return prefix
+
+
+def prefix_hash(system_prompt: str) -> str:
+    """Short, stable identifier of a prompt prefix (used as a cache key)."""
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
 
 
 def build_extraction_prompt(
@@ -8,7 +80,9 @@ def build_extraction_prompt(
     state: str,
     year: int,
     section_text: str,
-    system_prompt: str = None
+    system_prompt: str = None,
+    num_images: int = 0,
+    examples: Optional[List[Dict[str, str]]] = None
 ) -> Dict[str, str]:
     """
     Build prompts for association extraction.
@@ -19,27 +93,20 @@ def build_extraction_prompt(
         year: Year
         section_text: Raw OCR text of section
         system_prompt: Optional custom system prompt
+        num_images: Number of attached section images (multimodal mode)
+        examples: Optional few-shot examples appended to the system prompt
         
     Returns:
         Dictionary with 'system' and 'user' prompts
     """
-    if system_prompt is None:
-        system_prompt = """You are an expert at extracting structured data from 19th-century US city directories.
-You will be given sections from civic association listings and must extract:
-- Association name
-- Association type (temperance, masonic, hunting, etc.)
-- Members and their roles
-
-Return the data as valid JSON conforming to this structure:
-{
-  "name": "Association Name",
-  "association_type": "type",
-  "members": [
-    {"full_name": "Name", "role": "Position"}
-  ]
-}
-
-Focus on accuracy and completeness. If a field is unclear, omit it rather than guessing."""
+    system_prompt = build_system_prompt(system_prompt, examples)
+    
+    image_note = ""
+    if num_images:
+        image_note = (
+            f"\n\nThe {num_images} attached image(s) show this section as printed. "
+            "Use them to correct OCR errors in names and titles; the text is your primary source."
+        )
     
     user_prompt = f"""Extract civic association information from this directory section.
 
@@ -49,9 +116,49 @@ Year: {year}
 Section text:
 {section_text}
 
-Return valid JSON with the association information."""
+Return valid JSON with the association information.{image_note}"""
     
     return {
         "system": system_prompt,
         "user": user_prompt
     }
+
+
+REPAIR_SYSTEM_PROMPT = """You fix incomplete extractions of 19th-century US city directory entries.
+Return only JSON for the one association: {"name": str, "association_type": str, "members": [{"full_name": str, "role": str}]}.
+Use the entry text as the source of truth; do not guess."""
+
+
+def build_repair_prompt(
+    entry_text: str,
+    partial: Dict[str, Any],
+    problems: List[str]
+) -> Dict[str, str]:
+    """
+    Build a follow-up prompt that fixes specific gaps in one extraction.
+    
+    Args:
+        entry_text: The part of the section describing this association
+        partial: Association dictionary as first extracted
+        problems: Descriptions of what is wrong with it
+        
+    Returns:
+        Dictionary with 'system' and 'user' prompts
+    """
+    problem_list = "\n".join(f"- {problem}" for problem in problems)
+    
+    user_prompt = f"""Fix this extracted directory entry.
+
+Section text:
+{entry_text}
+
+Return valid JSON for this one association, correcting these problems:
+{problem_list}
+
+Partial extraction:
+{json.dumps(partial, ensure_ascii=False)}"""
+    
+    return {
+        "system": REPAIR_SYSTEM_PROMPT,
+        "user": user_prompt
+    }
@@ -0,0 +1,434 @@
+"""LLM provider backends (Gemini and OpenAI-compatible APIs)."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils import setup_logger
+from .resilience import LLMCallError, RetryableLLMError
+
+logger = setup_logger(__name__)
+
+
+class LLMProvider:
+    """
+    Base class for provider backends.
+
+    A provider makes exactly one request and returns a dictionary with
+    ``content``, ``model``, ``tokens_used``, ``prompt_tokens``,
+    ``completion_tokens``, ``cached_tokens`` (prompt tokens served from a
+    provider-side prefix cache) and ``finish_reason``. Retries, timeouts and
+    circuit breaking are handled by LLMClient.
+    """
+
+    provider_type = "base"
+
+    def __init__(
+        self,
+        model_name: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4096
+    ):
+        """
+        Initialize provider.
+
+        Args:
+            model_name: Name of the LLM model
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+        """
+        self.model_name = model_name
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+    def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout: float,
+        images: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Make a single request.
+
+        Args:
+            system_prompt: System instruction
+            user_prompt: User query
+            timeout: Request timeout in seconds
+            images: ImagePayload objects to attach to the user turn
+
+        Returns:
+            Response dictionary
+        """
+        raise NotImplementedError
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini via the google-generativeai SDK."""
+
+    provider_type = "gemini"
+
+    # Map model names to ensure compatibility with available Gemini models
+    # As of November 2025, available models include:
+    #   - gemini-1.5-flash, gemini-1.5-pro (stable)
+    #   - gemini-2.0-flash-exp (experimental, recommended for latest features)
+    # Note: "gemini-2.5-flash" does not exist - likely confusion with version numbering
+    MODEL_MAPPING = {
+        "gemini-2.5-flash": "gemini-2.0-flash-exp",  # 2.5 doesn't exist, map to 2.0 exp
+        "gemini-2.5-pro": "gemini-1.5-pro",  # 2.5 doesn't exist, map to 1.5 pro
+        "gemini-1.5-flash": "gemini-2.0-flash-exp",  # Upgrade to 2.0 for better performance
+    }
+
+    # Context caches are recreated this long before their TTL runs out (at most
+    # a tenth of the TTL), so no call is sent against an expiring cache
+    CACHE_REFRESH_MARGIN = 60.0
+
+    def __init__(
+        self,
+        model_name: str = "gemini-2.0-flash-exp",
+        api_key_env: str = "GEMINI_API_KEY",
+        context_cache: bool = False,
+        cache_ttl: int = 3600,
+        **kwargs
+    ):
+        """
+        Initialize Gemini provider.
+
+        Args:
+            model_name: Gemini model name
+            api_key_env: Environment variable holding the API key
+            context_cache: Upload each distinct system prompt (instructions +
+                examples) once as cached content and send only the user
+                prompt with each call
+            cache_ttl: Lifetime of cached content in seconds
+            **kwargs: Passed through to LLMProvider
+        """
+        super().__init__(model_name=model_name, **kwargs)
+        self.api_key_env = api_key_env
+        self.context_cache = context_cache
+        self.cache_ttl = cache_ttl
+        self._client = None
+        self._model = None
+        self._model_name = None
+        self._generation_config = None
+        # prefix hash -> (model bound to cached content or None if caching was
+        # refused, monotonic time after which the entry is recreated)
+        self._cached_models: Dict[str, Tuple[Any, float]] = {}
+        self._cache_lock = threading.Lock()
+
+    def _init_gemini(self):
+        """Initialize Gemini client lazily."""
+        if self._client is not None:
+            return
+
+        try:
+            import google.generativeai as genai
+
+            api_key = os.getenv(self.api_key_env)
+            if not api_key:
+                raise ValueError(f"{self.api_key_env} environment variable not set")
+
+            genai.configure(api_key=api_key)
+
+            model_name = self.MODEL_MAPPING.get(self.model_name, self.model_name)
+
+            # Validate it's a Gemini model
+            if not model_name.startswith("gemini-"):
+                logger.warning(f"Model {model_name} doesn't appear to be a Gemini model, using default")
+                model_name = "gemini-2.0-flash-exp"
+
+            if model_name != self.model_name:
+                logger.info(f"Mapped model {self.model_name} to {model_name}")
+
+            generation_config = {
+                "temperature": self.temperature,
+                "max_output_tokens": self.max_tokens,
+                "response_mime_type": "application/json",
+            }
+
+            self._model = genai.GenerativeModel(
+                model_name=model_name,
+                generation_config=generation_config,
+            )
+            self._model_name = model_name
+            self._generation_config = generation_config
+
+            self._client = genai
+            logger.info(f"Initialized Gemini model: {model_name}")
+
+        except ImportError:
+            logger.error("google-generativeai package not installed")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to initialize Gemini client: {e}")
+            raise
+
+    def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout: float,
+        images: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """Call Gemini generate_content."""
+        self._init_gemini()
+
+        def request(model):
+            if model is not None:
+                prompt = user_prompt
+            else:
+                # Combine system and user prompts
+                model = self._model
+                prompt = f"{system_prompt}\n\n{user_prompt}"
+            contents = [prompt] + [
+                {"mime_type": image.mime_type, "data": image.data} for image in images or []
+            ]
+            return model.generate_content(
+                contents if images else prompt,
+                request_options={"timeout": timeout},
+            )
+
+        model = self._cached_model(system_prompt) if self.context_cache else None
+        try:
+            response = request(model)
+        except Exception as e:
+            if model is None or type(e).__name__ != "NotFound":
+                raise
+            # The cache was deleted or expired on the server; rebuild it once
+            logger.info(f"Gemini context cache not found ({e}), recreating it")
+            response = request(self._cached_model(system_prompt, stale=model))
+
+        usage = getattr(response, "usage_metadata", None)
+
+        return {
+            "content": response.text,
+            "model": self.model_name,
+            "tokens_used": getattr(usage, "total_token_count", 0) if usage else 0,
+            "prompt_tokens": getattr(usage, "prompt_token_count", 0) if usage else 0,
+            "completion_tokens": getattr(usage, "candidates_token_count", 0) if usage else 0,
+            "cached_tokens": getattr(usage, "cached_content_token_count", 0) if usage else 0,
+            "finish_reason": "stop"
+        }
+
+    def _cached_model(self, system_prompt: str, stale: Optional[Any] = None) -> Optional[Any]:
+        """
+        Model bound to cached content holding this system prompt.
+
+        The cached content is recreated shortly before its TTL expires, and
+        when ``stale`` (a model whose cache the server no longer has) is
+        still the stored entry. Falls back to None (uncached calls) when the
+        API refuses to cache, e.g. because the prefix is below the model's
+        minimum cacheable size.
+        """
+        key = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        with self._cache_lock:
+            entry = self._cached_models.get(key)
+            if entry is not None:
+                model, refresh_at = entry
+                if time.monotonic() < refresh_at and (stale is None or model is not stale):
+                    return model
+
+            model = self._create_cached_model(system_prompt)
+            if model is None:
+                refresh_at = float("inf")
+            else:
+                margin = min(self.CACHE_REFRESH_MARGIN, self.cache_ttl / 10)
+                refresh_at = time.monotonic() + self.cache_ttl - margin
+            self._cached_models[key] = (model, refresh_at)
+            return model
+
+    def _create_cached_model(self, system_prompt: str) -> Optional[Any]:
+        """Upload a system prompt as cached content and bind a model to it (None on refusal)."""
+        try:
+            import datetime
+            from google.generativeai import caching
+
+            cached_content = caching.CachedContent.create(
+                model=self._model_name,
+                system_instruction=system_prompt,
+                ttl=datetime.timedelta(seconds=self.cache_ttl),
+            )
+            model = self._client.GenerativeModel.from_cached_content(
+                cached_content=cached_content,
+                generation_config=self._generation_config,
+            )
+            logger.info(f"Created Gemini context cache {cached_content.name} for prompt prefix")
+            return model
+        except Exception as e:
+            logger.info(f"Gemini context caching unavailable, sending full prompts: {e}")
+            return None
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """
+    OpenAI chat-completions API, or any server that implements it.
+
+    Works against OpenAI itself and local OpenAI-compatible servers (vLLM,
+    llama.cpp, Ollama, StandInServer). Uses the ``openai`` SDK when it is
+    installed and a plain HTTP request otherwise.
+    """
+
+    provider_type = "openai"
+
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        api_key_env: str = "OPENAI_API_KEY",
+        json_mode: bool = True,
+        **kwargs
+    ):
+        """
+        Initialize OpenAI-compatible provider.
+
+        Args:
+            model_name: Model name sent with each request
+            base_url: API base URL ending in /v1 (default: OpenAI)
+            api_key: API key (overrides api_key_env)
+            api_key_env: Environment variable holding the API key
+            json_mode: Request a JSON object response format
+            **kwargs: Passed through to LLMProvider
+        """
+        super().__init__(model_name=model_name, **kwargs)
+        self.base_url = (base_url or "https://api.openai.com/v1").rstrip("/")
+        self.api_key = api_key or os.getenv(api_key_env) or ""
+        self.json_mode = json_mode
+        self._client = None
+        self._use_sdk = None
+
+    def _init_openai(self):
+        """Initialize the openai SDK client lazily, if it is installed."""
+        if self._use_sdk is not None:
+            return
+
+        try:
+            import openai
+        except ImportError:
+            logger.debug("openai package not installed, using plain HTTP requests")
+            self._use_sdk = False
+            return
+
+        self._client = openai.OpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key or "not-needed",
+            max_retries=0,
+        )
+        self._use_sdk = True
+
+    def _request_body(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        images: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the chat-completions request body."""
+        user_content: Any = user_prompt
+        if images:
+            user_content = [{"type": "text", "text": user_prompt}] + [
+                {"type": "image_url", "image_url": {"url": image.data_url}}
+                for image in images
+            ]
+
+        body = {
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content},
+            ],
+        }
+        if self.json_mode:
+            body["response_format"] = {"type": "json_object"}
+        return body
+
+    def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout: float,
+        images: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """Call the chat-completions endpoint."""
+        self._init_openai()
+        body = self._request_body(system_prompt, user_prompt, images)
+
+        if self._use_sdk:
+            response = self._client.chat.completions.create(timeout=timeout, **body)
+            data = response.model_dump()
+        else:
+            data = self._post(body, timeout)
+
+        choice = data["choices"][0]
+        usage = data.get("usage") or {}
+        # Automatic prefix caching (OpenAI, vLLM): the stable system prompt
+        # comes first so repeated prefixes are served from cache
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        return {
+            "content": choice["message"]["content"] or "",
+            "model": data.get("model") or self.model_name,
+            "tokens_used": usage.get("total_tokens", 0),
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "cached_tokens": cached,
+            "finish_reason": choice.get("finish_reason") or "stop"
+        }
+
+    def _post(self, body: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """POST a request without the SDK, mapping HTTP errors to LLM errors."""
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        request = urllib.request.Request(
+            f"{self.base_url}/chat/completions",
+            data=json.dumps(body).encode("utf-8"),
+            headers=headers,
+        )
+
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                retry_after = e.headers.get("Retry-After")
+                raise RetryableLLMError(
+                    f"HTTP 429 from {self.base_url}",
+                    retry_after=float(retry_after) if retry_after else None
+                ) from e
+            if e.code == 408 or e.code >= 500:
+                # 408: the gateway timed out waiting for the model
+                raise RetryableLLMError(f"HTTP {e.code} from {self.base_url}") from e
+            raise LLMCallError(f"HTTP {e.code} from {self.base_url}") from e
+        except urllib.error.URLError as e:
+            raise RetryableLLMError(f"Could not reach {self.base_url}: {e.reason}") from e
+
+
+PROVIDER_TYPES = {
+    GeminiProvider.provider_type: GeminiProvider,
+    OpenAICompatibleProvider.provider_type: OpenAICompatibleProvider,
+}
+
+
+def create_provider(provider_type: str, **kwargs) -> LLMProvider:
+    """
+    Create a provider backend by type name.
+
+    Args:
+        provider_type: "gemini" or "openai" (any OpenAI-compatible server)
+        **kwargs: Provider constructor arguments
+
+    Returns:
+        LLMProvider instance
+    """
+    if provider_type not in PROVIDER_TYPES:
+        raise ValueError(
+            f"Unknown provider type: {provider_type} (expected one of {sorted(PROVIDER_TYPES)})"
+        )
+    return PROVIDER_TYPES[provider_type](**kwargs)
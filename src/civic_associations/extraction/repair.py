@@ -0,0 +1,153 @@
+"""Gap detection and targeted repair of incomplete extractions."""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from ..utils import setup_logger
+from .rule_based import ROLE_MENTION, TYPE_KEYWORDS
+
+logger = setup_logger(__name__)
+
+
+VALID_ASSOCIATION_TYPES = frozenset(TYPE_KEYWORDS.values()) | {
+    "literary",
+    "military",
+    "political",
+    "professional",
+    "social",
+    "civic",
+    "other",
+}
+
+# Gap code -> description used in the repair prompt
+GAP_DESCRIPTIONS = {
+    "no_members": "the member list is empty although the text lists officers",
+    "missing_roles": "some members have no role although the text gives officer titles",
+    "malformed_names": "some member names are malformed (digits, stray symbols or fragments)",
+    "invalid_type": "association_type is not one of: " + ", ".join(sorted(VALID_ASSOCIATION_TYPES)),
+}
+
+MEMBER_GAPS = ("no_members", "missing_roles", "malformed_names")
+
+# Name words in any script ("Müller"), runs of initials ("J.W.") and ordinal
+# suffixes of same-named members, bare or in parentheses ("2d", "(2d)")
+_NAME_WORD = r"(?:(?:[^\W\d_]\.)+|[^\W\d_](?:[^\W\d_]|['’\-])*\.?)"
+_ORDINAL = r"\d+(?:st|nd|rd|th|d)\.?"
+_NAME_PART = rf"(?:{_NAME_WORD}|{_ORDINAL}|\((?:{_NAME_WORD}|{_ORDINAL})\))"
+PERSON_NAME = re.compile(rf"^{_NAME_WORD}(?:[ ,]+{_NAME_PART})*$")
+
+
+def is_malformed_name(name: Optional[str]) -> bool:
+    """Whether a member name looks like an OCR or extraction fragment."""
+    if not name or not isinstance(name, str):
+        return True
+    name = name.strip()
+    return (
+        sum(c.isalpha() for c in name) < 2
+        or not name[0].isupper()
+        or not PERSON_NAME.match(name)
+    )
+
+
+def find_entry_span(text: str, name: Optional[str], max_chars: int = 800) -> str:
+    """
+    Locate the part of a section that describes one association.
+
+    Args:
+        text: Section text
+        name: Association name from the extraction
+        max_chars: Longest span returned
+
+    Returns:
+        Text from the line containing the name to the end of its paragraph,
+        or the start of the section if the name cannot be found
+    """
+    start = text.lower().find(name.lower()) if name and isinstance(name, str) else -1
+    if start < 0:
+        return text[:max_chars]
+
+    start = text.rfind("\n", 0, start) + 1
+    end = text.find("\n\n", start)
+    if end < 0:
+        end = len(text)
+    return text[start:min(end, start + max_chars)].strip()
+
+
+def find_gaps(data: Dict[str, Any], span: str) -> List[str]:
+    """
+    Detect specific problems in an extracted association.
+
+    Args:
+        data: Association dictionary from the LLM
+        span: Section text the association was extracted from
+
+    Returns:
+        List of gap codes (keys of GAP_DESCRIPTIONS), empty if the record looks complete
+    """
+    gaps = []
+    members = [m for m in data.get("members") or [] if isinstance(m, dict)]
+    lists_officers = bool(ROLE_MENTION.search(span))
+
+    if not members and lists_officers:
+        gaps.append("no_members")
+    if members and lists_officers and any(not m.get("role") for m in members):
+        gaps.append("missing_roles")
+    if any(is_malformed_name(m.get("full_name")) for m in members):
+        gaps.append("malformed_names")
+
+    association_type = data.get("association_type")
+    if association_type and (
+        not isinstance(association_type, str)
+        or association_type.strip().lower() not in VALID_ASSOCIATION_TYPES
+    ):
+        gaps.append("invalid_type")
+
+    return gaps
+
+
+def _name_key(name: Optional[str]) -> str:
+    return re.sub(r"[^a-z]", "", (name or "").lower())
+
+
+def merge_repair(data: Dict[str, Any], fix: Dict[str, Any], gaps: List[str]) -> Dict[str, Any]:
+    """
+    Merge a repair response into the original extraction.
+
+    Only the fields named by the gaps are taken from the fix; everything
+    else in the original record is kept.
+
+    Args:
+        data: Original association dictionary
+        fix: Association dictionary returned by the repair call
+        gaps: Gap codes the repair was asked to fix
+
+    Returns:
+        New merged association dictionary
+    """
+    merged = dict(data)
+
+    if "invalid_type" in gaps:
+        fixed_type = fix.get("association_type")
+        fixed_type = fixed_type.strip().lower() if isinstance(fixed_type, str) else ""
+        merged["association_type"] = fixed_type if fixed_type in VALID_ASSOCIATION_TYPES else None
+
+    fix_members = [m for m in fix.get("members") or [] if isinstance(m, dict)]
+    if not fix_members or not any(gap in gaps for gap in MEMBER_GAPS):
+        return merged
+
+    members = [dict(m) for m in data.get("members") or [] if isinstance(m, dict)]
+    if len(members) != len(fix_members):
+        # The repair found a different set of people; trust its complete list
+        merged["members"] = fix_members
+        return merged
+
+    by_name = {_name_key(m.get("full_name")): m for m in fix_members}
+    for member, positional in zip(members, fix_members):
+        counterpart = by_name.get(_name_key(member.get("full_name")), positional)
+        if "malformed_names" in gaps and is_malformed_name(member.get("full_name")):
+            member["full_name"] = positional.get("full_name") or member.get("full_name")
+            counterpart = positional
+        if not member.get("role") and counterpart.get("role"):
+            member["role"] = counterpart["role"]
+    merged["members"] = members
+    return merged
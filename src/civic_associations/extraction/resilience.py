@@ -0,0 +1,259 @@
+"""Retry, circuit breaker and latency tracking helpers for LLM calls."""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from ..utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# Exception class names raised by provider SDKs for transient failures
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "InternalServerError",
+    "TooManyRequests",
+    "RateLimitError",
+    "APITimeoutError",
+    "APIConnectionError",
+}
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMCallError(Exception):
+    """Raised when an LLM call fails and no usable response is available."""
+
+
+class RetryableLLMError(LLMCallError):
+    """Transient LLM failure (rate limit, overload, timeout) that may be retried."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Initialize retryable error.
+
+        Args:
+            message: Error description
+            retry_after: Optional server-suggested delay in seconds
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(LLMCallError):
+    """Raised when the circuit breaker refuses a call."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Decide whether an exception from a provider call is worth retrying.
+
+    Args:
+        error: Exception raised by the provider call
+
+    Returns:
+        True for timeouts, connection errors, rate limits and 5xx responses
+    """
+    if isinstance(error, RetryableLLMError):
+        return True
+    if isinstance(error, LLMCallError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return isinstance(status, int) and status in RETRYABLE_STATUS_CODES
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        jitter: bool = True,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize retry policy.
+
+        Args:
+            max_attempts: Total attempts including the first call
+            base_delay: Delay before the first retry, in seconds
+            max_delay: Upper bound on any single delay, in seconds
+            jitter: Randomize delays uniformly in [0, backoff]
+            seed: Optional RNG seed for reproducible delays
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before the next attempt.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            retry_after: Server-suggested delay, used as a lower bound
+
+        Returns:
+            Delay in seconds
+        """
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = self._rng.uniform(0, backoff) if self.jitter else backoff
+
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that pauses submission while a provider is failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    callers wait until ``reset_timeout`` has elapsed. A single probe call is
+    then let through (half-open); success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures before opening
+            reset_timeout: Seconds to stay open before allowing a probe
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def wait_until_ready(self, max_wait: Optional[float] = None) -> None:
+        """
+        Block until a call may be submitted.
+
+        Args:
+            max_wait: Maximum seconds to wait (None waits indefinitely)
+
+        Raises:
+            CircuitOpenError: If the circuit stays open longer than max_wait
+        """
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.state == self.CLOSED:
+                    return
+                if self.state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+                    self.state = self.HALF_OPEN
+                    self._probe_in_flight = False
+                if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                    self._probe_in_flight = True
+                    return
+
+                if self.state == self.OPEN:
+                    remaining = self.reset_timeout - (now - self._opened_at)
+                else:
+                    remaining = min(1.0, self.reset_timeout)
+
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise CircuitOpenError("Circuit breaker is open; provider appears unavailable")
+                remaining = min(remaining, left)
+
+            time.sleep(max(0.01, remaining))
+
+    def record_success(self) -> None:
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Circuit breaker closed")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """
+        Release a half-open probe without recording success or failure.
+
+        Used when a call ends in an error that says nothing about provider
+        health (e.g. a rejected request), so the next call can probe instead.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"Circuit breaker opened after {self._failures} consecutive failures; "
+                        f"pausing submission for {self.reset_timeout}s"
+                    )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to trigger hedged requests."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Initialize latency tracker.
+
+        Args:
+            window: Number of recent latencies to keep
+            min_samples: Samples required before quantiles are reported
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Record a call latency in seconds."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Return the q-quantile of recent latencies.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
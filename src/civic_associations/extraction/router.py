@@ -0,0 +1,242 @@
+"""Latency-, error- and cost-aware routing of LLM calls across providers."""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..utils import setup_logger
+from .llm_client import LLMClient
+from .resilience import CircuitBreaker, LatencyTracker, LLMCallError
+
+logger = setup_logger(__name__)
+
+
+class RouteTarget:
+    """One provider in a router, with its limits and observed performance."""
+
+    def __init__(
+        self,
+        client: LLMClient,
+        name: Optional[str] = None,
+        max_concurrency: int = 8,
+        cost_per_1k_tokens: float = 0.0,
+        smoothing: float = 0.2
+    ):
+        """
+        Initialize route target.
+
+        Args:
+            client: Client for this provider (with its own retries and breaker)
+            name: Display name (default: the client's model name)
+            max_concurrency: Maximum in-flight calls sent to this provider
+            cost_per_1k_tokens: Blended price used to prefer cheaper providers
+            smoothing: Weight of the newest observation in the moving averages
+        """
+        self.client = client
+        self.name = name or client.model_name
+        self.max_concurrency = max(1, max_concurrency)
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.smoothing = smoothing
+
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.avg_latency: Optional[float] = None
+        self.error_rate = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Whether the target has spare concurrency and a usable circuit."""
+        return (
+            self.in_flight < self.max_concurrency
+            and self.client.circuit_breaker.state != CircuitBreaker.OPEN
+        )
+
+    def record(self, latency: Optional[float], failed: bool) -> None:
+        """Update moving averages after a call."""
+        self.calls += 1
+        self.failures += int(failed)
+        self.error_rate += self.smoothing * (float(failed) - self.error_rate)
+        if latency is not None:
+            if self.avg_latency is None:
+                self.avg_latency = latency
+            else:
+                self.avg_latency += self.smoothing * (latency - self.avg_latency)
+
+
+class LLMRouter:
+    """
+    Dispatch calls across several LLM providers.
+
+    Each call goes to the available target with the lowest score, where the
+    score combines the observed latency (inflated by current load and error
+    rate) with a cost term. Targets at their concurrency limit or with an
+    open circuit are skipped; if every target is busy the call waits for a
+    slot. When a target fails after its own retries, the call fails over to
+    the next-best target that has not been tried yet.
+
+    The router exposes the same ``call`` contract as LLMClient, so it can be
+    passed to Extractor directly.
+    """
+
+    def __init__(
+        self,
+        targets: List[RouteTarget],
+        cost_weight: float = 1.0,
+        error_penalty: float = 4.0
+    ):
+        """
+        Initialize router.
+
+        Args:
+            targets: Providers to route across
+            cost_weight: Seconds of latency considered equivalent to $1 per 1k tokens
+            error_penalty: Multiplier on error rate when inflating latency
+        """
+        if not targets:
+            raise ValueError("LLMRouter needs at least one target")
+
+        self.targets = targets
+        self.cost_weight = cost_weight
+        self.error_penalty = error_penalty
+        self.model_name = "router"
+        self.latency = LatencyTracker()
+        self._condition = threading.Condition()
+
+        logger.info(f"Initialized LLMRouter with targets: {[t.name for t in targets]}")
+
+    @classmethod
+    def from_config(cls, llm_config: Dict[str, Any]) -> "LLMRouter":
+        """
+        Build a router from an ``extraction.llm`` config block with ``providers``.
+
+        Each provider entry may override any ``llm`` setting (model_name,
+        api_timeout, retry, ...) and sets ``type`` ("gemini" or "openai"),
+        ``base_url``, ``api_key_env``, ``max_concurrency`` and
+        ``cost_per_1k_tokens``.
+        """
+        routing = llm_config.get("routing", {})
+        targets = []
+        for provider_config in llm_config.get("providers", []):
+            merged = {k: v for k, v in llm_config.items() if k not in ("providers", "routing")}
+            merged.update(provider_config)
+            targets.append(RouteTarget(
+                client=LLMClient.from_config(merged),
+                name=provider_config.get("name"),
+                max_concurrency=provider_config.get("max_concurrency", 8),
+                cost_per_1k_tokens=provider_config.get("cost_per_1k_tokens", 0.0)
+            ))
+
+        return cls(
+            targets,
+            cost_weight=routing.get("cost_weight", 1.0),
+            error_penalty=routing.get("error_penalty", 4.0)
+        )
+
+    def _score(self, target: RouteTarget) -> float:
+        """Lower is better. Unobserved targets score 0 so they get tried."""
+        if target.avg_latency is None:
+            return 0.0
+        load = 1.0 + target.in_flight / target.max_concurrency
+        latency = target.avg_latency * load * (1.0 + self.error_penalty * target.error_rate)
+        return latency + self.cost_weight * target.cost_per_1k_tokens
+
+    def _acquire(self, exclude: List[RouteTarget]) -> Optional[RouteTarget]:
+        """Reserve a slot on the best target, waiting while all are busy."""
+        with self._condition:
+            while True:
+                candidates = [t for t in self.targets if t not in exclude]
+                if not candidates:
+                    return None
+
+                available = [t for t in candidates if t.available]
+                if not available and all(
+                    t.client.circuit_breaker.state == CircuitBreaker.OPEN for t in candidates
+                ):
+                    # Everything is down: let the least-loaded target's breaker pace us
+                    available = [t for t in candidates if t.in_flight < t.max_concurrency]
+
+                if available:
+                    target = min(available, key=self._score)
+                    target.in_flight += 1
+                    return target
+
+                self._condition.wait(timeout=1.0)
+
+    def _release(self, target: RouteTarget, latency: Optional[float], failed: bool) -> None:
+        """Return a slot and record the outcome."""
+        with self._condition:
+            target.in_flight -= 1
+            target.record(latency, failed)
+            self._condition.notify()
+
+    def call(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        images: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Route a call, failing over to other providers on failure.
+
+        Args:
+            system_prompt: System instruction
+            user_prompt: User query
+            images: ImagePayload objects to attach (multimodal mode)
+
+        Returns:
+            Response dictionary from the provider that answered, with a
+            ``provider`` key naming it
+
+        Raises:
+            LLMCallError: If every provider failed
+        """
+        tried: List[RouteTarget] = []
+        last_error = None
+
+        while True:
+            target = self._acquire(exclude=tried)
+            if target is None:
+                break
+            tried.append(target)
+
+            start = time.monotonic()
+            try:
+                result = target.client.call(system_prompt, user_prompt, images)
+            except LLMCallError as e:
+                self._release(target, time.monotonic() - start, failed=True)
+                last_error = e
+                logger.warning(f"Provider {target.name} failed ({e}); failing over")
+                continue
+
+            self._release(target, result.get("latency"), failed=False)
+            self.latency.record(time.monotonic() - start)
+            result["provider"] = target.name
+            return result
+
+        raise LLMCallError(f"All providers failed; last error: {last_error}") from last_error
+
+    def close(self) -> None:
+        """Close the clients of all targets."""
+        for target in self.targets:
+            target.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return per-provider routing statistics."""
+        return [
+            {
+                "name": t.name,
+                "calls": t.calls,
+                "failures": t.failures,
+                "avg_latency": t.avg_latency,
+                "error_rate": t.error_rate,
+                "in_flight": t.in_flight,
+            }
+            for t in self.targets
+        ]
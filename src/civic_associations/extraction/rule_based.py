@@ -0,0 +1,153 @@
+"""Rule-based fast path for directory entries with a rigid layout."""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils import setup_logger
+from ..utils.names import ROLE_ALIASES, normalize_role
+
+logger = setup_logger(__name__)
+
+
+# Keyword -> association_type
+TYPE_KEYWORDS = {
+    "temperance": "temperance",
+    "masonic": "masonic",
+    "lodge": "fraternal",
+    "odd fellows": "fraternal",
+    "hunting": "hunting",
+    "benevolent": "benevolent",
+    "charitable": "benevolent",
+    "musical": "musical",
+    "fire": "fire company",
+    "church": "religious",
+    "bible": "religious",
+}
+
+ASSOCIATION_NOUNS = (
+    "Society|Association|Lodge|Club|Union|Company|Institute|Order|Chapter|"
+    "Encampment|Division|Council|Circle|Guild|Band|Corps|Brotherhood|Sisterhood"
+)
+
+
+def _role_regex() -> str:
+    """Regex alternation matching every alias as printed (with optional dots)."""
+    variants = set()
+    for alias in ROLE_ALIASES:
+        words = alias.split(" ")
+        variants.add(r"\.?\s*".join(re.escape(w) for w in words) + r"\.?")
+    return "|".join(sorted(variants, key=len, reverse=True))
+
+
+_ROLE = _role_regex()
+_NAME = (
+    r"[A-Z][A-Za-z'\-]*\.?(?:\s*(?:[A-Z][A-Za-z'\-]*\.?|de|van|von))*"
+    r"(?:,?\s*(?:jr|sr|Jr|Sr)\.?)?"
+)
+
+ENTRY_PATTERN = re.compile(
+    rf"^(?P<name>[A-Z][^;:]*?\b(?:{ASSOCIATION_NOUNS})\b(?:,?\s*No\.\s*\d+)?)"
+    r"\s*[.,]?\s*(?:[—–]+|-{1,2}|:)\s*(?P<body>.+)$"
+)
+# Titles match in any case; names must be capitalized so prose is not taken for a name
+ROLE_FIRST = re.compile(rf"^(?P<role>(?i:{_ROLE}))\s*[:,]?\s*(?P<name>{_NAME})$")
+NAME_FIRST = re.compile(rf"^(?P<name>{_NAME})\s*[,.]\s*(?P<role>(?i:{_ROLE}))$")
+# Any officer title mentioned in running text
+ROLE_MENTION = re.compile(rf"\b(?:{_ROLE})(?=\W|$)", re.I)
+
+
+class RuleBasedExtractor:
+    """
+    Parse regular directory entries without calling the LLM.
+
+    Recognizes entries of the form
+    ``<Association name> — <Role> <Name>; <Role> <Name>`` (or
+    ``<Name>, <Role>`` officers) and returns them in the LLM's JSON
+    format. Entries that do not parse with full confidence are returned as
+    remainder text for the LLM.
+    """
+
+    def __init__(self, min_confidence: float = 1.0, min_remainder_chars: int = 20):
+        """
+        Initialize rule-based extractor.
+
+        Args:
+            min_confidence: Fraction of officer clauses that must parse for an
+                entry to be accepted
+            min_remainder_chars: Remainders shorter than this are not worth an
+                LLM call
+        """
+        self.min_confidence = min_confidence
+        self.min_remainder_chars = min_remainder_chars
+
+    def parse_entry(self, entry: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Parse a single entry.
+
+        Args:
+            entry: One line or paragraph of section text
+
+        Returns:
+            Tuple of (association dictionary or None, confidence in [0, 1])
+        """
+        text = re.sub(r"\s+", " ", entry).strip()
+        match = ENTRY_PATTERN.match(text)
+        if not match:
+            return None, 0.0
+
+        clauses = [c.strip(" .") for c in match.group("body").split(";") if c.strip(" .")]
+        members = []
+        for clause in clauses:
+            officer = ROLE_FIRST.match(clause) or NAME_FIRST.match(clause)
+            if officer:
+                members.append({
+                    "full_name": officer.group("name").strip(),
+                    "role": normalize_role(officer.group("role")),
+                })
+
+        confidence = len(members) / len(clauses) if clauses else 0.0
+        if not members:
+            return None, confidence
+
+        name = match.group("name").strip()
+        data = {"name": name, "members": members}
+        lowered = name.lower()
+        association_type = next(
+            (value for keyword, value in TYPE_KEYWORDS.items() if keyword in lowered), None
+        )
+        if association_type:
+            data["association_type"] = association_type
+        return data, confidence
+
+    def extract(self, text: str) -> Tuple[List[Tuple[Dict[str, Any], float]], str]:
+        """
+        Split section text into confidently parsed entries and a remainder.
+
+        Args:
+            text: Section text
+
+        Returns:
+            Tuple of ([(association dictionary, confidence), ...], remainder text).
+            The remainder is empty when it is too short to need the LLM.
+        """
+        parsed = []
+        remainder_blocks = []
+
+        for block in re.split(r"\n\s*\n", text):
+            leftover = []
+            for line in block.splitlines():
+                if not line.strip():
+                    continue
+                data, confidence = self.parse_entry(line)
+                if data is not None and confidence >= self.min_confidence:
+                    parsed.append((data, confidence))
+                else:
+                    leftover.append(line)
+            if leftover:
+                remainder_blocks.append("\n".join(leftover))
+
+        remainder_text = "\n\n".join(remainder_blocks).strip()
+        if len(remainder_text) < self.min_remainder_chars:
+            remainder_text = ""
+
+        return parsed, remainder_text
@@ -0,0 +1,387 @@
+"""Deterministic local stand-in for the LLM, for load and throughput testing.
+
+``StandInLLMClient`` implements the ``LLMClient`` contract in-process with
+configurable latency, error and rate-limit behaviour. ``StandInServer`` exposes
+the same behaviour over HTTP using the OpenAI chat-completions wire format, so
+``OpenAICompatibleProvider`` (and the router) can be benchmarked without
+network access.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ..utils import setup_logger
+from .llm_client import LLMClient
+from .resilience import RetryableLLMError
+from .rule_based import TYPE_KEYWORDS
+
+logger = setup_logger(__name__)
+
+
+ROLE_PATTERN = re.compile(
+    r"\b(?P<role>Vice[- ]President|V\. ?Pres\.|President|Pres\.|Secretary|Sec(?:'y|y)?\.|"
+    r"Treasurer|Treas\.|Librarian|Chairman|Director)\s*[:,]?\s*"
+    r"(?P<name>[A-Z][A-Za-z.'\- ]+?)(?=\s*(?:[,;\n]|$))"
+)
+
+ASSOCIATION_NAME_PATTERN = re.compile(
+    r"\b(Society|Association|Lodge|Club|Union|Company|Institute|Order|Chapter|Encampment)\b"
+)
+
+
+class LatencyModel:
+    """Latency distribution for simulated calls."""
+
+    DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+    def __init__(
+        self,
+        distribution: str = "constant",
+        mean: float = 0.0,
+        spread: float = 0.0
+    ):
+        """
+        Initialize latency model.
+
+        Args:
+            distribution: One of "constant", "uniform", "exponential", "lognormal"
+            mean: Mean latency in seconds
+            spread: Half-width for uniform, sigma for lognormal (ignored otherwise)
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.mean = mean
+        self.spread = spread
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency in seconds."""
+        if self.mean <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            return max(0.0, rng.uniform(self.mean - self.spread, self.mean + self.spread))
+        if self.distribution == "exponential":
+            return rng.expovariate(1.0 / self.mean)
+        if self.distribution == "lognormal":
+            # Parameterized so that the distribution mean equals self.mean
+            sigma = self.spread
+            mu = math.log(self.mean) - sigma ** 2 / 2
+            return rng.lognormvariate(mu, sigma)
+        return self.mean
+
+
+def extract_section_text(user_prompt: str) -> str:
+    """
+    Recover the section text from an extraction user prompt.
+
+    Args:
+        user_prompt: Prompt built by build_extraction_prompt
+
+    Returns:
+        The section text, or the whole prompt if no marker is found
+    """
+    match = re.search(r"Section text:\n(.*?)(?:\n\nReturn valid JSON|\Z)", user_prompt, re.S)
+    return match.group(1) if match else user_prompt
+
+
+def generate_association_json(section_text: str) -> Dict[str, Any]:
+    """
+    Build a plausible extraction result from section text using simple rules.
+
+    Args:
+        section_text: Directory section text
+
+    Returns:
+        Dictionary in the extraction JSON format
+    """
+    lines = [line.strip(" #*\t") for line in section_text.splitlines()]
+    lines = [line for line in lines if line]
+
+    name = next((line for line in lines if ASSOCIATION_NAME_PATTERN.search(line)), None)
+    if name is None:
+        name = lines[0] if lines else "Unknown"
+    name = re.split(r"\s+[-–—]+\s+|[:;]", name)[0].strip()
+
+    lowered = section_text.lower()
+    association_type = next(
+        (value for keyword, value in TYPE_KEYWORDS.items() if keyword in lowered), None
+    )
+
+    members = [
+        {"full_name": match.group("name").strip(), "role": match.group("role")}
+        for match in ROLE_PATTERN.finditer(section_text)
+    ]
+
+    data = {"name": name, "members": members}
+    if association_type:
+        data["association_type"] = association_type
+    return data
+
+
+# Prompt tokens charged per attached image (Gemini bills ~258 per image)
+IMAGE_TOKENS = 258
+
+
+class StandInLLMClient(LLMClient):
+    """
+    In-process LLM stand-in with deterministic, configurable behaviour.
+
+    Outcomes (latency, injected errors) are drawn from an RNG seeded by the
+    configured seed, the prompt and how many times that prompt has been seen,
+    so a run is reproducible regardless of thread scheduling.
+
+    Like providers with automatic prefix caching, the stand-in remembers the
+    hash of each system prompt it has served and reports that prefix's
+    tokens as ``cached_tokens`` on later calls.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        rate_limit_retry_after: float = 0.0,
+        canned_responses: Optional[Dict[str, Union[str, Dict[str, Any]]]] = None,
+        response_fn: Optional[Callable[[str], Dict[str, Any]]] = None,
+        seed: int = 0,
+        model_name: str = "standin",
+        min_cached_prefix_tokens: int = 0,
+        **kwargs
+    ):
+        """
+        Initialize stand-in client.
+
+        Args:
+            latency: Latency model for simulated calls (default: no delay)
+            error_rate: Probability of a simulated 503 error per call
+            rate_limit_rate: Probability of a simulated 429 response per call
+            rate_limit_retry_after: Retry-After seconds reported with 429s
+            canned_responses: Map of substring -> response; the first key found
+                in the user prompt determines the response
+            response_fn: Function from section text to a response dictionary,
+                used when no canned response matches (default: rule-based)
+            seed: Seed for reproducible outcomes
+            model_name: Model name reported in responses
+            min_cached_prefix_tokens: Shortest system prompt (in tokens) that
+                is cached (OpenAI caches prefixes from 1024 tokens)
+            **kwargs: Passed through to LLMClient (timeouts, retry policy, ...)
+        """
+        super().__init__(model_name=model_name, **kwargs)
+        self.latency_model = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rate_limit_retry_after = rate_limit_retry_after
+        self.canned_responses = canned_responses or {}
+        self.response_fn = response_fn or generate_association_json
+        self.seed = seed
+        self.min_cached_prefix_tokens = min_cached_prefix_tokens
+        self.stats = Counter()
+        self._seen_prefixes = set()
+        self._prompt_counts = Counter()
+        self._lock = threading.Lock()
+
+    def _rng_for(self, system_prompt: str, user_prompt: str) -> random.Random:
+        """Return an RNG determined by the prompt and its occurrence count."""
+        digest = hashlib.sha256(f"{system_prompt}\n{user_prompt}".encode("utf-8")).hexdigest()
+        with self._lock:
+            occurrence = self._prompt_counts[digest]
+            self._prompt_counts[digest] += 1
+        return random.Random(f"{self.seed}:{digest}:{occurrence}")
+
+    def _generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        images: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """Simulate a provider request. Images are counted, not inspected."""
+        rng = self._rng_for(system_prompt, user_prompt)
+        time.sleep(self.latency_model.sample(rng))
+
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["images"] += len(images or [])
+
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            raise RetryableLLMError(
+                "429 rate limit exceeded (stand-in)",
+                retry_after=self.rate_limit_retry_after
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise RetryableLLMError("503 service unavailable (stand-in)")
+
+        content = self._response_content(user_prompt)
+        prefix_tokens = len(system_prompt) // 4
+        prefix = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            self.stats["succeeded"] += 1
+            cached = prefix in self._seen_prefixes
+            if prefix_tokens >= self.min_cached_prefix_tokens:
+                self._seen_prefixes.add(prefix)
+            if cached:
+                self.stats["prefix_cache_hits"] += 1
+
+        prompt_tokens = prefix_tokens + len(user_prompt) // 4 + IMAGE_TOKENS * len(images or [])
+        completion_tokens = len(content) // 4
+        return {
+            "content": content,
+            "model": self.model_name,
+            "tokens_used": prompt_tokens + completion_tokens,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": prefix_tokens if cached else 0,
+            "finish_reason": "stop"
+        }
+
+    def _response_content(self, user_prompt: str) -> str:
+        """Pick a canned response or generate one from the section text."""
+        for key, response in self.canned_responses.items():
+            if key in user_prompt:
+                return response if isinstance(response, str) else json.dumps(response)
+        return json.dumps(self.response_fn(extract_section_text(user_prompt)))
+
+
+def _message_text(content: Any) -> str:
+    """Text of a chat message whose content is a string or a list of parts."""
+    if isinstance(content, list):
+        return "\n".join(part.get("text", "") for part in content if part.get("type") == "text")
+    return content or ""
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    """Serve POST /v1/chat/completions from the server's stand-in backend."""
+
+    def do_POST(self):
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+
+        messages = body.get("messages", [])
+        system_prompt = "\n".join(
+            _message_text(m.get("content")) for m in messages if m.get("role") == "system"
+        )
+        user_prompt = "\n".join(
+            _message_text(m.get("content")) for m in messages if m.get("role") == "user"
+        )
+        images = [
+            part for m in messages if isinstance(m.get("content"), list)
+            for part in m["content"] if part.get("type") == "image_url"
+        ]
+
+        backend = self.server.backend
+        try:
+            result = backend._generate(system_prompt, user_prompt, images)
+        except RetryableLLMError as e:
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after is not None:
+                headers = {"Retry-After": f"{retry_after:g}"}
+                self._send_json(429, {"error": {"message": str(e)}}, headers)
+            else:
+                self._send_json(503, {"error": {"message": str(e)}})
+            return
+
+        self._send_json(200, {
+            "id": f"standin-{backend.stats['calls']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or result["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": result["content"]},
+                "finish_reason": result["finish_reason"],
+            }],
+            "usage": {
+                "prompt_tokens": result["prompt_tokens"],
+                "completion_tokens": result["completion_tokens"],
+                "total_tokens": result["tokens_used"],
+                "prompt_tokens_details": {"cached_tokens": result["cached_tokens"]},
+            },
+        })
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("stand-in %s - %s", self.address_string(), format % args)
+
+
+class StandInServer:
+    """HTTP server exposing a StandInLLMClient as an OpenAI-compatible endpoint."""
+
+    def __init__(
+        self,
+        backend: Optional[StandInLLMClient] = None,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        """
+        Initialize stand-in server.
+
+        Args:
+            backend: Stand-in client that produces responses
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.backend = backend or StandInLLMClient()
+        self._httpd = ThreadingHTTPServer((host, port), _StandInRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.backend = self.backend
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the OpenAI-compatible API (ends in /v1)."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StandInServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Stand-in LLM server listening on {self.url}")
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the current thread until interrupted."""
+        logger.info(f"Stand-in LLM server listening on {self.url}")
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Shut down the server."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,24 @@
+"""Linkage module for resolving member names to persons."""
+
+from .blocking import blocking_keys, split_name
+from .lineage import AssociationLinker, association_tokens
+from .minhash import MinHasher, estimate_jaccard, lsh_candidates
+from .network import MembershipNetwork, cooccurrence
+from .phonetic import nysiis, soundex
+from .resolver import PersonLinker, UnionFind
+
+__all__ = [
+    "AssociationLinker",
+    "MembershipNetwork",
+    "MinHasher",
+    "PersonLinker",
+    "UnionFind",
+    "association_tokens",
+    "blocking_keys",
+    "cooccurrence",
+    "estimate_jaccard",
+    "lsh_candidates",
+    "nysiis",
+    "soundex",
+    "split_name",
+]
@@ -0,0 +1,70 @@
+"""Name normalization and blocking keys for person linkage."""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from ..utils.names import fold_ascii, parse_name
+from .phonetic import nysiis, soundex
+
+
+def _plain(text: Optional[str]) -> str:
+    return " ".join(re.sub(r"[^a-z ]+", "", fold_ascii(text or "").replace("-", " ")).split())
+
+
+def split_name(full_name: str) -> Tuple[str, str]:
+    """
+    Split a member name into normalized (given names, surname).
+
+    Uses parse_name, so titles and suffixes are dropped and abbreviated
+    given names expanded ("Wm." -> "william"); the parts are lowercased,
+    folded to ASCII ("Müller" -> "muller") and stripped of punctuation.
+
+    Args:
+        full_name: Name as extracted
+
+    Returns:
+        Tuple of (given names separated by spaces, surname); either may be ""
+    """
+    parsed = parse_name(full_name)
+    return _plain(parsed.given_names), _plain(parsed.surname)
+
+
+def sort_key(given: str, surname: str) -> str:
+    """Ordering key for sorted-neighborhood windows: "surname|given"."""
+    return f"{surname}|{given}"
+
+
+@lru_cache(maxsize=1 << 16)
+def _surname_codes(surname: str) -> Tuple[str, str]:
+    # Surnames repeat heavily across directories
+    return soundex(surname), nysiis(surname)
+
+
+def blocking_keys(given: str, surname: str) -> List[str]:
+    """
+    Blocking keys of a split name.
+
+    Names are only compared with names sharing a key:
+
+    - ``S:<soundex>:<initial>``: Soundex of the surname and first initial
+    - ``N:<nysiis>:<initial>``: NYSIIS of the surname and first initial
+    - ``I:<initials>:<surname>``: all initials and the exact surname
+
+    Args:
+        given: Normalized given names
+        surname: Normalized surname
+
+    Returns:
+        List of keys (empty if the name has no surname)
+    """
+    if not surname:
+        return []
+    initials = "".join(token[0] for token in given.split())
+    initial = initials[:1]
+    soundex_code, nysiis_code = _surname_codes(surname)
+    return [
+        f"S:{soundex_code}:{initial}",
+        f"N:{nysiis_code}:{initial}",
+        f"I:{initials}:{surname}",
+    ]
@@ -0,0 +1,237 @@
+"""Link the same association across directory years."""
+
+import re
+import sqlite3
+import time
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..db.schema import create_schema
+from ..utils import setup_logger
+from .blocking import split_name
+from .minhash import MinHasher, estimate_jaccard, lsh_candidates
+
+logger = setup_logger(__name__)
+
+
+def association_tokens(
+    name: str,
+    member_names: Iterable[str],
+    shingle_size: int = 3
+) -> List[str]:
+    """
+    Token set sketched for an association.
+
+    Character shingles of the normalized name ("n:" prefix) tolerate small
+    spelling and OCR differences; member names reduced to initial plus
+    surname ("m:" prefix) add who belonged to it.
+
+    Args:
+        name: Association name
+        member_names: Full names of its members
+        shingle_size: Characters per name shingle
+
+    Returns:
+        List of tokens
+    """
+    normalized = " ".join(re.sub(r"[^a-z0-9 ]+", " ", (name or "").lower()).split())
+    padded = f" {normalized} "
+    tokens = [
+        "n:" + padded[i:i + shingle_size]
+        for i in range(max(len(padded) - shingle_size + 1, 1))
+    ] if normalized else []
+
+    for full_name in member_names:
+        given, surname = split_name(full_name)
+        if surname:
+            tokens.append(f"m:{given[:1]}{surname}")
+    return tokens
+
+
+class AssociationLinker:
+    """
+    Chain the appearances of an association across directory years.
+
+    Each association is sketched with MinHash over association_tokens and
+    the signature is stored in ``association_signatures``, so later runs
+    only sketch new associations. LSH banding over all signatures yields
+    candidate pairs without comparing every pair; candidates from
+    different years at most ``max_year_gap`` apart whose estimated Jaccard
+    similarity reaches ``min_similarity`` are linked greedily, nearest years
+    and then most similar first, each association getting at most one
+    predecessor and one successor. The resulting chains are written to
+    ``association_lineage``, where ``lineage_id`` is the association_id of
+    the earliest appearance.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        num_perm: int = 128,
+        bands: int = 32,
+        min_similarity: float = 0.5,
+        max_year_gap: int = 10,
+        shingle_size: int = 3,
+        max_bucket_size: int = 1000,
+        seed: int = 1
+    ):
+        """
+        Initialize association linker.
+
+        Args:
+            db_path: Path to SQLite database
+            num_perm: MinHash signature length
+            bands: LSH bands (must divide num_perm); more bands find less
+                similar candidates
+            min_similarity: Lowest estimated Jaccard similarity for a link
+            max_year_gap: Most years between linked appearances
+            shingle_size: Characters per name shingle
+            max_bucket_size: LSH buckets larger than this are skipped
+            seed: Seed of the MinHash functions
+        """
+        self.db_path = db_path
+        self.bands = bands
+        self.min_similarity = min_similarity
+        self.max_year_gap = max_year_gap
+        self.shingle_size = shingle_size
+        self.max_bucket_size = max_bucket_size
+        self.hasher = MinHasher(num_perm=num_perm, seed=seed)
+        # Signatures made with other settings are recomputed
+        self.sketch_params = f"{num_perm}:{seed}:{shingle_size}"
+
+    @classmethod
+    def from_config(cls, db_path: str, lineage_config: Dict[str, Any]) -> "AssociationLinker":
+        """Build a linker from the ``linkage.lineage`` config block."""
+        return cls(
+            db_path,
+            num_perm=lineage_config.get("num_perm", 128),
+            bands=lineage_config.get("bands", 32),
+            min_similarity=lineage_config.get("min_similarity", 0.5),
+            max_year_gap=lineage_config.get("max_year_gap", 10),
+            shingle_size=lineage_config.get("shingle_size", 3),
+            max_bucket_size=lineage_config.get("max_bucket_size", 1000),
+            seed=lineage_config.get("seed", 1)
+        )
+
+    def link(self) -> Dict[str, Any]:
+        """
+        Sketch new associations and rebuild the lineage table.
+
+        Returns:
+            Dictionary of counts and timing
+        """
+        start = time.perf_counter()
+        create_schema(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            stats = {"sketched": self._sketch_new(conn)}
+            stats.update(self._build_lineage(conn))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        logger.info(
+            f"Sketched {stats['sketched']} associations; {stats['candidate_pairs']} "
+            f"candidate pairs, {stats['links']} links, {stats['lineages']} multi-year lineages"
+        )
+        return stats
+
+    def _sketch_new(self, conn: sqlite3.Connection) -> int:
+        """Store signatures of associations without a current one."""
+        rows = conn.execute("""
+            SELECT a.association_id, a.name, m.full_name
+            FROM associations a
+            LEFT JOIN association_signatures s ON s.association_id = a.association_id
+            LEFT JOIN members m ON m.association_id = a.association_id
+            WHERE s.association_id IS NULL OR s.sketch_params != ?
+            ORDER BY a.association_id, m.member_id
+        """, (self.sketch_params,))
+
+        signatures = []
+        for association_id, group in groupby(rows, key=lambda row: row[0]):
+            group = list(group)
+            tokens = association_tokens(
+                group[0][1],
+                [full_name for _, _, full_name in group if full_name],
+                self.shingle_size
+            )
+            signature = self.hasher.signature(tokens)
+            signatures.append((association_id, self.sketch_params, signature.tobytes()))
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO association_signatures (association_id, sketch_params, signature)
+            VALUES (?, ?, ?)
+        """, signatures)
+        return len(signatures)
+
+    def _build_lineage(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        """Link candidate pairs into chains and rewrite association_lineage."""
+        signatures: Dict[str, np.ndarray] = {}
+        years: Dict[str, Optional[int]] = {}
+        for association_id, signature, year in conn.execute("""
+            SELECT s.association_id, s.signature, a.year
+            FROM association_signatures s
+            JOIN associations a ON a.association_id = s.association_id
+            ORDER BY a.year, s.association_id
+        """):
+            signatures[association_id] = np.frombuffer(signature, dtype=np.uint32)
+            years[association_id] = year
+
+        candidates = lsh_candidates(signatures, self.bands, self.max_bucket_size)
+
+        # (similarity, gap, earlier, later) for pairs from different years
+        edges: List[Tuple[float, int, str, str]] = []
+        for id_a, id_b in candidates:
+            year_a, year_b = years[id_a], years[id_b]
+            if year_a is None or year_b is None or year_a == year_b:
+                continue
+            gap = abs(year_b - year_a)
+            if gap > self.max_year_gap:
+                continue
+            similarity = estimate_jaccard(signatures[id_a], signatures[id_b])
+            if similarity < self.min_similarity:
+                continue
+            earlier, later = (id_a, id_b) if year_a < year_b else (id_b, id_a)
+            edges.append((similarity, gap, earlier, later))
+
+        # Nearest in time (then most similar) first, so chains step through
+        # consecutive directories; one link in each direction
+        edges.sort(key=lambda edge: (edge[1], -edge[0], edge[2], edge[3]))
+        predecessor: Dict[str, Tuple[str, float]] = {}
+        successor: Dict[str, str] = {}
+        for similarity, _, earlier, later in edges:
+            if earlier in successor or later in predecessor:
+                continue
+            successor[earlier] = later
+            predecessor[later] = (earlier, similarity)
+
+        rows = []
+        for association_id in signatures:
+            lineage_id, position = association_id, 0
+            while lineage_id in predecessor:
+                lineage_id = predecessor[lineage_id][0]
+                position += 1
+            previous_id, similarity = predecessor.get(association_id, (None, None))
+            rows.append((association_id, lineage_id, previous_id, similarity, position))
+
+        conn.execute("DELETE FROM association_lineage")
+        conn.executemany("""
+            INSERT INTO association_lineage (
+                association_id, lineage_id, predecessor_id, similarity, position
+            ) VALUES (?, ?, ?, ?, ?)
+        """, rows)
+
+        # Chains of two or more appearances start at an association with no predecessor
+        roots = [association_id for association_id in successor if association_id not in predecessor]
+        return {
+            "associations": len(signatures),
+            "candidate_pairs": len(candidates),
+            "links": len(predecessor),
+            "lineages": len(roots),
+        }
@@ -0,0 +1,106 @@
+"""MinHash signatures and LSH banding for set similarity."""
+
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+import numpy as np
+
+# Mersenne prime modulus for the universal hash family
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+class MinHasher:
+    """
+    MinHash signatures of string sets.
+
+    Tokens are hashed to 32 bits with CRC32 and passed through
+    ``num_perm`` universal hashes (a * x + b) mod p, all in one vectorized
+    step per set. The share of equal positions in two signatures estimates
+    the Jaccard similarity of the sets.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        Initialize MinHasher.
+
+        Args:
+            num_perm: Signature length
+            seed: Seed of the hash coefficients (signatures are only
+                comparable with the same seed and length)
+        """
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        # a, b < 2**32 keep a * x + b below 2**64 for 32-bit x
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        """
+        MinHash signature of a token set.
+
+        Args:
+            tokens: Tokens of the set (duplicates are ignored)
+
+        Returns:
+            uint32 array of length num_perm (all 0xFFFFFFFF for an empty set)
+        """
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode("utf-8")) for token in set(tokens)),
+            dtype=np.uint64
+        )
+        if not len(hashes):
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return float(np.mean(sig_a == sig_b))
+
+
+def lsh_candidates(
+    signatures: Dict[Hashable, np.ndarray],
+    bands: int,
+    max_bucket_size: int = 1000
+) -> Set[Tuple[Hashable, Hashable]]:
+    """
+    Candidate pairs of similar signatures by LSH banding.
+
+    Each signature is cut into ``bands`` bands; two keys are candidates when
+    any band is identical. With r rows per band, pairs of Jaccard
+    similarity s become candidates with probability 1 - (1 - s^r)^bands,
+    so the work grows with the number of signatures rather than its square.
+
+    Args:
+        signatures: Key -> signature (all of the same length)
+        bands: Number of bands; must divide the signature length
+        max_bucket_size: Buckets larger than this (uninformative bands such
+            as those of empty sets) are skipped
+
+    Returns:
+        Set of (key, key) pairs, each ordered as in ``signatures``
+    """
+    keys = list(signatures)
+    if not keys:
+        return set()
+    num_perm = len(signatures[keys[0]])
+    if num_perm % bands:
+        raise ValueError(f"{bands} bands do not divide signature length {num_perm}")
+    rows = num_perm // bands
+
+    candidates: Set[Tuple[Hashable, Hashable]] = set()
+    for band in range(bands):
+        buckets: Dict[bytes, List[Hashable]] = defaultdict(list)
+        for key in keys:
+            buckets[signatures[key][band * rows:(band + 1) * rows].tobytes()].append(key)
+        for bucket in buckets.values():
+            if len(bucket) < 2 or len(bucket) > max_bucket_size:
+                continue
+            # Buckets keep the order of ``signatures``
+            for i, key_a in enumerate(bucket):
+                for key_b in bucket[i + 1:]:
+                    candidates.add((key_a, key_b))
+    return candidates
@@ -0,0 +1,439 @@
+"""Co-membership networks of persons and associations."""
+
+import csv
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from ..db.schema import create_schema
+from ..utils import setup_logger
+
+try:
+    from scipy import sparse
+except ImportError:  # numpy fallback in cooccurrence
+    sparse = None
+
+logger = setup_logger(__name__)
+
+EXPORT_FORMATS = ("npz", "mtx")
+
+# Matrix Market entries formatted per write
+_MTX_CHUNK = 100_000
+
+# Current association -> person edges; members not linked by PersonLinker
+# stand for themselves
+_CURRENT_EDGES_SQL = """
+DROP TABLE IF EXISTS temp.current_edges;
+CREATE TEMP TABLE current_edges AS
+SELECT m.association_id, COALESCE(p.person_id, m.member_id) AS person_id,
+       COUNT(*) AS member_count
+FROM members m
+LEFT JOIN person_clusters p ON p.member_id = m.member_id
+WHERE m.association_id IS NOT NULL
+GROUP BY m.association_id, COALESCE(p.person_id, m.member_id);
+
+-- Associations whose stored edges differ from the current ones
+DROP TABLE IF EXISTS temp.dirty_associations;
+CREATE TEMP TABLE dirty_associations (association_id TEXT PRIMARY KEY);
+INSERT INTO dirty_associations
+SELECT association_id FROM (
+    SELECT association_id, person_id, member_count FROM current_edges
+    EXCEPT
+    SELECT association_id, person_id, member_count FROM membership_edges
+)
+UNION
+SELECT association_id FROM (
+    SELECT association_id, person_id, member_count FROM membership_edges
+    EXCEPT
+    SELECT association_id, person_id, member_count FROM current_edges
+);
+
+-- Persons on either side of a change
+DROP TABLE IF EXISTS temp.dirty_persons;
+CREATE TEMP TABLE dirty_persons (person_id INTEGER PRIMARY KEY);
+INSERT INTO dirty_persons
+SELECT person_id FROM membership_edges
+WHERE association_id IN (SELECT association_id FROM dirty_associations)
+UNION
+SELECT person_id FROM current_edges
+WHERE association_id IN (SELECT association_id FROM dirty_associations);
+"""
+
+
+# Nodes of the export in matrix order; a person is named by its first member row
+_PERSON_NODES_SQL = """
+WITH names AS (
+    SELECT COALESCE(p.person_id, m.member_id) AS person_id, m.full_name,
+           ROW_NUMBER() OVER (
+               PARTITION BY COALESCE(p.person_id, m.member_id) ORDER BY m.member_id
+           ) AS position
+    FROM members m
+    LEFT JOIN person_clusters p ON p.member_id = m.member_id
+)
+SELECT e.person_id, names.full_name, COUNT(*) AS associations
+FROM membership_edges e
+JOIN names ON names.person_id = e.person_id AND names.position = 1
+GROUP BY e.person_id
+ORDER BY e.person_id
+"""
+
+
+def cooccurrence(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    num_rows: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pairs of rows sharing columns in a 0/1 incidence matrix.
+
+    This is the upper triangle of B @ B.T, computed as a sparse product
+    with scipy when installed. Without scipy, the rows of each column are
+    expanded into pairs, one vectorized step per distinct column size, and
+    the pairs counted with np.unique.
+
+    Args:
+        rows: Row index of each nonzero entry
+        cols: Column index of each nonzero entry (row, col pairs unique)
+        num_rows: Number of rows
+
+    Returns:
+        Arrays (i, j, count) with i < j
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    if not len(rows):
+        return empty, empty, empty
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+
+    if sparse is not None:
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+            shape=(num_rows, int(cols.max()) + 1)
+        )
+        product = sparse.triu(incidence @ incidence.T, k=1).tocoo()
+        return (
+            product.row.astype(np.int64),
+            product.col.astype(np.int64),
+            product.data.astype(np.int64),
+        )
+
+    # Rows ascending within each column, so pairs come out with i < j
+    order = np.lexsort((rows, cols))
+    rows, cols = rows[order], cols[order]
+    starts = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]])
+    sizes = np.diff(np.r_[starts, len(cols)])
+
+    codes = []
+    for size in np.unique(sizes[sizes > 1]):
+        members = rows[starts[sizes == size][:, None] + np.arange(size)]
+        i, j = np.triu_indices(size, k=1)
+        codes.append(members[:, i].ravel() * num_rows + members[:, j].ravel())
+    if not codes:
+        return empty, empty, empty
+    codes, counts = np.unique(np.concatenate(codes), return_counts=True)
+    return codes // num_rows, codes % num_rows, counts.astype(np.int64)
+
+
+def _write_npz(
+    path: Path,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    data: np.ndarray,
+    shape: Tuple[int, int],
+    symmetric: bool
+) -> None:
+    """Write a CSR matrix in the layout of scipy.sparse.save_npz."""
+    if symmetric:
+        rows, cols, data = np.r_[rows, cols], np.r_[cols, rows], np.r_[data, data]
+    order = np.lexsort((cols, rows))
+    # 32-bit indexes as scipy uses when they fit; half the bytes to compress
+    index_dtype = np.int32 if max(len(data), *shape) < 2 ** 31 else np.int64
+    indptr = np.zeros(shape[0] + 1, dtype=index_dtype)
+    np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+    np.savez_compressed(
+        path,
+        format=np.array(b"csr"),
+        shape=np.array(shape),
+        data=data[order].astype(np.int32),
+        indices=cols[order].astype(index_dtype),
+        indptr=indptr,
+    )
+
+
+def _write_mtx(
+    path: Path,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    data: np.ndarray,
+    shape: Tuple[int, int],
+    symmetric: bool,
+    comment: str
+) -> None:
+    """Write a Matrix Market coordinate file (1-based; lower triangle if symmetric)."""
+    if symmetric:
+        rows, cols = np.maximum(rows, cols), np.minimum(rows, cols)
+    kind = "symmetric" if symmetric else "general"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"%%MatrixMarket matrix coordinate integer {kind}\n")
+        f.write(f"% {comment}\n")
+        f.write(f"{shape[0]} {shape[1]} {len(data)}\n")
+        entries = np.column_stack([rows + 1, cols + 1, data])
+        for start in range(0, len(entries), _MTX_CHUNK):
+            chunk = entries[start:start + _MTX_CHUNK]
+            f.write(("%d %d %d\n" * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def _write_nodes(path: Path, header: Sequence[str], nodes: Iterable[Sequence[Any]]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["index", *header])
+        for index, node in enumerate(nodes):
+            writer.writerow([index, *node])
+
+
+class MembershipNetwork:
+    """
+    Bipartite association-person network and its two projections.
+
+    ``membership_edges`` holds one row per association and person;
+    ``person_network`` counts the associations each pair of persons shares
+    and ``association_network`` the persons each pair of associations
+    shares. Both projections are sparse products of the incidence matrix.
+
+    Updates are incremental: the stored edges are compared with the
+    members and person clusters in SQL, and only projection pairs touching
+    changed associations (after a load) or their persons (after a load or
+    relinking) are recomputed.
+    """
+
+    def __init__(self, db_path: str, cache_size_kb: int = 65536):
+        """
+        Initialize membership network.
+
+        Args:
+            db_path: Path to SQLite database
+            cache_size_kb: SQLite page cache for the update (projection
+                indexes are written in bulk)
+        """
+        self.db_path = db_path
+        self.cache_size_kb = cache_size_kb
+
+    def update(self) -> Dict[str, Any]:
+        """
+        Bring the edge and projection tables up to date.
+
+        Returns:
+            Dictionary of counts and timing
+        """
+        start = time.perf_counter()
+        create_schema(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        try:
+            stats = self._update(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        logger.info(
+            f"Network update: {stats['associations']} changed associations, "
+            f"{stats['persons']} persons; {stats['person_pairs']} person pairs and "
+            f"{stats['association_pairs']} association pairs rewritten"
+        )
+        return stats
+
+    def _update(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        conn.executescript(_CURRENT_EDGES_SQL)
+        stats = {
+            "associations": conn.execute("SELECT COUNT(*) FROM dirty_associations").fetchone()[0],
+            "persons": conn.execute("SELECT COUNT(*) FROM dirty_persons").fetchone()[0],
+            "person_pairs": 0,
+            "association_pairs": 0,
+        }
+        if stats["associations"]:
+            conn.execute("""
+                DELETE FROM membership_edges
+                WHERE association_id IN (SELECT association_id FROM dirty_associations)
+            """)
+            conn.execute("""
+                INSERT INTO membership_edges (association_id, person_id, member_count)
+                SELECT association_id, person_id, member_count FROM current_edges
+                WHERE association_id IN (SELECT association_id FROM dirty_associations)
+            """)
+            stats["person_pairs"] = self._update_person_network(conn)
+            stats["association_pairs"] = self._update_association_network(conn)
+        for table in ("current_edges", "dirty_associations", "dirty_persons"):
+            conn.execute(f"DROP TABLE temp.{table}")
+        return stats
+
+    def _update_person_network(self, conn: sqlite3.Connection) -> int:
+        """Recompute pairs of changed persons, over all their associations."""
+        conn.execute("""
+            DELETE FROM person_network
+            WHERE person_a IN (SELECT person_id FROM dirty_persons)
+              AND person_b IN (SELECT person_id FROM dirty_persons)
+        """)
+        edges = conn.execute("""
+            SELECT e.person_id, e.association_id FROM membership_edges e
+            JOIN dirty_persons d ON d.person_id = e.person_id
+        """).fetchall()
+        if not edges:
+            return 0
+        persons, associations = zip(*edges)
+        person_ids, rows = np.unique(np.array(persons, dtype=np.int64), return_inverse=True)
+        _, cols = np.unique(np.array(associations), return_inverse=True)
+
+        i, j, counts = cooccurrence(rows, cols, len(person_ids))
+        conn.executemany(
+            "INSERT INTO person_network (person_a, person_b, shared_associations) VALUES (?, ?, ?)",
+            zip(person_ids[i].tolist(), person_ids[j].tolist(), counts.tolist())
+        )
+        return len(counts)
+
+    def _update_association_network(self, conn: sqlite3.Connection) -> int:
+        """Recompute pairs involving changed associations."""
+        conn.execute("""
+            DELETE FROM association_network
+            WHERE association_a IN (SELECT association_id FROM dirty_associations)
+               OR association_b IN (SELECT association_id FROM dirty_associations)
+        """)
+        # Every association sharing a person with a changed one
+        edges = conn.execute("""
+            SELECT association_id, person_id FROM membership_edges
+            WHERE person_id IN (
+                SELECT person_id FROM membership_edges
+                WHERE association_id IN (SELECT association_id FROM dirty_associations)
+            )
+        """).fetchall()
+        if not edges:
+            return 0
+        associations, persons = zip(*edges)
+        association_ids, rows = np.unique(np.array(associations), return_inverse=True)
+        _, cols = np.unique(np.array(persons, dtype=np.int64), return_inverse=True)
+        dirty = np.isin(
+            association_ids,
+            [row[0] for row in conn.execute("SELECT association_id FROM dirty_associations")]
+        )
+
+        i, j, counts = cooccurrence(rows, cols, len(association_ids))
+        # Pairs of two unchanged associations may be missing shared persons here
+        keep = dirty[i] | dirty[j]
+        i, j, counts = i[keep], j[keep], counts[keep]
+        conn.executemany(
+            "INSERT INTO association_network (association_a, association_b, shared_persons) "
+            "VALUES (?, ?, ?)",
+            zip(association_ids[i].tolist(), association_ids[j].tolist(), counts.tolist())
+        )
+        return len(counts)
+
+    def export(self, output_dir: str, formats: Sequence[str] = EXPORT_FORMATS) -> List[Path]:
+        """
+        Export the network as sparse matrices with node lists.
+
+        Writes ``membership`` (associations x persons, member counts),
+        ``person_network`` and ``association_network`` (symmetric shared
+        counts) in each format, plus ``associations.csv`` and ``persons.csv``
+        mapping matrix indexes to IDs and names. ``npz`` files load with
+        scipy.sparse.load_npz; ``mtx`` files are Matrix Market coordinate
+        files read by scipy.io.mmread, igraph, Gephi and others.
+
+        Args:
+            output_dir: Directory to write to
+            formats: Any of EXPORT_FORMATS
+
+        Returns:
+            Paths of the files written
+        """
+        unknown = set(formats) - set(EXPORT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown network export formats: {sorted(unknown)}")
+        self.update()
+        output = Path(output_dir)
+        output.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            association_nodes = conn.execute(
+                "SELECT association_id, name, city, state, year FROM associations ORDER BY association_id"
+            ).fetchall()
+            person_nodes = conn.execute(_PERSON_NODES_SQL).fetchall()
+            membership = conn.execute(
+                "SELECT association_id, person_id, member_count FROM membership_edges"
+            ).fetchall()
+            person_pairs = np.array(
+                conn.execute(
+                    "SELECT person_a, person_b, shared_associations FROM person_network"
+                ).fetchall(),
+                dtype=np.int64
+            ).reshape(-1, 3)
+            association_pairs = conn.execute(
+                "SELECT association_a, association_b, shared_persons FROM association_network"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        # IDs -> matrix indexes
+        association_index = {row[0]: i for i, row in enumerate(association_nodes)}
+        person_ids = np.array([row[0] for row in person_nodes], dtype=np.int64)
+
+        def associations(values: Sequence[str]) -> np.ndarray:
+            return np.fromiter(map(association_index.__getitem__, values), dtype=np.int64, count=len(values))
+
+        def persons(values: Sequence[int]) -> np.ndarray:
+            return np.searchsorted(person_ids, np.asarray(values, dtype=np.int64))
+
+        def counts(values: Sequence[int]) -> np.ndarray:
+            return np.asarray(values, dtype=np.int64)
+
+        membership_columns = list(zip(*membership)) or [(), (), ()]
+        association_columns = list(zip(*association_pairs)) or [(), (), ()]
+        matrices = {
+            "membership": (
+                associations(membership_columns[0]),
+                persons(membership_columns[1]),
+                counts(membership_columns[2]),
+            ),
+            "person_network": (
+                persons(person_pairs[:, 0]), persons(person_pairs[:, 1]), person_pairs[:, 2]
+            ),
+            "association_network": (
+                associations(association_columns[0]),
+                associations(association_columns[1]),
+                counts(association_columns[2]),
+            ),
+        }
+        shapes = {
+            "membership": (len(association_nodes), len(person_nodes)),
+            "person_network": (len(person_nodes), len(person_nodes)),
+            "association_network": (len(association_nodes), len(association_nodes)),
+        }
+        comments = {
+            "membership": "rows: associations.csv, columns: persons.csv, values: member rows",
+            "person_network": "rows and columns: persons.csv, values: shared associations",
+            "association_network": "rows and columns: associations.csv, values: shared persons",
+        }
+        paths = [output / "associations.csv", output / "persons.csv"]
+        _write_nodes(paths[0], ["association_id", "name", "city", "state", "year"], association_nodes)
+        _write_nodes(paths[1], ["person_id", "name", "associations"], person_nodes)
+        for name, (rows, cols, data) in matrices.items():
+            symmetric = name != "membership"
+            if "npz" in formats:
+                paths.append(output / f"{name}.npz")
+                _write_npz(paths[-1], rows, cols, data, shapes[name], symmetric)
+            if "mtx" in formats:
+                paths.append(output / f"{name}.mtx")
+                _write_mtx(paths[-1], rows, cols, data, shapes[name], symmetric, comments[name])
+
+        logger.info(
+            f"Exported network of {len(association_nodes)} associations and "
+            f"{len(person_nodes)} persons to {output}"
+        )
+        return paths
@@ -0,0 +1,123 @@
+"""Phonetic codes for surnames."""
+
+import re
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+_VOWELS = set("aeiou")
+
+
+def _letters(name: str) -> str:
+    return re.sub(r"[^a-z]", "", name.lower())
+
+
+def soundex(name: str) -> str:
+    """
+    American Soundex code of a name (e.g. "Robert" -> "R163").
+
+    Returns an empty string for names without letters.
+    """
+    letters = _letters(name)
+    if not letters:
+        return ""
+
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+_NYSIIS_PREFIXES = (
+    ("mac", "mcc"), ("kn", "nn"), ("k", "c"), ("ph", "ff"), ("pf", "ff"), ("sch", "sss"),
+)
+_NYSIIS_SUFFIXES = (
+    ("ee", "y"), ("ie", "y"), ("dt", "d"), ("rt", "d"), ("rd", "d"), ("nt", "d"), ("nd", "d"),
+)
+
+
+def nysiis(name: str, max_length: int = 6) -> str:
+    """
+    NYSIIS code of a name (e.g. "Macintosh" -> "MCANT").
+
+    Follows the original New York State Identification and Intelligence
+    System rules, truncated to ``max_length`` characters (0 for no limit).
+    Returns an empty string for names without letters.
+    """
+    word = _letters(name)
+    if not word:
+        return ""
+
+    for prefix, replacement in _NYSIIS_PREFIXES:
+        if word.startswith(prefix):
+            word = replacement + word[len(prefix):]
+            break
+    for suffix, replacement in _NYSIIS_SUFFIXES:
+        if word.endswith(suffix):
+            word = word[:-len(suffix)] + replacement
+            break
+
+    key = word[0]
+    chars = list(word)
+    i = 1
+    while i < len(chars):
+        char = chars[i]
+        if word[i:i + 2] == "ev":
+            replacement = "af"
+        elif char in _VOWELS:
+            replacement = "a"
+        elif char == "q":
+            replacement = "g"
+        elif char == "z":
+            replacement = "s"
+        elif char == "m":
+            replacement = "n"
+        elif word[i:i + 2] == "kn":
+            replacement = "n"
+        elif char == "k":
+            replacement = "c"
+        elif word[i:i + 3] == "sch":
+            replacement = "sss"
+        elif word[i:i + 2] == "ph":
+            replacement = "ff"
+        elif char == "h" and (
+            chars[i - 1] not in _VOWELS
+            or i + 1 == len(chars)
+            or chars[i + 1] not in _VOWELS
+        ):
+            replacement = chars[i - 1]
+        elif char == "w" and chars[i - 1] in _VOWELS:
+            replacement = chars[i - 1]
+        else:
+            replacement = char
+
+        # Multi-letter replacements overwrite the following letters
+        chars[i:i + len(replacement)] = list(replacement)
+        word = "".join(chars)
+        if chars[i] != key[-1]:
+            key += chars[i]
+        i += 1
+
+    if len(key) > 1 and key.endswith("s"):
+        key = key[:-1]
+    if key.endswith("ay"):
+        key = key[:-2] + "y"
+    if len(key) > 1 and key.endswith("a"):
+        key = key[:-1]
+
+    key = key.upper()
+    return key[:max_length] if max_length else key
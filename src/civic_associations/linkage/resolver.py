@@ -0,0 +1,304 @@
+"""Resolve member rows to persons across directories."""
+
+import sqlite3
+import time
+from array import array
+from collections import deque
+from typing import Any, Dict, List, Set, Tuple
+
+from ..db.schema import create_schema
+from ..utils import setup_logger
+from ..verification.similarity import batch_levenshtein_similarity, levenshtein_distance
+from .blocking import blocking_keys, sort_key, split_name
+
+logger = setup_logger(__name__)
+
+# (member_id, sort key) of both sides of a candidate pair
+CandidatePair = Tuple[int, str, int, str]
+
+
+class UnionFind:
+    """Disjoint sets over integer IDs; the root of a set is its smallest ID."""
+
+    def __init__(self, size: int = 0):
+        self.parent = array("q", range(size))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            # Path halving
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets of a and b; returns False if already merged."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if root_a < root_b:
+            self.parent[root_b] = root_a
+        else:
+            self.parent[root_a] = root_b
+        return True
+
+
+def _given_compatible(given_a: str, given_b: str, threshold: float) -> bool:
+    """
+    Whether two given-name strings can belong to the same person.
+
+    Tokens are compared position by position: they agree when equal, when
+    one is the initial of the other, or when their edit similarity reaches
+    ``threshold``. Extra tokens on one side ("Mary" vs "Mary A.") are fine.
+    """
+    tokens_a, tokens_b = given_a.split(), given_b.split()
+    if not tokens_a or not tokens_b:
+        # A bare surname is too ambiguous to link
+        return False
+    for token_a, token_b in zip(tokens_a, tokens_b):
+        if token_a == token_b:
+            continue
+        if min(len(token_a), len(token_b)) == 1:
+            if token_a[0] != token_b[0]:
+                return False
+            continue
+        longest = max(len(token_a), len(token_b))
+        if 1 - levenshtein_distance(token_a, token_b) / longest < threshold:
+            return False
+    return True
+
+
+class PersonLinker:
+    """
+    Cluster ``members`` rows that name the same person.
+
+    Each member name gets blocking keys (blocking_keys) stored in the
+    ``person_block_keys`` table next to a "surname|given" sort key. The
+    table is read in (block_key, sort_key) order and each row is compared
+    only with the ``window`` rows before it in the same block, so small
+    blocks are compared exhaustively and large ones by sorted neighborhood.
+    Work is linear in the number of rows times the window.
+
+    Matching pairs are merged with union-find; a person's ID is the
+    smallest member_id in its cluster, stored in ``person_clusters``.
+    Two clusters merge only if every given name in one is compatible with
+    every given name in the other, so an initial ("J. Smith") cannot bridge
+    different names ("John Smith", "James Smith").
+    Linking is incremental: only members without a cluster are keyed, and
+    only pairs involving such a member are compared. Existing clusters can
+    still merge when a new member links them.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        window: int = 10,
+        surname_similarity: float = 0.8,
+        given_similarity: float = 0.8,
+        batch_size: int = 100_000
+    ):
+        """
+        Initialize person linker.
+
+        Args:
+            db_path: Path to SQLite database
+            window: Preceding rows in the same block each row is compared with
+            surname_similarity: Lowest surname similarity for a link
+            given_similarity: Lowest similarity of each given-name token (an
+                initial agrees with any name it starts)
+            batch_size: Candidate pairs scored at once
+        """
+        self.db_path = db_path
+        self.window = window
+        self.surname_similarity = surname_similarity
+        self.given_similarity = given_similarity
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_config(cls, db_path: str, linkage_config: Dict[str, Any]) -> "PersonLinker":
+        """Build a linker from the ``linkage`` config block."""
+        return cls(
+            db_path,
+            window=linkage_config.get("window", 10),
+            surname_similarity=linkage_config.get("surname_similarity", 0.8),
+            given_similarity=linkage_config.get("given_similarity", 0.8),
+            batch_size=linkage_config.get("batch_size", 100_000)
+        )
+
+    def link(self) -> Dict[str, Any]:
+        """
+        Link members not yet assigned to a person.
+
+        Returns:
+            Dictionary of counts and timing
+        """
+        start = time.perf_counter()
+        create_schema(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            stats = self._link(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        logger.info(
+            f"Linked {stats['new_members']} new members: {stats['candidate_pairs']} "
+            f"candidate pairs, {stats['links']} links, {stats['updated']} rows updated"
+        )
+        return stats
+
+    def _link(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        stats = {"new_members": 0, "candidate_pairs": 0, "links": 0, "updated": 0}
+
+        max_id = conn.execute("SELECT COALESCE(MAX(member_id), 0) FROM members").fetchone()[0]
+        clusters = UnionFind(max_id + 1)
+        for member_id, person_id in conn.execute(
+            "SELECT member_id, person_id FROM person_clusters"
+        ):
+            clusters.parent[member_id] = person_id
+        previous = array("q", clusters.parent)
+        is_new = bytearray(max_id + 1)
+
+        # Key members not yet linked
+        new_members = conn.execute("""
+            SELECT m.member_id, m.full_name FROM members m
+            LEFT JOIN person_clusters p ON p.member_id = m.member_id
+            WHERE p.member_id IS NULL
+        """)
+        keys: List[Tuple[str, str, int]] = []
+        for member_id, full_name in new_members:
+            is_new[member_id] = 1
+            stats["new_members"] += 1
+            given, surname = split_name(full_name)
+            member_sort_key = sort_key(given, surname)
+            keys.extend((key, member_sort_key, member_id) for key in blocking_keys(given, surname))
+            if len(keys) >= self.batch_size:
+                self._insert_keys(conn, keys)
+                keys = []
+        self._insert_keys(conn, keys)
+
+        if not stats["new_members"]:
+            return stats
+
+        # Sorted-neighborhood pass over each block
+        given_names: Dict[int, Set[str]] = {}
+        pairs: List[CandidatePair] = []
+        current_block = None
+        window: deque = deque(maxlen=self.window)
+        rows = conn.execute("""
+            SELECT block_key, sort_key, member_id FROM person_block_keys
+            ORDER BY block_key, sort_key, member_id
+        """)
+        for block_key, member_sort_key, member_id in rows:
+            if block_key != current_block:
+                current_block = block_key
+                window.clear()
+            for other_id, other_sort_key in window:
+                if is_new[member_id] or is_new[other_id]:
+                    pairs.append((other_id, other_sort_key, member_id, member_sort_key))
+            window.append((member_id, member_sort_key))
+
+            if len(pairs) >= self.batch_size:
+                self._score_pairs(conn, pairs, clusters, given_names, stats)
+                pairs = []
+        self._score_pairs(conn, pairs, clusters, given_names, stats)
+
+        # Store clusters of new members and of members whose person changed
+        updates = []
+        for member_id in range(1, max_id + 1):
+            person_id = clusters.find(member_id)
+            if is_new[member_id] or person_id != previous[member_id]:
+                updates.append((member_id, person_id))
+                if len(updates) >= self.batch_size:
+                    self._write_clusters(conn, updates, stats)
+                    updates = []
+        self._write_clusters(conn, updates, stats)
+        return stats
+
+    def _insert_keys(self, conn: sqlite3.Connection, keys: List[Tuple[str, str, int]]) -> None:
+        if keys:
+            conn.executemany(
+                "INSERT INTO person_block_keys (block_key, sort_key, member_id) VALUES (?, ?, ?)",
+                keys
+            )
+
+    def _write_clusters(
+        self,
+        conn: sqlite3.Connection,
+        updates: List[Tuple[int, int]],
+        stats: Dict[str, Any]
+    ) -> None:
+        if updates:
+            conn.executemany(
+                "INSERT OR REPLACE INTO person_clusters (member_id, person_id) VALUES (?, ?)",
+                updates
+            )
+            stats["updated"] += len(updates)
+
+    def _cluster_given_names(
+        self,
+        conn: sqlite3.Connection,
+        root: int,
+        given_names: Dict[int, Set[str]]
+    ) -> Set[str]:
+        """Distinct given names in the cluster rooted at ``root``, loaded on first use."""
+        names = given_names.get(root)
+        if names is None:
+            # Clusters stored by earlier runs are flat: every member points at the root
+            names = given_names[root] = {
+                key.split("|", 1)[1] for (key,) in conn.execute("""
+                    SELECT DISTINCT sort_key FROM person_block_keys
+                    WHERE member_id = ?
+                       OR member_id IN (SELECT member_id FROM person_clusters WHERE person_id = ?)
+                """, (root, root))
+            }
+        return names
+
+    def _score_pairs(
+        self,
+        conn: sqlite3.Connection,
+        pairs: List[CandidatePair],
+        clusters: UnionFind,
+        given_names: Dict[int, Set[str]],
+        stats: Dict[str, Any]
+    ) -> None:
+        """Score candidate pairs in one batch and merge the matches."""
+        # The same pair turns up under several keys; skip settled pairs
+        pairs = [
+            pair for pair in dict.fromkeys(pairs)
+            if clusters.find(pair[0]) != clusters.find(pair[2])
+        ]
+        if not pairs:
+            return
+        stats["candidate_pairs"] += len(pairs)
+
+        names_a = [pair[1].split("|", 1) for pair in pairs]
+        names_b = [pair[3].split("|", 1) for pair in pairs]
+        surname_scores = batch_levenshtein_similarity(
+            [surname for surname, _ in names_a], [surname for surname, _ in names_b]
+        )
+
+        for i, (id_a, _, id_b, _) in enumerate(pairs):
+            if surname_scores[i] < self.surname_similarity:
+                continue
+            if not _given_compatible(names_a[i][1], names_b[i][1], self.given_similarity):
+                continue
+
+            root_a, root_b = clusters.find(id_a), clusters.find(id_b)
+            if root_a == root_b:
+                continue
+            given_a = self._cluster_given_names(conn, root_a, given_names)
+            given_b = self._cluster_given_names(conn, root_b, given_names)
+            if not all(
+                _given_compatible(a, b, self.given_similarity) for a in given_a for b in given_b
+            ):
+                continue
+
+            clusters.union(root_a, root_b)
+            given_names[min(root_a, root_b)] = given_a | given_b
+            given_names.pop(max(root_a, root_b))
+            stats["links"] += 1
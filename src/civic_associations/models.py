@@ -66,6 +66,8 @@ class Section(BaseModel):
     end_page_number: int
     section_type: str
     raw_text: str
+    # Normalized [x0, y0, x1, y1] box of the section on each page (0-1 coordinates)
+    page_regions: Dict[str, List[float]] = Field(default_factory=dict)
 
 
 class ExtractionInput(BaseModel):
@@ -83,3 +85,30 @@ class VerificationResult(BaseModel):
     similarity_score: float
     status: str  # "accepted", "needs_review", "rejected"
     notes: Optional[str] = None
+
+
+class MemberMatch(BaseModel):
+    """Member found by a database query, with its association."""
+    member_id: int
+    association_id: str
+    full_name: str
+    role: Optional[str] = None
+    given_names: Optional[str] = None
+    surname: Optional[str] = None
+    person_id: Optional[int] = None  # from person linkage, if run
+    association_name: str
+    city: Optional[str] = None
+    state: Optional[str] = None
+    year: Optional[int] = None
+
+
+class AssociationMatch(BaseModel):
+    """Association found by a full-text search."""
+    association_id: str
+    name: str
+    association_type: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    year: Optional[int] = None
+    snippet: Optional[str] = None  # matching text with hits in [brackets]
+    score: Optional[float] = None  # bm25 rank; lower is better
@@ -1,13 +1,45 @@
 """Docling OCR client wrapper."""
 
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from ..models import Page, PageOCR
 from ..utils import setup_logger
 
 logger = setup_logger(__name__)
 
 
+def layout_blocks(document: Any) -> List[Dict[str, Any]]:
+    """
+    Text blocks of a Docling document with normalized boxes.
+
+    Args:
+        document: DoclingDocument from a conversion result
+
+    Returns:
+        Blocks in reading order as ``{"text", "label", "page_no", "bbox"}``
+        dictionaries, with ``bbox`` as [x0, y0, x1, y1] in 0-1 page
+        coordinates from the top left
+    """
+    blocks = []
+    for item, _ in document.iterate_items():
+        for prov in getattr(item, "prov", None) or []:
+            page = document.pages.get(prov.page_no)
+            if page is None or not page.size.width or not page.size.height:
+                continue
+            width, height = page.size.width, page.size.height
+            box = prov.bbox.to_top_left_origin(page_height=height)
+            blocks.append({
+                "text": getattr(item, "text", ""),
+                "label": getattr(item.label, "value", str(item.label)),
+                "page_no": prov.page_no,
+                "bbox": [
+                    round(min(max(value, 0.0), 1.0), 4)
+                    for value in (box.l / width, box.t / height, box.r / width, box.b / height)
+                ],
+            })
+    return blocks
+
+
 class DoclingClient:
     """Wrapper for Docling OCR engine with RapidOCR backend."""
     
@@ -90,7 +122,7 @@ class DoclingClient:
                     text_md=text_md,
                     text_plain=text_plain,
                     ocr_confidence=0.95,  # Docling doesn't provide confidence scores
-                    blocks=[]
+                    blocks=layout_blocks(result_doc.document)
                 )
                 
                 logger.info(f"Successfully processed {page.page_id} with Docling")
@@ -1,11 +1,36 @@
 """Section finder for identifying civic association sections."""
 
-from typing import List
+from typing import Any, Dict, List, Optional
 from ..models import PageOCR, Section
 from ..utils import setup_logger, make_section_id
 
 logger = setup_logger(__name__)
 
+# Layout labels of running page furniture, never part of a section
+FURNITURE_LABELS = {"page_header", "page_footer"}
+
+
+def page_region(blocks: List[Dict[str, Any]]) -> Optional[List[float]]:
+    """
+    Bounding region of a section's OCR blocks on one page.
+
+    Args:
+        blocks: Blocks that belong to the section; blocks may carry a
+            normalized ``bbox`` ([x0, y0, x1, y1] in 0-1 page coordinates)
+
+    Returns:
+        Union of the block boxes, or None if no block has one
+    """
+    boxes = [b["bbox"] for b in blocks if len(b.get("bbox") or []) == 4]
+    if not boxes:
+        return None
+    return [
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    ]
+
 
 class SectionFinder:
     """Find sections containing civic associations in OCR text."""
@@ -28,6 +53,29 @@ class SectionFinder:
             "benevolent",
         ]
         logger.info(f"Initialized SectionFinder with {len(self.keywords)} keywords")
+
+    def section_blocks(self, ocr: PageOCR, first_page: bool = False) -> List[Dict[str, Any]]:
+        """
+        OCR blocks of a page that belong to a section.
+
+        Running headers and footers are dropped. On the section's first
+        page the section starts at the first block mentioning a keyword
+        (e.g. a "Societies" heading); without one the whole page is used.
+
+        Args:
+            ocr: PageOCR of the page
+            first_page: Whether the section starts on this page
+
+        Returns:
+            Blocks in page order
+        """
+        blocks = [b for b in ocr.blocks if b.get("label") not in FURNITURE_LABELS]
+        if first_page:
+            for i, block in enumerate(blocks):
+                text = (block.get("text") or "").lower()
+                if any(keyword in text for keyword in self.keywords):
+                    return blocks[i:]
+        return blocks
     
     def find_sections(
         self,
@@ -70,7 +118,12 @@ class SectionFinder:
                 start_page_number=1,
                 end_page_number=len(ocr_results),
                 section_type="associations",
-                raw_text="\n\n".join([r.text_plain for r in ocr_results])
+                raw_text="\n\n".join([r.text_plain for r in ocr_results]),
+                page_regions={
+                    r.page_id: region for i, r in enumerate(ocr_results)
+                    if (region := page_region(self.section_blocks(r, first_page=i == 0)))
+                    is not None
+                }
             )
             sections.append(section)
         
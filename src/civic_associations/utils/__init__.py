@@ -1,13 +1,20 @@
 """Utility modules for the civic associations pipeline."""
 
-from .hashing import make_association_id, make_section_id
+from .hashing import make_association_id, make_content_hash, make_section_id
 from .logging import setup_logger
-from .io import read_jsonl, write_jsonl
+from .io import append_jsonl, iter_jsonl, read_jsonl, write_jsonl
+from .names import normalize_role, parse_name, parse_names
 
 __all__ = [
     "make_association_id",
+    "make_content_hash",
     "make_section_id",
     "setup_logger",
+    "append_jsonl",
+    "iter_jsonl",
     "read_jsonl",
     "write_jsonl",
+    "normalize_role",
+    "parse_name",
+    "parse_names",
 ]
@@ -1,7 +1,8 @@
 """Hashing utilities for generating stable IDs."""
 
 import hashlib
-from typing import List
+import json
+from typing import Any, Dict, List
 
 
 def make_association_id(
@@ -48,3 +49,17 @@ def make_section_id(page_ids: List[str], start_offset: int = 0) -> str:
     sorted_pages = '-'.join(sorted(page_ids))
     key = f"{sorted_pages}|{start_offset}"
     return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def make_content_hash(data: Dict[str, Any]) -> str:
+    """
+    Generate a hash of a record's content for change detection.
+    
+    Args:
+        data: JSON-serializable record dictionary (key order does not matter)
+        
+    Returns:
+        SHA-256 hash as hex string
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
@@ -1,6 +1,7 @@
 """I/O utilities for reading and writing data files."""
 
 import json
+import os
 from pathlib import Path
 from typing import List, Dict, Any, Iterator
 
@@ -46,6 +47,26 @@ def write_jsonl(data: List[Dict[str, Any]], file_path: str) -> None:
             f.write(json.dumps(item) + '\n')
 
 
+def append_jsonl(data: List[Dict[str, Any]], file_path: str, sync: bool = True) -> None:
+    """
+    Append a list of dictionaries to a JSONL file.
+    
+    Args:
+        data: List of dictionaries to append
+        file_path: Path to JSONL file (created if missing)
+        sync: Flush and fsync so the lines survive a crash
+    """
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(path, 'a', encoding='utf-8') as f:
+        for item in data:
+            f.write(json.dumps(item) + '\n')
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
 def iter_jsonl(file_path: str) -> Iterator[Dict[str, Any]]:
     """
     Iterate over a JSONL file without loading all into memory.
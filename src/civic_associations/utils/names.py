@@ -0,0 +1,298 @@
+"""Parsing and normalization of member names and titles as printed in directories."""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+# Titles printed before a name -> canonical form
+HONORIFICS = {
+    "mr": "Mr.",
+    "mrs": "Mrs.",
+    "miss": "Miss",
+    "ms": "Ms.",
+    "dr": "Dr.",
+    "rev": "Rev.",
+    "revd": "Rev.",
+    "hon": "Hon.",
+    "capt": "Capt.",
+    "col": "Col.",
+    "gen": "Gen.",
+    "maj": "Maj.",
+    "lieut": "Lieut.",
+    "lt": "Lieut.",
+    "prof": "Prof.",
+    "gov": "Gov.",
+    "judge": "Judge",
+    "elder": "Elder",
+    "deacon": "Deacon",
+    "dea": "Deacon",
+}
+
+# Generational suffixes and post-nominals -> canonical form
+SUFFIXES = {
+    "jr": "Jr.",
+    "jun": "Jr.",
+    "junr": "Jr.",
+    "sr": "Sr.",
+    "sen": "Sr.",
+    "senr": "Sr.",
+    "2d": "2d",
+    "3d": "3d",
+    "ii": "II",
+    "iii": "III",
+    "iv": "IV",
+    "esq": "Esq.",
+    "md": "M.D.",
+}
+
+# Abbreviated given names common in 19th-century directories
+GIVEN_NAME_ABBREVIATIONS = {
+    "abm": "Abraham",
+    "alex": "Alexander",
+    "alexr": "Alexander",
+    "benj": "Benjamin",
+    "benjn": "Benjamin",
+    "chas": "Charles",
+    "chs": "Charles",
+    "danl": "Daniel",
+    "ebenr": "Ebenezer",
+    "edw": "Edward",
+    "edwd": "Edward",
+    "eliz": "Elizabeth",
+    "fredk": "Frederick",
+    "geo": "George",
+    "hy": "Henry",
+    "jas": "James",
+    "jno": "John",
+    "jona": "Jonathan",
+    "jos": "Joseph",
+    "margt": "Margaret",
+    "nathl": "Nathaniel",
+    "richd": "Richard",
+    "robt": "Robert",
+    "saml": "Samuel",
+    "thos": "Thomas",
+    "wm": "William",
+    "wmn": "William",
+    "zach": "Zachariah",
+}
+
+# Lowercase words that belong to the surname that follows
+SURNAME_PARTICLES = {"de", "del", "der", "di", "du", "la", "le", "st", "van", "von", "ten"}
+
+# Officer titles as printed in directories -> canonical role
+ROLE_ALIASES = {
+    "pres": "President",
+    "president": "President",
+    "v pres": "Vice President",
+    "v p": "Vice President",
+    "vice pres": "Vice President",
+    "vice president": "Vice President",
+    "sec": "Secretary",
+    "secy": "Secretary",
+    "sec'y": "Secretary",
+    "secretary": "Secretary",
+    "rec sec": "Recording Secretary",
+    "rec sec'y": "Recording Secretary",
+    "recording secretary": "Recording Secretary",
+    "cor sec": "Corresponding Secretary",
+    "cor sec'y": "Corresponding Secretary",
+    "corresponding secretary": "Corresponding Secretary",
+    "treas": "Treasurer",
+    "treas'r": "Treasurer",
+    "treasurer": "Treasurer",
+    "lib": "Librarian",
+    "librarian": "Librarian",
+    "chairman": "Chairman",
+    "director": "Director",
+    "trustee": "Trustee",
+    "marshal": "Marshal",
+    "chaplain": "Chaplain",
+    "collector": "Collector",
+    "steward": "Steward",
+    "foreman": "Foreman",
+    "w m": "Worshipful Master",
+    "s w": "Senior Warden",
+    "senior warden": "Senior Warden",
+    "j w": "Junior Warden",
+    "junior warden": "Junior Warden",
+    "worshipful master": "Worshipful Master",
+    "n g": "Noble Grand",
+    "noble grand": "Noble Grand",
+    "v g": "Vice Grand",
+    "vice grand": "Vice Grand",
+}
+
+MEMBER_NAME_COLUMNS = (
+    "honorific", "given_names", "initials", "surname", "name_suffix", "normalized_name"
+)
+
+# A run of dotted initials ("M.D.", "J.W.") or a word; letters are any Unicode letters
+_TOKEN = re.compile(r"(?:[^\W\d_]\.){2,}|[^\W_](?:[^\W_]|['’\-])*\.?")
+_INITIAL = re.compile(r"[^\W\d_]\.")
+_INITIALS = re.compile(r"(?:[^\W\d_]\.)+")
+
+# Letters that Unicode decomposition does not reduce to ASCII
+_ASCII_FOLD = str.maketrans({
+    "ø": "o", "æ": "ae", "œ": "oe", "ł": "l", "đ": "d", "ð": "d", "þ": "th", "ı": "i",
+})
+
+
+class ParsedName(NamedTuple):
+    """Parts of a member name."""
+    honorific: Optional[str]
+    given_names: Optional[str]
+    initials: Optional[str]
+    surname: Optional[str]
+    name_suffix: Optional[str]
+    normalized_name: str
+
+
+def fold_ascii(text: str) -> str:
+    """Lowercase ASCII form of a name for matching ("Müller" -> "muller", "Straße" -> "strasse")."""
+    text = unicodedata.normalize("NFKD", text.casefold().translate(_ASCII_FOLD))
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def _key(token: str) -> str:
+    """Lookup key of a token: lowercase, without dots and apostrophes ("M.D." -> "md")."""
+    return re.sub(r"[.'’]", "", token.lower())
+
+
+def _tokens(text: str) -> List[str]:
+    """Tokens of a name, with separate dotted initials ("M. D.") joined into one run."""
+    tokens: List[str] = []
+    for token in _TOKEN.findall(text):
+        if tokens and _INITIAL.fullmatch(token) and _INITIALS.fullmatch(tokens[-1]):
+            tokens[-1] += token
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def _title(token: str) -> str:
+    """Capitalize an all-lowercase or all-uppercase token, keep mixed case (McNeil)."""
+    word = token.rstrip(".")
+    if word.islower() or word.isupper():
+        word = "-".join(part.capitalize() for part in word.split("-"))
+    return word
+
+
+@lru_cache(maxsize=1 << 18)
+def parse_name(full_name: Optional[str]) -> ParsedName:
+    """
+    Split a member name into honorific, given names, surname and suffix.
+
+    Handles "Given Surname" and "Surname, Given" order, runs of initials
+    ("J.W."), surname particles ("Van Buren"), abbreviated given names
+    ("Jno." -> "John") and trailing suffixes ("jr."). Results are memoized,
+    since the same names recur across runs and directories.
+
+    Args:
+        full_name: Name as extracted, e.g. "Jno. W. Smith, jr."
+
+    Returns:
+        ParsedName; ``initials`` are the first letters of the given names,
+        ``normalized_name`` is "given names surname" in lowercase without
+        punctuation (empty if nothing could be parsed)
+    """
+    text = (full_name or "").strip()
+
+    # "Surname, Given" unless the part after the comma is only a suffix
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    suffixes: List[str] = []
+    while len(parts) > 1 and all(_key(t) in SUFFIXES for t in _tokens(parts[-1])):
+        suffixes = [SUFFIXES[_key(t)] for t in _tokens(parts.pop())] + suffixes
+    if len(parts) > 1:
+        text = " ".join(parts[1:] + parts[:1])
+    else:
+        text = parts[0] if parts else ""
+
+    tokens = _tokens(text)
+
+    honorifics = []
+    while tokens and _key(tokens[0]) in HONORIFICS and len(tokens) > 1:
+        honorifics.append(HONORIFICS[_key(tokens.pop(0))])
+    while len(tokens) > 1 and _key(tokens[-1]) in SUFFIXES:
+        suffixes.insert(0, SUFFIXES[_key(tokens.pop())])
+
+    # Runs of initials that are not suffixes ("J.W.") become separate initials
+    tokens = [
+        part for token in tokens
+        for part in (_INITIAL.findall(token) if _INITIALS.fullmatch(token) else [token])
+    ]
+
+    if not tokens:
+        return ParsedName(
+            " ".join(honorifics) or None, None, None, None, " ".join(suffixes) or None, ""
+        )
+
+    # Surname is the last word plus any particles right before it
+    start = len(tokens) - 1
+    while start > 1 and _key(tokens[start - 1]) in SURNAME_PARTICLES:
+        start -= 1
+    surname_tokens, given_tokens = tokens[start:], tokens[:start]
+
+    given = []
+    for token in given_tokens:
+        word = token.rstrip(".")
+        if len(word) == 1:
+            given.append(word.upper() + ".")
+        else:
+            given.append(GIVEN_NAME_ABBREVIATIONS.get(_key(token), _title(token)))
+    surname = " ".join(surname_tokens[:-1] + [_title(surname_tokens[-1])])
+
+    given_names = " ".join(given) or None
+    normalized = " ".join(
+        re.sub(r"[^a-z ]+", "", fold_ascii(f"{given_names or ''} {surname}").replace("-", " ")).split()
+    )
+    return ParsedName(
+        honorific=" ".join(honorifics) or None,
+        given_names=given_names,
+        initials="".join(g[0] for g in given) or None,
+        surname=surname,
+        name_suffix=" ".join(suffixes) or None,
+        normalized_name=normalized,
+    )
+
+
+def parse_names(full_names: Sequence[Optional[str]]) -> Dict[str, List[Optional[str]]]:
+    """
+    Parse a batch of names into columns.
+
+    Each distinct string is parsed once; repeated names (most of a
+    directory's officers recur year after year) are looked up.
+
+    Args:
+        full_names: Names as extracted
+
+    Returns:
+        Column name (MEMBER_NAME_COLUMNS) -> list of values, in input order
+    """
+    parsed = {name: parse_name(name) for name in dict.fromkeys(full_names)}
+    rows = [parsed[name] for name in full_names]
+    return {
+        column: [row[i] for row in rows]
+        for i, column in enumerate(MEMBER_NAME_COLUMNS)
+    }
+
+
+def _role_key(text: str) -> str:
+    """Normalize a printed title for lookup ('V. Pres.' -> 'v pres')."""
+    return re.sub(r"[.\s]+", " ", text.lower()).strip()
+
+
+def normalize_role(role: Optional[str]) -> Optional[str]:
+    """
+    Map a printed officer title to its canonical form.
+
+    Args:
+        role: Title as printed, e.g. "Sec'y" or "V. Pres."
+
+    Returns:
+        Canonical role, or the stripped input if it is not a known title
+    """
+    if role is None:
+        return None
+    return ROLE_ALIASES.get(_role_key(role), role.strip(" .,:;"))
@@ -1,9 +1,28 @@
 """Verification module for checking extraction quality."""
 
-from .similarity import compute_similarity
-from .rules import verify_record
+from .aggregation import aggregate_records, align_members
+from .grouping import iter_groups_external, iter_groups_in_memory
+from .sharding import ShardedVerifier, shard_for, verify_group
+from .similarity import (
+    SimilarityEngine,
+    compute_similarity,
+    levenshtein_distance,
+    mean_pairwise_similarity,
+)
+from .rules import RuleEngine, verify_record
 
 __all__ = [
+    "RuleEngine",
+    "ShardedVerifier",
+    "SimilarityEngine",
+    "aggregate_records",
+    "align_members",
+    "iter_groups_external",
+    "iter_groups_in_memory",
     "compute_similarity",
+    "levenshtein_distance",
+    "mean_pairwise_similarity",
+    "shard_for",
+    "verify_group",
     "verify_record",
 ]
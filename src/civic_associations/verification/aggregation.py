@@ -0,0 +1,183 @@
+"""Consensus records from repeated extraction runs."""
+
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..models import AssociationRecord, Member
+from .similarity import batch_levenshtein_similarity
+
+
+def _normalize_name(name: Optional[str]) -> str:
+    return re.sub(r"[^a-z ]+", "", re.sub(r"\s+", " ", (name or "").lower())).strip()
+
+
+def blocking_keys(name: str) -> Set[str]:
+    """
+    Keys under which a normalized person name is compared.
+
+    Names are only compared with names sharing a key: the first or last
+    three letters of the surname, so an OCR error at one end of the
+    surname still leaves a shared key.
+    """
+    tokens = name.split()
+    if not tokens:
+        return {""}
+    surname = tokens[-1]
+    return {f"<{surname[:3]}", f">{surname[-3:]}"}
+
+
+def _vote(values: List[Any]) -> Tuple[Any, float]:
+    """Most common value (earliest on ties) and its share of the votes."""
+    if not values:
+        return None, 0.0
+    counts = Counter(values)
+    best = max(counts.values())
+    winner = next(v for v in values if counts[v] == best)
+    return winner, best / len(values)
+
+
+class _MemberCluster:
+    """One person as seen across runs."""
+
+    def __init__(self, key_name: str, member: Member, run: int, position: float):
+        self.key_name = key_name
+        self.members: List[Member] = [member]
+        self.runs = {run}
+        self.positions = [position]
+
+
+def align_members(
+    runs: List[List[Member]],
+    min_similarity: float = 0.85
+) -> List[_MemberCluster]:
+    """
+    Align members of repeated runs into clusters of the same person.
+
+    Runs are added one at a time. Each member is compared with existing
+    clusters that share a blocking key, the candidate pairs of a run are
+    scored in one batch, and pairs are assigned greedily from the most
+    similar, one member per cluster per run. Unassigned members start new
+    clusters. Work grows with block sizes rather than members squared.
+
+    Args:
+        runs: Member lists, one per run
+        min_similarity: Lowest name similarity at which members are aligned
+
+    Returns:
+        List of member clusters
+    """
+    clusters: List[_MemberCluster] = []
+    blocks: Dict[str, List[int]] = defaultdict(list)
+
+    for run, members in enumerate(runs):
+        names = [_normalize_name(m.full_name) for m in members]
+
+        candidates = sorted({
+            (i, c)
+            for i, name in enumerate(names)
+            for key in blocking_keys(name)
+            for c in blocks.get(key, [])
+        })
+        scores = batch_levenshtein_similarity(
+            [names[i] for i, _ in candidates],
+            [clusters[c].key_name for _, c in candidates]
+        )
+
+        assigned: Dict[int, int] = {}
+        taken: Set[int] = set()
+        ranked = sorted(zip(scores, candidates), key=lambda x: (-x[0], x[1]))
+        for score, (i, c) in ranked:
+            if score < min_similarity:
+                break
+            if i in assigned or c in taken:
+                continue
+            assigned[i] = c
+            taken.add(c)
+
+        for i, member in enumerate(members):
+            position = i / max(len(members), 1)
+            if i in assigned:
+                cluster = clusters[assigned[i]]
+                cluster.members.append(member)
+                cluster.runs.add(run)
+                cluster.positions.append(position)
+                continue
+
+            clusters.append(_MemberCluster(names[i], member, run, position))
+            for key in blocking_keys(names[i]):
+                blocks[key].append(len(clusters) - 1)
+
+    return clusters
+
+
+def aggregate_records(
+    records: List[AssociationRecord],
+    min_similarity: float = 0.85,
+    min_member_support: float = 0.5
+) -> AssociationRecord:
+    """
+    Aggregate multiple extraction runs into a single record.
+
+    The name and type are majority votes over runs. Members are aligned
+    across runs (align_members); a member is kept when it appears in at
+    least ``min_member_support`` of the runs, with its most common spelling
+    and role. Agreement scores per field are stored in
+    ``metadata["aggregation"]``.
+
+    Args:
+        records: List of records from different runs
+        min_similarity: Lowest name similarity at which members are aligned
+        min_member_support: Share of runs a member must appear in
+
+    Returns:
+        Aggregated AssociationRecord
+    """
+    if not records:
+        raise ValueError("No records to aggregate")
+
+    num_runs = len(records)
+
+    # Vote on the normalized name, then use its most common spelling
+    normalized = [_normalize_name(r.name) for r in records]
+    winner, name_agreement = _vote(normalized)
+    name, _ = _vote([r.name for r, n in zip(records, normalized) if n == winner])
+    base = records[normalized.index(winner)]
+
+    association_type, type_agreement = _vote([
+        (r.association_type or "").strip().lower() or None for r in records
+    ])
+
+    clusters = align_members([r.members for r in records], min_similarity)
+    kept = [c for c in clusters if len(c.runs) / num_runs >= min_member_support]
+    kept.sort(key=lambda c: sum(c.positions) / len(c.positions))
+
+    members = []
+    member_agreement = []
+    for cluster in kept:
+        full_name, _ = _vote([m.full_name for m in cluster.members])
+        role, _ = _vote([m.role for m in cluster.members if m.role])
+        notes, _ = _vote([m.notes for m in cluster.members if m.notes])
+        members.append(Member(full_name=full_name, role=role, notes=notes))
+        member_agreement.append(round(len(cluster.runs) / num_runs, 4))
+
+    metadata = dict(base.metadata)
+    metadata["aggregation"] = {
+        "num_runs": num_runs,
+        "agreement": {
+            "name": round(name_agreement, 4),
+            "association_type": round(type_agreement, 4),
+            "members": round(sum(member_agreement) / len(member_agreement), 4)
+            if member_agreement else 1.0,
+        },
+        "member_agreement": member_agreement,
+        "members_dropped": len(clusters) - len(kept),
+        "run_ids": [r.extraction_run_id for r in records],
+    }
+
+    return base.model_copy(update={
+        "name": name,
+        "association_type": association_type,
+        "members": members,
+        "metadata": metadata,
+    })
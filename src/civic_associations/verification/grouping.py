@@ -0,0 +1,114 @@
+"""Grouping extraction records by association across run files."""
+
+import heapq
+import json
+import tempfile
+from collections import defaultdict
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..utils import iter_jsonl, setup_logger
+
+logger = setup_logger(__name__)
+
+RecordGroup = Tuple[str, List[Dict[str, Any]]]
+
+
+def iter_groups_in_memory(run_files: Sequence[str]) -> Iterator[RecordGroup]:
+    """
+    Group records by association_id, holding every record in memory.
+
+    Args:
+        run_files: Extraction run JSONL files, in run order
+
+    Yields:
+        (association_id, record dictionaries) in first-seen order
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for run_file in run_files:
+        for record in iter_jsonl(str(run_file)):
+            groups[record["association_id"]].append(record)
+    yield from groups.items()
+
+
+def _association_id(record: Dict[str, Any]) -> str:
+    return record["association_id"]
+
+
+def _write_spill(records, path: Path) -> Path:
+    """Write records (already in association_id order) to a spill file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+    return path
+
+
+def _merge_spills(spills: List[Path]):
+    """Lazily merge sorted spill files (stable: earlier files win ties)."""
+    streams = [iter_jsonl(str(path)) for path in spills]
+    return heapq.merge(*streams, key=_association_id)
+
+
+def iter_groups_external(
+    run_files: Sequence[str],
+    chunk_size: int = 100_000,
+    spill_dir: Optional[str] = None,
+    max_open_files: int = 256
+) -> Iterator[RecordGroup]:
+    """
+    Group records by association_id with an external merge sort.
+
+    Records are read in chunks of ``chunk_size``, each chunk is sorted by
+    association_id and spilled to disk, and the sorted spill files are
+    merged lazily. Memory holds one chunk while spilling and then one
+    record per spill file plus the current group. Within a group, records
+    keep their input order (the sort and merge are stable).
+
+    Args:
+        run_files: Extraction run JSONL files, in run order
+        chunk_size: Records sorted in memory per spill file
+        spill_dir: Directory for spill files (default: a temporary directory)
+        max_open_files: Spill files merged at once; more are merged in passes
+
+    Yields:
+        (association_id, record dictionaries) in association_id order
+    """
+    with tempfile.TemporaryDirectory(prefix="verify_spill_", dir=spill_dir) as tmp:
+        tmp_dir = Path(tmp)
+        spills: List[Path] = []
+        num_files = 0
+        chunk: List[Dict[str, Any]] = []
+
+        def spill(records) -> Path:
+            nonlocal num_files
+            num_files += 1
+            return _write_spill(records, tmp_dir / f"spill_{num_files:06d}.jsonl")
+
+        for run_file in run_files:
+            for record in iter_jsonl(str(run_file)):
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    chunk.sort(key=_association_id)
+                    spills.append(spill(chunk))
+                    chunk = []
+        if chunk:
+            chunk.sort(key=_association_id)
+            spills.append(spill(chunk))
+            chunk = []
+
+        logger.info(f"Sorted records into {len(spills)} spill files")
+
+        # Merge consecutive runs of files in passes to bound open file handles
+        while len(spills) > max_open_files:
+            merged_spills = []
+            for i in range(0, len(spills), max_open_files):
+                batch = spills[i:i + max_open_files]
+                merged_spills.append(spill(_merge_spills(batch)))
+                for path in batch:
+                    path.unlink()
+            spills = merged_spills
+
+        merged = _merge_spills(spills)
+        for association_id, records in groupby(merged, key=_association_id):
+            yield association_id, list(records)
@@ -1,8 +1,305 @@
 """Verification rules for checking record quality."""
 
-from typing import Tuple
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
 from ..models import AssociationRecord, VerificationResult
 
+# Rules every record is held to; ``field_rules`` from config are merged over these
+DEFAULT_FIELD_RULES: Dict[str, Dict[str, Any]] = {
+    "name": {"required": True, "min_length": 3},
+    "city": {"required": True},
+    "state": {"required": True},
+    "year": {"required": True},
+    "source_pages": {"required": True},
+}
+
+# Keys of a field rule that are not checks
+_NON_CHECK_KEYS = {"similarity_weight"}
+
+RecordLike = Union[AssociationRecord, Dict[str, Any]]
+
+
+def _field(record: RecordLike, field: str) -> Any:
+    if isinstance(record, dict):
+        return record.get(field)
+    return getattr(record, field, None)
+
+
+class _FieldColumn:
+    """One field of a record batch, with derived arrays computed on first use."""
+
+    def __init__(self, values: List[Any]):
+        self.values = values
+        self._present = None
+        self._lengths = None
+        self._numbers = None
+
+    @property
+    def present(self) -> np.ndarray:
+        if self._present is None:
+            self._present = np.fromiter(
+                (
+                    v is not None and (not isinstance(v, (str, list)) or bool(
+                        v.strip() if isinstance(v, str) else v
+                    ))
+                    for v in self.values
+                ),
+                dtype=bool,
+                count=len(self.values)
+            )
+        return self._present
+
+    @property
+    def lengths(self) -> np.ndarray:
+        if self._lengths is None:
+            self._lengths = np.fromiter(
+                (len(v) if isinstance(v, (str, list)) else 0 for v in self.values),
+                dtype=np.int64,
+                count=len(self.values)
+            )
+        return self._lengths
+
+    @property
+    def numbers(self) -> np.ndarray:
+        if self._numbers is None:
+            self._numbers = np.fromiter(
+                (
+                    float(v) if isinstance(v, (int, float)) and not isinstance(v, bool)
+                    else np.nan
+                    for v in self.values
+                ),
+                dtype=float,
+                count=len(self.values)
+            )
+        return self._numbers
+
+
+class Rule:
+    """A compiled check on one field, evaluated over a whole batch."""
+
+    def __init__(
+        self,
+        name: str,
+        field: str,
+        check: Callable[[_FieldColumn], np.ndarray],
+        message: str,
+        param: Any = None
+    ):
+        """
+        Initialize rule.
+
+        Args:
+            name: Rule name, "<field>.<check>"
+            field: Record field the rule reads
+            check: Function from a field column to a boolean failure mask
+            message: Reason template; may use {field}, {value} and {param}
+            param: Configured value of the check (e.g. the minimum length)
+        """
+        self.name = name
+        self.field = field
+        self.check = check
+        self.message = message
+        self.param = param
+
+
+def _compile_field_rules(field: str, rules: Dict[str, Any]) -> List[Rule]:
+    """Compile the checks configured for one field."""
+    compiled = []
+
+    def add(check_name, check, message):
+        compiled.append(Rule(f"{field}.{check_name}", field, check, message, rules[check_name]))
+
+    for key, param in rules.items():
+        if key in _NON_CHECK_KEYS or param is None:
+            continue
+        if key == "required":
+            if param:
+                add("required", lambda c: ~c.present, "Missing required fields: {field}")
+        elif key == "min_length":
+            add(
+                "min_length",
+                lambda c, n=param: c.lengths < n,
+                "{field} too short (minimum {param}): {value!r}"
+            )
+        elif key == "max_length":
+            add(
+                "max_length",
+                lambda c, n=param: c.lengths > n,
+                "{field} too long (maximum {param})"
+            )
+        elif key == "min":
+            # Missing values are left to the required check
+            add(
+                "min",
+                lambda c, n=param: c.numbers < n,
+                "{field} below {param}: {value!r}"
+            )
+        elif key == "max":
+            add(
+                "max",
+                lambda c, n=param: c.numbers > n,
+                "{field} above {param}: {value!r}"
+            )
+        elif key == "pattern":
+            regex = re.compile(param)
+            add(
+                "pattern",
+                lambda c, r=regex: c.present & np.fromiter(
+                    (not (isinstance(v, str) and r.search(v)) for v in c.values),
+                    dtype=bool,
+                    count=len(c.values)
+                ),
+                "{field} does not match {param}: {value!r}"
+            )
+        elif key == "allowed":
+            allowed = {str(v).strip().lower() for v in param}
+            add(
+                "allowed",
+                lambda c, a=allowed: c.present & np.fromiter(
+                    (str(v).strip().lower() not in a for v in c.values),
+                    dtype=bool,
+                    count=len(c.values)
+                ),
+                "{field} not an allowed value: {value!r}"
+            )
+        else:
+            raise ValueError(f"Unknown rule '{key}' for field '{field}'")
+
+    return compiled
+
+
+class RuleResults:
+    """Per-rule failure masks for a batch of records."""
+
+    def __init__(
+        self,
+        rules: List[Rule],
+        masks: Dict[str, np.ndarray],
+        columns: Dict[str, _FieldColumn]
+    ):
+        self.rules = rules
+        self.masks = masks
+        self._columns = columns
+        size = len(next(iter(columns.values())).values) if columns else 0
+        self.failed = np.zeros(size, dtype=bool)
+        for mask in masks.values():
+            self.failed |= mask
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Mask of records that pass every rule."""
+        return ~self.failed
+
+    def failed_rules(self, index: int) -> List[str]:
+        """Names of the rules a record fails."""
+        return [rule.name for rule in self.rules if self.masks[rule.name][index]]
+
+    def reasons(self, index: int) -> List[str]:
+        """
+        Explanations of why a record failed.
+
+        Missing required fields are reported together in one reason.
+
+        Args:
+            index: Position of the record in the evaluated batch
+
+        Returns:
+            List of reasons (empty if the record is valid)
+        """
+        missing = []
+        reasons = []
+        for rule in self.rules:
+            if not self.masks[rule.name][index]:
+                continue
+            if rule.name.endswith(".required"):
+                missing.append(rule.field)
+                continue
+            value = self._columns[rule.field].values[index]
+            reasons.append(rule.message.format(field=rule.field, value=value, param=rule.param))
+        if missing:
+            reasons.insert(0, f"Missing required fields: {', '.join(missing)}")
+        return reasons
+
+    def failure_counts(self) -> Dict[str, int]:
+        """Number of records failing each rule."""
+        return {name: int(mask.sum()) for name, mask in self.masks.items()}
+
+
+class RuleEngine:
+    """
+    Record validation rules compiled once from config.
+
+    Rules are evaluated a batch at a time: each referenced field is pulled
+    out of the records once into a column, and every rule is a vectorized
+    check producing a failure mask over the batch. Records may be
+    AssociationRecord objects or plain dictionaries (e.g. JSONL rows).
+
+    Supported checks per field: ``required``, ``min_length``, ``max_length``
+    (strings and lists), ``min``, ``max`` (numbers), ``pattern`` (regular
+    expression searched in strings) and ``allowed`` (case-insensitive
+    values). ``similarity_weight`` is read by SimilarityEngine and ignored
+    here.
+    """
+
+    def __init__(self, field_rules: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize rule engine.
+
+        Args:
+            field_rules: Field -> checks, merged over DEFAULT_FIELD_RULES
+        """
+        merged = {field: dict(rules) for field, rules in DEFAULT_FIELD_RULES.items()}
+        for field, rules in (field_rules or {}).items():
+            merged.setdefault(field, {}).update(rules or {})
+
+        self.rules: List[Rule] = []
+        for field, rules in merged.items():
+            self.rules.extend(_compile_field_rules(field, rules))
+        self.fields = list(dict.fromkeys(rule.field for rule in self.rules))
+
+    @classmethod
+    def from_config(cls, verification_config: Dict[str, Any]) -> "RuleEngine":
+        """Build an engine from the ``verification`` config block."""
+        return cls(verification_config.get("field_rules"))
+
+    def evaluate(self, records: Sequence[RecordLike]) -> RuleResults:
+        """
+        Evaluate every rule over a batch of records.
+
+        Args:
+            records: AssociationRecord objects or record dictionaries
+
+        Returns:
+            RuleResults with one failure mask per rule
+        """
+        columns = {
+            field: _FieldColumn([_field(record, field) for record in records])
+            for field in self.fields
+        }
+        masks = {rule.name: rule.check(columns[rule.field]) for rule in self.rules}
+        return RuleResults(self.rules, masks, columns)
+
+    def verify(self, record: RecordLike) -> Tuple[bool, str]:
+        """
+        Verify a single record.
+
+        Returns:
+            Tuple of (is_valid, reasons joined with "; ")
+        """
+        results = self.evaluate([record])
+        if results.valid[0]:
+            return True, ""
+        return False, "; ".join(results.reasons(0))
+
+
+@lru_cache(maxsize=8)
+def _default_engine(min_name_length: int) -> RuleEngine:
+    return RuleEngine({"name": {"min_length": min_name_length}})
+
 
 def verify_record(
     record: AssociationRecord,
@@ -10,26 +307,18 @@ def verify_record(
 ) -> Tuple[bool, str]:
     """
     Verify that a record meets basic quality standards.
-    
+
+    Uses the default rules (DEFAULT_FIELD_RULES); build a RuleEngine to
+    apply the configured ``field_rules`` or to check records in bulk.
+
     Args:
         record: Record to verify
         min_name_length: Minimum association name length
-        
+
     Returns:
         Tuple of (is_valid, error_message)
     """
-    # Check name
-    if not record.name or len(record.name) < min_name_length:
-        return False, f"Association name too short: {record.name}"
-    
-    # Check required fields
-    if not record.city or not record.state or not record.year:
-        return False, "Missing required location/date fields"
-    
-    if not record.source_pages:
-        return False, "No source pages specified"
-    
-    return True, ""
+    return _default_engine(min_name_length).verify(record)
 
 
 def create_verification_result(
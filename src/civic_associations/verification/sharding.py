@@ -0,0 +1,283 @@
+"""Verification of association groups, optionally sharded across processes."""
+
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..models import AssociationRecord
+from ..utils import setup_logger
+from .aggregation import aggregate_records
+from .rules import RuleEngine, create_verification_result
+from .similarity import SimilarityEngine, mean_pairwise_similarity
+
+logger = setup_logger(__name__)
+
+RecordGroup = Tuple[str, List[Dict[str, Any]]]
+GroupResult = Tuple[str, str, AssociationRecord, Optional[str]]
+
+
+def settings_from_config(verification_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Read verification thresholds from a ``verification`` config block.
+
+    Args:
+        verification_config: The ``verification`` section of verification.yaml
+
+    Returns:
+        Dictionary of thresholds used by verify_group
+    """
+    aggregation_config = verification_config.get("aggregation", {})
+    return {
+        "min_similarity": verification_config.get("min_similarity", 0.9),
+        "min_exact_matches": verification_config.get("min_exact_match_runs", 2),
+        "member_similarity": aggregation_config.get("member_similarity", 0.85),
+        "min_member_support": aggregation_config.get("min_member_support", 0.5),
+    }
+
+
+def shard_for(association_id: str, num_shards: int) -> int:
+    """
+    Shard of an association.
+
+    Uses CRC32 rather than hash() so the assignment is the same in every
+    process and every run.
+    """
+    return zlib.crc32(association_id.encode("utf-8")) % num_shards
+
+
+def _consistency(
+    association_id: str,
+    records: List[AssociationRecord],
+    matrix,
+    settings: Dict[str, Any]
+) -> Tuple[str, AssociationRecord, Optional[str]]:
+    """Consensus record and run-consistency status of one association."""
+    num_runs = len(records)
+
+    # Largest set of runs identical to one run (itself included)
+    exact_matches = int((matrix >= 1.0 - 1e-9).sum(axis=1).max())
+
+    # Consensus of all runs (majority vote per field, aligned members)
+    base_record = aggregate_records(
+        records,
+        min_similarity=settings["member_similarity"],
+        min_member_support=settings["min_member_support"]
+    )
+
+    avg_similarity = mean_pairwise_similarity(matrix)
+
+    # Create verification result
+    verification = create_verification_result(
+        association_id=association_id,
+        num_runs=num_runs,
+        exact_matches=exact_matches,
+        similarity=avg_similarity,
+        min_similarity=settings["min_similarity"],
+        min_exact_matches=min(settings["min_exact_matches"], num_runs)
+    )
+    return verification.status, base_record, verification.notes
+
+
+def _apply_rules(
+    association_id: str,
+    status: str,
+    reason: Optional[str],
+    failures: List[str]
+) -> Tuple[str, Optional[str]]:
+    """Route an otherwise accepted record that fails validation to review."""
+    if not failures:
+        return status, reason
+    if status == "accepted":
+        logger.warning(f"Record {association_id} failed validation: {'; '.join(failures)}")
+        return "needs_review", "; ".join(failures)
+    if status == "needs_review":
+        return status, "; ".join([reason] + failures) if reason else "; ".join(failures)
+    return status, reason
+
+
+def verify_group(
+    association_id: str,
+    records: List[AssociationRecord],
+    matrix,
+    settings: Dict[str, Any],
+    rule_engine: Optional[RuleEngine] = None
+) -> Tuple[str, AssociationRecord, Optional[str]]:
+    """
+    Verify the runs of one association and build its consensus record.
+
+    Args:
+        association_id: Association ID
+        records: Records for this association, one per run
+        matrix: Run-by-run similarity matrix
+        settings: Thresholds from settings_from_config
+        rule_engine: Validation rules (default: RuleEngine defaults)
+
+    Returns:
+        Tuple of (status, consensus record, reason)
+    """
+    status, record, reason = _consistency(association_id, records, matrix, settings)
+    results = (rule_engine or RuleEngine()).evaluate([record])
+    status, reason = _apply_rules(association_id, status, reason, results.reasons(0))
+    return status, record, reason
+
+
+def verify_groups(
+    groups: Sequence[RecordGroup],
+    engine: SimilarityEngine,
+    settings: Dict[str, Any],
+    rule_engine: Optional[RuleEngine] = None
+) -> List[GroupResult]:
+    """
+    Verify a list of association groups in the current process.
+
+    Similarity matrices and validation rules are computed for the whole
+    list at once. Records failing a rule are routed to review with the
+    rules' reasons.
+
+    Args:
+        groups: (association_id, record dictionaries) pairs
+        engine: Similarity engine for the run-by-run matrices
+        settings: Thresholds from settings_from_config
+        rule_engine: Validation rules (default: RuleEngine defaults)
+
+    Returns:
+        (association_id, status, record, reason) per group, in input order
+    """
+    group_records = [
+        [AssociationRecord(**data) for data in records_data]
+        for _, records_data in groups
+    ]
+    # Run-by-run similarity matrices for all groups at once
+    matrices = engine.similarity_matrices(group_records)
+
+    consensus = [
+        _consistency(association_id, records, matrix, settings)
+        for (association_id, _), records, matrix in zip(groups, group_records, matrices)
+    ]
+    rule_results = (rule_engine or RuleEngine()).evaluate([record for _, record, _ in consensus])
+
+    results = []
+    for i, ((association_id, _), (status, record, reason)) in enumerate(zip(groups, consensus)):
+        if rule_results.failed[i]:
+            status, reason = _apply_rules(
+                association_id, status, reason, rule_results.reasons(i)
+            )
+        results.append((association_id, status, record, reason))
+    return results
+
+
+# Per-process state of pool workers, set by _init_worker
+_worker_engine: Optional[SimilarityEngine] = None
+_worker_rules: Optional[RuleEngine] = None
+_worker_settings: Dict[str, Any] = {}
+
+
+def _init_worker(verification_config: Dict[str, Any]) -> None:
+    global _worker_engine, _worker_rules, _worker_settings
+    _worker_engine = SimilarityEngine.from_config(verification_config)
+    _worker_rules = RuleEngine.from_config(verification_config)
+    _worker_settings = settings_from_config(verification_config)
+
+
+def _verify_shard(
+    shard: int,
+    groups: List[RecordGroup]
+) -> Tuple[int, List[GroupResult], float]:
+    start = time.perf_counter()
+    results = verify_groups(groups, _worker_engine, _worker_settings, _worker_rules)
+    return shard, results, time.perf_counter() - start
+
+
+class ShardedVerifier:
+    """
+    Verify batches of association groups across a process pool.
+
+    Each group goes to the shard chosen by shard_for, each shard of a batch
+    is verified by one worker, and the results are put back in the batch's
+    input order, so the output does not depend on the number of workers.
+    With one worker, groups are verified in this process. Time spent and
+    groups verified are tracked per shard.
+    """
+
+    def __init__(self, verification_config: Dict[str, Any], workers: int = 1):
+        """
+        Initialize sharded verifier.
+
+        Args:
+            verification_config: The ``verification`` section of verification.yaml
+            workers: Number of worker processes (and shards)
+        """
+        self.workers = max(1, workers)
+        self.shard_seconds = [0.0] * self.workers
+        self.shard_groups = [0] * self.workers
+
+        if self.workers == 1:
+            self._engine = SimilarityEngine.from_config(verification_config)
+            self._rules = RuleEngine.from_config(verification_config)
+            self._settings = settings_from_config(verification_config)
+            self._pool = None
+        else:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(verification_config,)
+            )
+
+    def verify_batch(self, groups: Sequence[RecordGroup]) -> List[GroupResult]:
+        """
+        Verify one batch of association groups.
+
+        Args:
+            groups: (association_id, record dictionaries) pairs
+
+        Returns:
+            (association_id, status, record, reason) per group, in input order
+        """
+        if self._pool is None:
+            start = time.perf_counter()
+            results = verify_groups(groups, self._engine, self._settings, self._rules)
+            self.shard_seconds[0] += time.perf_counter() - start
+            self.shard_groups[0] += len(groups)
+            return results
+
+        shards: List[List[RecordGroup]] = [[] for _ in range(self.workers)]
+        positions: List[List[int]] = [[] for _ in range(self.workers)]
+        for position, group in enumerate(groups):
+            shard = shard_for(group[0], self.workers)
+            shards[shard].append(group)
+            positions[shard].append(position)
+
+        futures = [
+            self._pool.submit(_verify_shard, shard, shard_groups)
+            for shard, shard_groups in enumerate(shards)
+            if shard_groups
+        ]
+
+        results: List[Optional[GroupResult]] = [None] * len(groups)
+        for future in futures:
+            shard, shard_results, elapsed = future.result()
+            self.shard_seconds[shard] += elapsed
+            self.shard_groups[shard] += len(shard_results)
+            for position, result in zip(positions[shard], shard_results):
+                results[position] = result
+        return results
+
+    def timings(self) -> List[Dict[str, Any]]:
+        """Groups verified and seconds spent, per shard."""
+        return [
+            {"shard": shard, "groups": groups, "seconds": round(seconds, 3)}
+            for shard, (groups, seconds) in enumerate(zip(self.shard_groups, self.shard_seconds))
+        ]
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
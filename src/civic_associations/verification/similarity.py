@@ -1,46 +1,384 @@
 """Similarity metrics for verification."""
 
-from typing import List
+import re
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from ..models import AssociationRecord
 
+DEFAULT_METRICS = ("levenshtein", "token_set")
+DEFAULT_FIELD_WEIGHTS = {"name": 2.0, "association_type": 1.0, "members": 1.5}
+
+# Cells (pairs x longer-string length) per vectorized block, bounding memory
+_BLOCK_CELLS = 1 << 22
+_ONE = np.uint64(1)
+_ALL_BITS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _codes(text: str) -> np.ndarray:
+    """Unicode code points of a string."""
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
 
-def compute_similarity(record1: AssociationRecord, record2: AssociationRecord) -> float:
+def levenshtein_distance(a: str, b: str) -> int:
     """
-    Compute similarity between two association records.
-    
+    Edit distance using Myers' bit-parallel algorithm.
+
+    Python integers serve as bit vectors of arbitrary length, so each
+    character of ``b`` costs a handful of word operations regardless of
+    the length of ``a``.
+    """
+    # Bit vectors run over the shorter string
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return len(b)
+
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    mask = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = mask, 0, len(a)
+
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+
+    return score
+
+
+def _flatten(strings: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Code points of all strings with the row and column of each character."""
+    lengths = np.array([len(s) for s in strings], dtype=np.int64)
+    codes = _codes("".join(strings))
+    rows = np.repeat(np.arange(len(strings)), lengths)
+    cols = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return codes, rows, cols
+
+
+def _batch_distance_short(left: List[str], right: List[str]) -> np.ndarray:
+    """
+    Vectorized Myers edit distance for pairs whose left string has 1-64 chars.
+
+    All pairs advance one column of the right string per step, using one
+    uint64 bit vector per pair.
+    """
+    n = len(left)
+    len_a = np.array([len(s) for s in left], dtype=np.int64)
+    len_b = np.array([len(s) for s in right], dtype=np.int64)
+    width_b = int(len_b.max())
+
+    # Map characters to a dense alphabet; index `size` is padding
+    a_codes, a_rows, a_cols = _flatten(left)
+    b_codes, b_rows, b_cols = _flatten(right)
+    alphabet, inverse = np.unique(np.concatenate([a_codes, b_codes]), return_inverse=True)
+    a_chars, b_chars = inverse[:len(a_codes)], inverse[len(a_codes):]
+
+    # peq[p, c]: bits of the positions in left[p] holding character c
+    peq = np.zeros((n, len(alphabet) + 1), dtype=np.uint64)
+    np.add.at(peq, (a_rows, a_chars), np.left_shift(_ONE, a_cols.astype(np.uint64)))
+
+    b_index = np.full((n, width_b), len(alphabet), dtype=np.int64)
+    b_index[b_rows, b_cols] = b_chars
+    eq_table = np.take_along_axis(peq, b_index, axis=1)
+
+    mask = np.where(
+        len_a >= 64, _ALL_BITS,
+        np.left_shift(_ONE, np.minimum(len_a, 63).astype(np.uint64)) - _ONE
+    )
+    last = np.left_shift(_ONE, (len_a - 1).astype(np.uint64))
+    pv = mask.copy()
+    mv = np.zeros(n, dtype=np.uint64)
+    score = len_a.copy()
+
+    with np.errstate(over="ignore"):
+        for j in range(width_b):
+            active = j < len_b
+            eq = eq_table[:, j]
+            xv = eq | mv
+            xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+            ph = (mv | ~(xh | pv)) & mask
+            mh = pv & xh
+            score += np.where(active & ((ph & last) != 0), 1, 0)
+            score -= np.where(active & ((ph & last) == 0) & ((mh & last) != 0), 1, 0)
+            ph = ((ph << _ONE) | _ONE) & mask
+            mh = (mh << _ONE) & mask
+            pv = np.where(active, (mh | ~(xv | ph)) & mask, pv)
+            mv = np.where(active, ph & xv, mv)
+
+    return score
+
+
+def batch_levenshtein_distance(left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+    """
+    Edit distances for many string pairs.
+
+    Pairs where the shorter string fits in 64 characters (almost every
+    name, type and role) are computed together with NumPy uint64 bit
+    vectors; longer pairs use the arbitrary-length bit-parallel version.
+
     Args:
-        record1: First record
-        record2: Second record
-        
+        left: First strings
+        right: Second strings (same length as left)
+
     Returns:
-        Similarity score between 0.0 and 1.0
+        Integer array of distances
     """
-    # Simple placeholder - would use fuzzy string matching in practice
-    name_match = 1.0 if record1.name.lower() == record2.name.lower() else 0.0
-    type_match = 1.0 if record1.association_type == record2.association_type else 0.5
-    
-    # Average similarity
-    similarity = (name_match + type_match) / 2.0
-    return similarity
+    distances = np.zeros(len(left), dtype=np.int64)
+    short = []
+    for i, (a, b) in enumerate(zip(left, right)):
+        if len(a) > len(b):
+            a, b = b, a
+        if not a:
+            distances[i] = len(b)
+        elif a == b:
+            continue
+        elif len(a) <= 64:
+            short.append((i, a, b))
+        else:
+            distances[i] = levenshtein_distance(a, b)
+
+    # Similar lengths share a block, so little work is spent on padding
+    short.sort(key=lambda pair: len(pair[2]))
+    start = 0
+    while start < len(short):
+        rows = max(1, _BLOCK_CELLS // (len(short[start][2]) + 64))
+        longest = len(short[min(start + rows, len(short)) - 1][2])
+        block = short[start:start + max(1, _BLOCK_CELLS // (longest + 64))]
+        index = [i for i, _, _ in block]
+        distances[index] = _batch_distance_short(
+            [a for _, a, _ in block], [b for _, _, b in block]
+        )
+        start += len(block)
+    return distances
+
+
+def batch_levenshtein_similarity(left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+    """Normalized edit similarity 1 - distance / longer length (1.0 for two empty strings)."""
+    longest = np.array([max(len(a), len(b)) for a, b in zip(left, right)], dtype=np.float64)
+    distances = batch_levenshtein_distance(left, right)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(longest > 0, 1.0 - distances / longest, 1.0)
 
 
-def aggregate_records(
-    records: List[AssociationRecord],
-    min_similarity: float = 0.9
-) -> AssociationRecord:
+def _token_set_strings(a: str, b: str) -> Tuple[str, str, str]:
+    """Sorted intersection, and intersection plus each side's remaining tokens."""
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    common = " ".join(sorted(tokens_a & tokens_b))
+    rest_a = " ".join(sorted(tokens_a - tokens_b))
+    rest_b = " ".join(sorted(tokens_b - tokens_a))
+    return common, f"{common} {rest_a}".strip(), f"{common} {rest_b}".strip()
+
+
+def batch_token_set_similarity(left: Sequence[str], right: Sequence[str]) -> np.ndarray:
     """
-    Aggregate multiple extraction runs into a single record.
-    
+    Token-set similarity for many string pairs.
+
+    Insensitive to word order and to one side containing extra words: the
+    score is the best edit similarity among the sorted common tokens and
+    the common tokens followed by each side's remaining tokens.
+    """
+    triples = [_token_set_strings(a, b) for a, b in zip(left, right)]
+    common = [t[0] for t in triples]
+    with_a = [t[1] for t in triples]
+    with_b = [t[2] for t in triples]
+
+    scores = np.maximum(
+        batch_levenshtein_similarity(with_a, with_b),
+        np.maximum(
+            batch_levenshtein_similarity(common, with_a),
+            batch_levenshtein_similarity(common, with_b)
+        )
+    )
+    # An empty intersection must not count as a match with an empty string
+    has_common = np.array([bool(c) for c in common])
+    both_empty = np.array([not a.strip() and not b.strip() for a, b in zip(left, right)])
+    return np.where(
+        has_common | both_empty, scores, batch_levenshtein_similarity(with_a, with_b)
+    )
+
+
+METRICS = {
+    "levenshtein": batch_levenshtein_similarity,
+    "token_set": batch_token_set_similarity,
+}
+
+
+def _normalize(text: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", (text or "").lower()).strip()
+
+
+def field_values(record: AssociationRecord) -> Dict[str, str]:
+    """
+    Comparable string form of each field of a record.
+
+    Members are order-independent: each becomes "name (role)" and the
+    list is sorted.
+    """
+    members = sorted(
+        f"{_normalize(m.full_name)} ({_normalize(m.role)})" if m.role else _normalize(m.full_name)
+        for m in record.members
+    )
+    return {
+        "name": _normalize(record.name),
+        "association_type": _normalize(record.association_type),
+        "members": "; ".join(members),
+    }
+
+
+class SimilarityEngine:
+    """
+    Weighted, multi-metric similarity between extraction runs.
+
+    Each field is scored with every configured metric (averaged), and the
+    field scores are combined with the configured weights. Comparisons are
+    batched: ``similarity_matrices`` gathers every run pair of every
+    association and scores each field/metric in a single vectorized pass.
+    """
+
+    def __init__(
+        self,
+        metrics: Sequence[str] = DEFAULT_METRICS,
+        field_weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize similarity engine.
+
+        Args:
+            metrics: Metric names (keys of METRICS)
+            field_weights: Field -> weight (default: DEFAULT_FIELD_WEIGHTS)
+        """
+        unknown = [m for m in metrics if m not in METRICS]
+        if unknown:
+            raise ValueError(f"Unknown similarity metrics {unknown} (expected {sorted(METRICS)})")
+
+        self.metrics = list(metrics)
+        self.field_weights = dict(DEFAULT_FIELD_WEIGHTS if field_weights is None else field_weights)
+
+    @classmethod
+    def from_config(cls, verification_config: Dict[str, Any]) -> "SimilarityEngine":
+        """Build an engine from the ``verification`` config block."""
+        field_rules = verification_config.get("field_rules", {})
+        weights = {
+            field: rules.get("similarity_weight", 1.0)
+            for field, rules in field_rules.items()
+            if field in DEFAULT_FIELD_WEIGHTS
+        }
+        return cls(
+            metrics=verification_config.get("metrics", DEFAULT_METRICS),
+            field_weights=weights or None
+        )
+
+    def pair_similarities(
+        self,
+        left: Sequence[AssociationRecord],
+        right: Sequence[AssociationRecord]
+    ) -> np.ndarray:
+        """
+        Similarity of each record pair (left[i], right[i]).
+
+        Args:
+            left: First records
+            right: Second records
+
+        Returns:
+            Array of weighted similarities in [0, 1]
+        """
+        return self._score_values(
+            [field_values(r) for r in left], [field_values(r) for r in right]
+        )
+
+    def _score_values(
+        self,
+        left_values: List[Dict[str, str]],
+        right_values: List[Dict[str, str]]
+    ) -> np.ndarray:
+        """Weighted similarity of pairs of field_values dictionaries."""
+        total = np.zeros(len(left_values), dtype=np.float64)
+        weight_sum = sum(self.field_weights.values())
+        if not left_values or weight_sum == 0:
+            return total
+
+        for field, weight in self.field_weights.items():
+            a = [v[field] for v in left_values]
+            b = [v[field] for v in right_values]
+            scores = np.mean([METRICS[metric](a, b) for metric in self.metrics], axis=0)
+            total += weight * scores
+
+        return total / weight_sum
+
+    def similarity_matrices(
+        self,
+        groups: Sequence[Sequence[AssociationRecord]]
+    ) -> List[np.ndarray]:
+        """
+        Run-by-run similarity matrix for each group of records.
+
+        Args:
+            groups: Records of each association, one per extraction run
+
+        Returns:
+            One symmetric (runs x runs) matrix per group, with 1.0 on the diagonal
+        """
+        pairs = [
+            (g, i, j)
+            for g, records in enumerate(groups)
+            for i, j in combinations(range(len(records)), 2)
+        ]
+        values = [[field_values(r) for r in records] for records in groups]
+        scores = self._score_values(
+            [values[g][i] for g, i, _ in pairs],
+            [values[g][j] for g, _, j in pairs]
+        )
+
+        matrices = [np.eye(len(records)) for records in groups]
+        for (g, i, j), score in zip(pairs, scores):
+            matrices[g][i, j] = matrices[g][j, i] = score
+        return matrices
+
+    def similarity(self, record1: AssociationRecord, record2: AssociationRecord) -> float:
+        """Weighted similarity of two records."""
+        return float(self.pair_similarities([record1], [record2])[0])
+
+
+def mean_pairwise_similarity(matrix: np.ndarray) -> float:
+    """Average off-diagonal similarity of a run-by-run matrix (1.0 for one run)."""
+    n = matrix.shape[0]
+    if n < 2:
+        return 1.0
+    return float((matrix.sum() - np.trace(matrix)) / (n * (n - 1)))
+
+
+def compute_similarity(
+    record1: AssociationRecord,
+    record2: AssociationRecord,
+    engine: Optional[SimilarityEngine] = None
+) -> float:
+    """
+    Compute similarity between two association records.
+
     Args:
-        records: List of records from different runs
-        min_similarity: Minimum similarity threshold
-        
+        record1: First record
+        record2: Second record
+        engine: SimilarityEngine to use (default metrics and weights if None)
+
     Returns:
-        Aggregated AssociationRecord
-    """
-    # Simple placeholder - would implement majority voting in practice
-    if not records:
-        raise ValueError("No records to aggregate")
-    
-    # For now, just return the first record
-    return records[0]
+        Similarity score between 0.0 and 1.0
+    """
+    return (engine or SimilarityEngine()).similarity(record1, record2)
+
@@ -0,0 +1,259 @@
+"""Tests for the database writer."""
+
+import sqlite3
+
+import pytest
+from civic_associations.db import DatabaseWriter
+from civic_associations.models import AssociationRecord, Member
+
+
+def _record(i):
+    return AssociationRecord(
+        association_id=f"assoc_{i}",
+        name=f"Society {i}",
+        city="Boston",
+        state="MA",
+        year=1855,
+        source_pages=[f"test_p{i:03d}"],
+        raw_section_text="Test text",
+        members=[Member(full_name="Jno. Smith", role="Pres."), Member(full_name="Wm. Brown")],
+        extraction_run_id="test_run"
+    )
+
+
+def test_bulk_write_in_batches(tmp_path):
+    """Test writing records in several executemany batches on one connection."""
+    db_path = str(tmp_path / "test.sqlite")
+
+    with DatabaseWriter(db_path, batch_size=3) as writer:
+        writer.write_records([_record(i) for i in range(10)])
+        writer.write_record(_record(10))
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("SELECT COUNT(*) FROM associations").fetchone()[0] == 11
+        assert conn.execute("SELECT COUNT(*) FROM association_pages").fetchone()[0] == 11
+        members = conn.execute(
+            "SELECT given_names, role_normalized FROM members WHERE association_id = 'assoc_10'"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    assert members == [("John", "President"), ("William", None)]
+
+
+def test_bulk_write_is_one_transaction(tmp_path):
+    """Test that a failed write leaves none of its records behind."""
+    db_path = str(tmp_path / "test.sqlite")
+    writer = DatabaseWriter(db_path, batch_size=2)
+    records = [_record(i) for i in range(5)]
+    records[4].members.append(Member.model_construct(full_name=None))  # violates NOT NULL
+
+    with pytest.raises(sqlite3.IntegrityError):
+        writer.write_records(records)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM associations").fetchone()[0] == 0
+    finally:
+        conn.close()
+    writer.close()
+
+
+def test_reload_is_idempotent_and_replaces_changed(tmp_path):
+    """Test that reloading skips unchanged records and replaces changed ones."""
+    db_path = str(tmp_path / "test.sqlite")
+    records = [_record(i) for i in range(3)]
+
+    with DatabaseWriter(db_path) as writer:
+        assert writer.write_records(records) == {"inserted": 3, "updated": 0, "unchanged": 0}
+        assert writer.write_records(records) == {"inserted": 0, "updated": 0, "unchanged": 3}
+
+        changed = records[1].model_copy(update={"members": [Member(full_name="Geo. Hall")]})
+        counts = writer.write_records([records[0], changed])
+        assert counts == {"inserted": 0, "updated": 1, "unchanged": 1}
+
+    conn = sqlite3.connect(db_path)
+    try:
+        counts = dict(conn.execute(
+            "SELECT association_id, COUNT(*) FROM members GROUP BY association_id"
+        ).fetchall())
+        names = conn.execute(
+            "SELECT full_name FROM members WHERE association_id = 'assoc_1'"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    assert counts == {"assoc_0": 2, "assoc_1": 1, "assoc_2": 2}
+    assert names == [("Geo. Hall",)]
+
+
+def test_reader_searches_names_and_text(tmp_path):
+    """Test FTS member and section search, page lookup and sync after a reload."""
+    from civic_associations.db import DatabaseReader
+
+    db_path = str(tmp_path / "test.sqlite")
+    records = [_record(i) for i in range(3)]
+    records[1].raw_section_text = "Ancient Order of Hibernians, meets at Faneuil Hall"
+    with DatabaseWriter(db_path) as writer:
+        writer.write_records(records)
+
+    with DatabaseReader(db_path) as reader:
+        assert reader.has_fts
+        matches = reader.find_members("Wm. Brown")
+        assert [m.association_id for m in matches] == ["assoc_0", "assoc_1", "assoc_2"]
+        assert reader.find_members("John Smith")[0].full_name == "Jno. Smith"
+        assert reader.find_members("Robert Smith") == []
+
+        hits = reader.search_text("faneuil hiber")
+        assert [hit.association_id for hit in hits] == ["assoc_1"]
+        assert "[Faneuil]" in hits[0].snippet
+
+        record = reader.get_association("assoc_1")
+        assert record.source_pages == ["test_p001"]
+        assert [m.full_name for m in record.members] == ["Jno. Smith", "Wm. Brown"]
+        assert [r.association_id for r in reader.associations_on_page("test_p002")] == ["assoc_2"]
+        assert len(reader.find_associations(city="boston", year=1855)) == 3
+
+    # Changed records replace their index entries
+    records[1].raw_section_text = "Meets at Tremont Temple"
+    with DatabaseWriter(db_path) as writer:
+        writer.write_records(records)
+
+    with DatabaseReader(db_path) as reader:
+        assert reader.search_text("faneuil") == []
+        assert [hit.association_id for hit in reader.search_text("tremont")] == ["assoc_1"]
+        assert len(reader.find_members("Brown")) == 3
+
+
+def test_export_streams_selected_columns(tmp_path):
+    """Test batched CSV/JSONL export with column selection."""
+    import csv
+    import json
+
+    from civic_associations.db import export_table
+
+    db_path = str(tmp_path / "test.sqlite")
+    with DatabaseWriter(db_path) as writer:
+        writer.write_records([_record(i) for i in range(5)])
+
+    count = export_table(
+        db_path, "associations", tmp_path, "csv", columns=["association_id", "year"], batch_size=2
+    )
+    assert count == 5
+    with open(tmp_path / "associations.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == ["association_id", "year"]
+    assert sorted(row["association_id"] for row in rows) == [f"assoc_{i}" for i in range(5)]
+
+    assert export_table(db_path, "members", tmp_path, "jsonl", batch_size=3) == 10
+    with open(tmp_path / "members.jsonl") as f:
+        member = json.loads(f.readline())
+    assert member["full_name"] == "Jno. Smith"
+    assert member["given_names"] == "John"
+
+    with pytest.raises(ValueError, match="Unknown members columns: nickname"):
+        export_table(db_path, "members", tmp_path, "csv", columns=["full_name", "nickname"])
+
+
+def test_export_parquet_partitioned(tmp_path):
+    """Test Parquet export partitioned by state and year."""
+    pytest.importorskip("pyarrow")
+    import pyarrow.dataset as ds
+
+    from civic_associations.db import export_table
+
+    db_path = str(tmp_path / "test.sqlite")
+    records = [_record(i) for i in range(4)]
+    records[3].year = 1860
+    with DatabaseWriter(db_path) as writer:
+        writer.write_records(records)
+
+    assert export_table(db_path, "members", tmp_path, "parquet", columns=["full_name"]) == 8
+
+    assert (tmp_path / "members" / "state=MA" / "year=1860").is_dir()
+    table = ds.dataset(tmp_path / "members", format="parquet", partitioning="hive").to_table()
+    assert table.num_rows == 8
+    assert sorted(set(table.column("year").to_pylist())) == [1855, 1860]
+
+
+def test_section_text_stored_once_compressed(tmp_path):
+    """Test that shared section text is one compressed blob, read back transparently."""
+    from civic_associations.db import DatabaseReader, export_table
+
+    db_path = str(tmp_path / "test.sqlite")
+    section = "Odd Fellows' Hall, Washington Street. " * 50
+    records = [_record(i) for i in range(5)]
+    for record in records:
+        record.raw_section_text = section
+    with DatabaseWriter(db_path) as writer:
+        writer.write_records(records)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        blobs = conn.execute("SELECT codec, size, LENGTH(data) FROM text_blobs").fetchall()
+        inline = conn.execute(
+            "SELECT COUNT(*) FROM associations WHERE raw_section_text IS NOT NULL"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    assert len(blobs) == 1
+    assert blobs[0][1] == len(section) and blobs[0][2] < len(section) / 10
+    assert inline == 0
+
+    with DatabaseReader(db_path) as reader:
+        assert reader.get_association("assoc_3").raw_section_text == section
+        assert reader.section_text("assoc_0") == section
+        assert len(reader.search_text("washington")) == 5
+
+    export_table(db_path, "associations", tmp_path, "csv", columns=["raw_section_text"])
+    assert (tmp_path / "associations.csv").read_text().count("Washington Street") == 250
+
+    # Replacing every record's text leaves no orphaned blob or index entry
+    for record in records:
+        record.raw_section_text = "Meets at Tremont Temple"
+    with DatabaseWriter(db_path) as writer:
+        writer.write_records(records)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM text_blobs").fetchone()[0] == 1
+    finally:
+        conn.close()
+    with DatabaseReader(db_path) as reader:
+        assert reader.search_text("washington") == []
+        assert len(reader.search_text("tremont")) == 5
+
+
+def test_inline_section_text_migrated(tmp_path):
+    """Test that text stored inline by an older schema moves into blobs."""
+    from civic_associations.db import DatabaseReader
+
+    db_path = str(tmp_path / "old.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE associations (
+            association_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            association_type TEXT,
+            city TEXT,
+            county TEXT,
+            state TEXT,
+            year INTEGER,
+            source_directory_title TEXT,
+            source_collection TEXT,
+            raw_section_text TEXT,
+            extraction_run_id TEXT,
+            metadata_json TEXT
+        );
+        INSERT INTO associations (association_id, name, year, raw_section_text)
+        VALUES ('old_1', 'Mechanics Institute', 1850, 'Lectures every Tuesday');
+    """)
+    conn.close()
+
+    DatabaseWriter(db_path).close()
+
+    with DatabaseReader(db_path) as reader:
+        assert reader.get_association("old_1").raw_section_text == "Lectures every Tuesday"
+        assert [hit.association_id for hit in reader.search_text("tuesday")] == ["old_1"]
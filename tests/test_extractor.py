@@ -1,10 +1,61 @@
 """Tests for extractor."""
 
+import io
+import time
+
 import pytest
-from civic_associations.extraction import LLMClient, Extractor
+from civic_associations.extraction import (
+    BudgetExceededError,
+    CircuitBreaker,
+    CostLedger,
+    RunCheckpoint,
+    Extractor,
+    GeminiProvider,
+    ImagePayload,
+    ImagePayloadCache,
+    LatencyModel,
+    LLMCallError,
+    LLMClient,
+    LLMRouter,
+    OpenAICompatibleProvider,
+    PromptCompactor,
+    RetryableLLMError,
+    RouteTarget,
+    RuleBasedExtractor,
+    RetryPolicy,
+    StandInLLMClient,
+    StandInServer,
+    build_extraction_prompt,
+    build_system_prompt,
+    find_gaps,
+    merge_repair,
+)
+from civic_associations.extraction.parsing import parse_llm_response, validate_members
 from civic_associations.models import Section, AssociationRecord
 
 
+class FakeLLMClient(LLMClient):
+    """LLMClient whose provider call is scripted by the test."""
+
+    def __init__(self, responses, **kwargs):
+        kwargs.setdefault("retry_policy", RetryPolicy(base_delay=0.0, jitter=False))
+        super().__init__(**kwargs)
+        self.responses = list(responses)
+        self.calls = 0
+        self.system_prompts = []
+
+    def _generate(self, system_prompt, user_prompt, images=None):
+        self.calls += 1
+        self.system_prompts.append(system_prompt)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        if callable(response):
+            return response()
+        return {"content": response, "model": self.model_name,
+                "tokens_used": 10, "finish_reason": "stop"}
+
+
 def test_llm_client_init():
     """Test LLMClient initialization."""
     client = LLMClient()
@@ -21,7 +72,10 @@ def test_extractor_init():
 
 def test_extract_from_section():
     """Test extraction from a section."""
-    client = LLMClient()
+    client = FakeLLMClient([
+        '{"name": "Boston Temperance Society", "association_type": "temperance", '
+        '"members": [{"full_name": "John Smith", "role": "President"}]}'
+    ])
     extractor = Extractor(client)
     
     section = Section(
@@ -40,3 +94,645 @@ def test_extract_from_section():
     assert isinstance(records, list)
     assert len(records) > 0
     assert isinstance(records[0], AssociationRecord)
+    assert records[0].members[0].full_name == "John Smith"
+
+
+def test_extractor_drops_non_string_fields():
+    """Test that non-string name and type fields from the model do not fail the section."""
+    client = FakeLLMClient([
+        '[{"name": ["Boston", "Lodge"], "association_type": {"kind": "masonic"}, '
+        '"members": [{"full_name": "John Smith"}]}, {"name": 1855, "association_type": 3}]'
+    ])
+
+    records = Extractor(client).extract_from_section(make_section("Boston Lodge"), run_id="r")
+
+    assert [(r.name, r.association_type) for r in records] == [("Unknown", None), ("1855", "3")]
+    assert records[0].members[0].full_name == "John Smith"
+
+
+def test_llm_client_retries_transient_errors():
+    """Test that retryable errors are retried until a call succeeds."""
+    client = FakeLLMClient([
+        RetryableLLMError("rate limited"),
+        TimeoutError("slow"),
+        '{"name": "Lodge"}',
+    ])
+
+    result = client.call("system", "user")
+    assert result["content"] == '{"name": "Lodge"}'
+    assert result["attempts"] == 3
+    assert client.calls == 3
+
+
+def test_llm_client_raises_instead_of_fallback():
+    """Test that permanent failures raise rather than returning a fake record."""
+    client = FakeLLMClient([ValueError("bad request")])
+
+    with pytest.raises(LLMCallError):
+        client.call("system", "user")
+    assert client.calls == 1
+
+
+def test_extractor_skips_failed_calls():
+    """Test that the extractor produces no records when the LLM call fails."""
+    client = FakeLLMClient([RetryableLLMError("overloaded")],
+                           retry_policy=RetryPolicy(max_attempts=2, base_delay=0.0))
+    section = Section(
+        section_id="s1", page_ids=["test_p001"], city="Boston", state="MA", year=1855,
+        start_page_number=1, end_page_number=1, section_type="associations",
+        raw_text="Boston Temperance Society"
+    )
+
+    assert Extractor(client).extract_from_section(section, run_id="r") == []
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test that the circuit opens after repeated failures and half-opens after the timeout."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    start = time.monotonic()
+    breaker.wait_until_ready()
+    assert time.monotonic() - start >= 0.04
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_probe_released_on_permanent_error():
+    """Test that a non-retryable error during the half-open probe does not block later calls."""
+    client = FakeLLMClient(
+        [RetryableLLMError("overloaded"), ValueError("bad request"), '{"name": "Lodge"}'],
+        retry_policy=RetryPolicy(max_attempts=1),
+        circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    )
+
+    with pytest.raises(LLMCallError):
+        client.call("system", "user")
+    with pytest.raises(LLMCallError):
+        client.call("system", "user")
+
+    start = time.monotonic()
+    assert client.call("system", "user")["content"] == '{"name": "Lodge"}'
+    assert time.monotonic() - start < 0.5
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedged_request_returns_faster_duplicate():
+    """Test that a call slower than the p95 latency is hedged with a duplicate."""
+    delays = [1.0, 0.0]
+
+    def respond():
+        time.sleep(delays.pop(0) if delays else 0.0)
+        return {"content": "{}", "model": "fake", "tokens_used": 0, "finish_reason": "stop"}
+
+    client = FakeLLMClient([respond], hedge_requests=True, hedge_min_samples=5)
+    for _ in range(5):
+        client.latency.record(0.01)
+
+    start = time.monotonic()
+    client.call("system", "user")
+    assert time.monotonic() - start < 0.5
+    assert client.calls == 2
+
+
+def test_llm_client_close_shuts_down_executor():
+    """Test that close() stops the call worker threads."""
+    with FakeLLMClient(['{"name": "Lodge"}']) as client:
+        client.call("system", "user")
+        executor = client._executor
+    assert client._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+def make_section(raw_text, section_id="s1"):
+    """Build a single-page test section."""
+    return Section(
+        section_id=section_id, page_ids=["test_p001"], city="Boston", state="MA",
+        year=1855, start_page_number=1, end_page_number=1, section_type="associations",
+        raw_text=raw_text
+    )
+
+
+def test_standin_generates_records_from_section_text():
+    """Test that the stand-in derives a record from the section text."""
+    extractor = Extractor(StandInLLMClient())
+    section = make_section(
+        "Boston Temperance Society - President: John Smith, Secretary: Mary Jones"
+    )
+
+    record = extractor.extract_from_section(section, run_id="r")[0]
+    assert record.name == "Boston Temperance Society"
+    assert record.association_type == "temperance"
+    assert [m.full_name for m in record.members] == ["John Smith", "Mary Jones"]
+
+
+def test_standin_is_deterministic():
+    """Test that injected failures repeat identically for the same seed."""
+    def outcomes(seed):
+        client = StandInLLMClient(error_rate=0.5, seed=seed)
+        results = []
+        for i in range(20):
+            try:
+                client._generate("system", f"prompt {i}")
+                results.append(True)
+            except RetryableLLMError:
+                results.append(False)
+        return results
+
+    assert outcomes(1) == outcomes(1)
+    assert not all(outcomes(1))
+
+
+def test_standin_rate_limits_are_retried():
+    """Test that simulated 429s are retried by the client."""
+    client = StandInLLMClient(
+        rate_limit_rate=0.5, seed=3,
+        retry_policy=RetryPolicy(max_attempts=10, base_delay=0.0, jitter=False)
+    )
+    for i in range(10):
+        client.call("system", f"prompt {i}")
+    assert client.stats["rate_limited"] > 0
+    assert client.stats["succeeded"] == 10
+
+
+def test_standin_http_server_roundtrip():
+    """Test extraction through the HTTP stand-in server."""
+    backend = StandInLLMClient(
+        canned_responses={"Lodge": {"name": "St. John's Lodge", "members": []}},
+        latency=LatencyModel("uniform", mean=0.01, spread=0.005)
+    )
+    with StandInServer(backend) as server:
+        client = LLMClient(
+            model_name="standin",
+            provider=OpenAICompatibleProvider(model_name="standin", base_url=server.url)
+        )
+        records = Extractor(client).extract_from_section(
+            make_section("St. John's Lodge, No. 1"), run_id="r"
+        )
+
+    assert records[0].name == "St. John's Lodge"
+    assert backend.stats["calls"] == 1
+
+
+def test_parse_strips_code_fences():
+    """Test parsing a fenced JSON response."""
+    items, salvaged = parse_llm_response('```json\n{"name": "Lodge", "members": []}\n```')
+    assert items == [{"name": "Lodge", "members": []}]
+    assert not salvaged
+
+
+def test_parse_salvages_truncated_members():
+    """Test that complete members are recovered from a truncated response."""
+    content = (
+        '{"name": "Boston Temperance Society", "association_type": "temperance", '
+        '"members": [{"full_name": "John Smith", "role": "Pres."}, '
+        '{"full_name": "Mary {Jones}", "role": "Sec."}, {"full_name": "Wm. Bro'
+    )
+    items, salvaged = parse_llm_response(content)
+
+    assert salvaged
+    assert items[0]["name"] == "Boston Temperance Society"
+    assert [m["full_name"] for m in items[0]["members"]] == ["John Smith", "Mary {Jones}"]
+
+
+def test_validate_members_drops_only_invalid_entries():
+    """Test bulk member validation with a malformed entry."""
+    members = validate_members([{"full_name": "John Smith"}, {"role": "Sec."}, "junk"])
+    assert [m.full_name for m in members] == ["John Smith"]
+
+
+def test_extractor_keeps_salvaged_records():
+    """Test that a truncated response still yields a record flagged as salvaged."""
+    client = FakeLLMClient(['{"name": "Musical Union", "members": [{"full_name": "A. Brown"}, {"fu'])
+    records = Extractor(client).extract_from_section(make_section("Musical Union"), run_id="r")
+
+    assert records[0].name == "Musical Union"
+    assert len(records[0].members) == 1
+    assert records[0].metadata["salvaged"] is True
+
+
+def test_run_checkpoint_resume_skips_completed_sections(tmp_path):
+    """Test that a resumed run keeps completed sections and drops partial ones."""
+    extractor = Extractor(StandInLLMClient())
+    done = extractor.extract_from_section(make_section("Musical Union", "s1"), run_id="r1")
+    partial = extractor.extract_from_section(make_section("Odd Fellows Lodge", "s2"), run_id="r1")
+
+    checkpoint = RunCheckpoint(str(tmp_path), "r1")
+    checkpoint.start()
+    checkpoint.record_section("s1", done)
+
+    # Simulate a crash after s2's records were appended but before its ledger line
+    with open(checkpoint.records_file, "a") as f:
+        f.write(partial[0].model_dump_json() + "\n" + '{"truncated')
+
+    with pytest.raises(FileExistsError):
+        RunCheckpoint(str(tmp_path), "r1").start()
+
+    resumed = RunCheckpoint(str(tmp_path), "r1")
+    assert resumed.start(resume=True) == {"s1"}
+    assert resumed.num_records == 1
+
+    lines = resumed.records_file.read_text().splitlines()
+    assert len(lines) == 1
+    assert AssociationRecord.model_validate_json(lines[0]).name == "Musical Union"
+
+
+def test_run_checkpoint_survives_repeated_resume_after_torn_ledger(tmp_path):
+    """Test that a torn ledger line is removed so entries recorded after a resume are kept."""
+    checkpoint = RunCheckpoint(str(tmp_path), "r1")
+    checkpoint.start()
+    checkpoint.record_section("s1", [])
+
+    # Crash while writing s2's ledger line
+    with open(checkpoint.ledger_file, "a") as f:
+        f.write('{"section_id": "s2", "num_re')
+
+    resumed = RunCheckpoint(str(tmp_path), "r1")
+    assert resumed.start(resume=True) == {"s1"}
+    resumed.record_section("s2", [])
+    resumed.record_section("s3", [])
+
+    again = RunCheckpoint(str(tmp_path), "r1")
+    assert again.start(resume=True) == {"s1", "s2", "s3"}
+    assert len(again.ledger_file.read_text().splitlines()) == 3
+
+
+def test_router_fails_over_and_prefers_fast_provider():
+    """Test that the router fails over from a down provider and learns latencies."""
+    fast_policy = RetryPolicy(max_attempts=1)
+    down = RouteTarget(StandInLLMClient(error_rate=1.0, retry_policy=fast_policy), name="down")
+    slow = RouteTarget(
+        StandInLLMClient(latency=LatencyModel(mean=0.05), retry_policy=fast_policy), name="slow"
+    )
+    fast = RouteTarget(StandInLLMClient(retry_policy=fast_policy), name="fast")
+    router = LLMRouter([down, slow, fast])
+
+    providers = [router.call("system", f"prompt {i}")["provider"] for i in range(10)]
+
+    assert "down" not in providers
+    assert providers[-5:] == ["fast"] * 5
+    assert down.failures >= 1
+
+
+def test_router_from_config_targets_local_endpoints():
+    """Test a config-built router against two local OpenAI-compatible stand-ins."""
+    with StandInServer(StandInLLMClient(error_rate=1.0)) as broken, \
+            StandInServer(StandInLLMClient()) as healthy:
+        router = LLMRouter.from_config({
+            "api_timeout": 5,
+            "retry": {"max_attempts": 1},
+            "providers": [
+                {"name": "broken", "type": "openai", "base_url": broken.url,
+                 "model_name": "standin"},
+                {"name": "healthy", "type": "openai", "base_url": healthy.url,
+                 "model_name": "standin", "max_concurrency": 2},
+            ],
+        })
+        records = Extractor(router).extract_from_section(
+            make_section("Musical Union - President: A. Brown"), run_id="r"
+        )
+
+    assert records[0].members[0].full_name == "A. Brown"
+    assert records[0].metadata["model"] == "standin"
+
+
+def test_compactor_strips_headers_page_numbers_and_ads():
+    """Test that compaction removes OCR noise but keeps directory entries."""
+    compactor = PromptCompactor()
+    compactor.fit([
+        "BUFFALO CITY DIRECTORY. 101\nfirst entry\nlast entry\nBUFFALO CITY DIRECTORY.",
+        "BUFFALO CITY DIRECTORY. 102\nanother entry\nend",
+        "BUFFALO CITY DIRECTORY. 103\nmore\nend",
+    ])
+    text = (
+        "BUFFALO CITY DIRECTORY. 104\n\n"
+        "Young Men's Association.—Incorporated 1855.\n"
+        "Officers—John   Smith, President；Mary Jones，Secretary.\n\n"
+        "  — 57 —  \n"
+        "J. BROWN & CO., Manufacturers of Stoves, see adv.\n"
+    )
+
+    result = compactor.compact(text)
+
+    assert result.text == (
+        "Young Men's Association.—Inc. 1855.\n"
+        "Officers—John Smith, President;Mary Jones,Secretary."
+    )
+    assert result.removed_lines == 3
+    assert result.compacted_tokens < result.original_tokens
+
+
+def test_extractor_reports_compaction_savings():
+    """Test that compacted extraction records per-section token savings."""
+    extractor = Extractor(StandInLLMClient(), compactor=PromptCompactor())
+    section = make_section("Musical Union\n\n12\n\nPresident: A. Brown")
+
+    record = extractor.extract_from_section(section, run_id="r")[0]
+    compaction = record.metadata["compaction"]
+
+    assert compaction["prompt_tokens_after"] < compaction["prompt_tokens_before"]
+    assert compaction["savings"] > 0.3
+    assert record.raw_section_text == section.raw_text
+
+
+def test_compaction_keeps_configured_system_prompt():
+    """Test that compaction does not replace a configured system prompt or prefix."""
+    section = make_section("Musical Union\n\n12\n\nPresident: A. Brown")
+    examples = [{"input": "Lodge - Pres. A", "output": '{"name": "Lodge"}'}]
+
+    client = FakeLLMClient(['{"name": "Musical Union"}'])
+    Extractor(
+        client, compactor=PromptCompactor(), system_prompt="Custom instructions.",
+        examples=examples
+    ).extract_from_section(section, run_id="r")
+    assert client.system_prompts[-1] == build_system_prompt("Custom instructions.", examples)
+
+    client = FakeLLMClient(['{"name": "Musical Union"}'])
+    Extractor(
+        client, compactor=PromptCompactor(), system_prompt="Custom instructions.",
+        compact_system_prompt="Short instructions."
+    ).extract_from_section(section, run_id="r")
+    assert client.system_prompts[-1] == "Short instructions."
+
+
+def test_rule_extractor_parses_regular_entries():
+    """Test the rule-based parser on role-first and name-first officer lists."""
+    rules = RuleBasedExtractor()
+
+    data, confidence = rules.parse_entry(
+        "Boston Temperance Society — Pres. John Smith; Sec'y. Mary Jones"
+    )
+    assert confidence == 1.0
+    assert data["association_type"] == "temperance"
+    assert data["members"] == [
+        {"full_name": "John Smith", "role": "President"},
+        {"full_name": "Mary Jones", "role": "Secretary"},
+    ]
+
+    data, _ = rules.parse_entry("Buffalo Bible Society.—C.G. Miller, President; H. Martin, V. Pres.")
+    assert [m["role"] for m in data["members"]] == ["President", "Vice President"]
+
+    assert rules.parse_entry("Directors--D.R.Morse,Wm.A.Bird. Chas G.Miller")[0] is None
+
+    data, _ = rules.parse_entry("Mechanics' Lodge: PRES. John Smith; john Brown, treas.")
+    assert data["members"] == [{"full_name": "John Smith", "role": "President"}]
+
+
+def test_rule_extractor_leaves_prose_to_llm():
+    """Test that lowercase prose after an officer title is not taken for a name."""
+    client = StandInLLMClient()
+    extractor = Extractor(client, rule_extractor=RuleBasedExtractor())
+    prose = [
+        "Boston Temperance Society — Pres. meets monthly at hall",
+        "Charitable Association — Secretary of the board",
+        "Mercantile Association — Director, general merchandise",
+        "Musical Union — Treas. the same",
+    ]
+    for entry in prose:
+        assert extractor.rule_extractor.parse_entry(entry)[0] is None
+
+    records = extractor.extract_from_section(make_section("\n".join(prose)), run_id="r")
+
+    assert all(r.metadata["extraction_path"] == "llm" for r in records)
+    assert client.stats["calls"] == 1
+
+
+def test_extractor_routes_only_remainder_to_llm():
+    """Test that rule-parsed entries bypass the LLM and are tagged by path."""
+    client = StandInLLMClient()
+    extractor = Extractor(client, rule_extractor=RuleBasedExtractor())
+    section = make_section(
+        "Boston Temperance Society — Pres. John Smith; Sec. Mary Jones\n"
+        "Musical Union. Organized 1850. Officers elected annually; President: A. Brown"
+    )
+
+    records = extractor.extract_from_section(section, run_id="r")
+
+    assert [r.metadata["extraction_path"] for r in records] == ["rules", "llm"]
+    assert records[1].name.startswith("Musical Union")
+    assert client.stats["calls"] == 1
+
+    extractor.extract_from_section(
+        make_section("Boston Temperance Society — Pres. John Smith", "s2"), run_id="r"
+    )
+    assert client.stats["calls"] == 1
+    assert extractor.stats["llm_calls_skipped"] == 1
+
+
+def test_multimodal_extraction_sends_cached_section_crops(tmp_path):
+    """Test that section crops are encoded once and attached to LLM calls."""
+    Image = pytest.importorskip("PIL.Image")
+    page_image = tmp_path / "test_p001.png"
+    Image.new("RGB", (2000, 3000), "white").save(page_image)
+
+    cache = ImagePayloadCache(str(tmp_path / "cache"), max_dimension=800)
+    client = StandInLLMClient()
+    extractor = Extractor(client, image_cache=cache, page_images={"test_p001": str(page_image)})
+    section = make_section("Boston Temperance Society - President: John Smith")
+    section.page_regions = {"test_p001": [0.1, 0.5, 0.9, 0.75]}
+
+    records = extractor.extract_from_section(section, run_id="r")
+    extractor.extract_from_section(section, run_id="r")
+
+    assert records[0].metadata["images"] == 1
+    assert client.stats["images"] == 2
+    assert len(list((tmp_path / "cache").rglob("*.jpg"))) == 1
+
+    crop = cache.get_payload(str(page_image), section.page_regions["test_p001"])
+    with Image.open(io.BytesIO(crop.data)) as encoded:
+        assert max(encoded.size) <= 800
+        assert encoded.size[0] > encoded.size[1]  # cropped to a wide band
+        assert encoded.mode == "L"
+
+
+def test_openai_provider_attaches_images_as_data_urls():
+    """Test that images become image_url parts of the user message."""
+    provider = OpenAICompatibleProvider(model_name="standin", base_url="http://localhost/v1")
+    body = provider._request_body("system", "user", [ImagePayload(b"\xff\xd8", key="k")])
+
+    content = body["messages"][1]["content"]
+    assert content[0] == {"type": "text", "text": "user"}
+    assert content[1]["image_url"]["url"].startswith("data:image/jpeg;base64,")
+
+
+def test_gemini_context_cache_recreated_on_expiry_and_not_found():
+    """Test that context caches are rebuilt near their TTL and after a NotFound error."""
+    from types import SimpleNamespace
+
+    class NotFound(Exception):
+        pass
+
+    class CachedModel:
+        def __init__(self, name):
+            self.name = name
+            self.expired = False
+
+        def generate_content(self, prompt, request_options=None):
+            if self.expired:
+                raise NotFound(f"{self.name} expired")
+            return SimpleNamespace(text=self.name, usage_metadata=None)
+
+    class FakeGemini(GeminiProvider):
+        def _create_cached_model(self, system_prompt):
+            self.created.append(CachedModel(f"cache{len(self.created)}"))
+            return self.created[-1]
+
+    provider = FakeGemini(context_cache=True, cache_ttl=100)
+    provider.created = []
+    provider._client = object()
+
+    assert provider.generate("system", "user", timeout=1)["content"] == "cache0"
+    assert provider.generate("system", "user", timeout=1)["content"] == "cache0"
+
+    # Deleted on the server: rebuilt once and the call succeeds
+    provider.created[0].expired = True
+    assert provider.generate("system", "user", timeout=1)["content"] == "cache1"
+
+    # Near the end of its TTL: recreated before use
+    key = next(iter(provider._cached_models))
+    provider._cached_models[key] = (provider.created[1], time.monotonic() - 1)
+    assert provider.generate("system", "user", timeout=1)["content"] == "cache2"
+    assert len(provider.created) == 3
+
+
+def test_openai_provider_retries_gateway_timeouts(monkeypatch):
+    """Test that 408 and 5xx responses are retryable and other 4xx responses are not."""
+    import urllib.error
+    import urllib.request
+
+    provider = OpenAICompatibleProvider(model_name="standin", base_url="http://localhost/v1")
+    for code, error in ((408, RetryableLLMError), (503, RetryableLLMError), (400, LLMCallError)):
+        def urlopen(request, timeout=None, code=code):
+            raise urllib.error.HTTPError(request.full_url, code, "error", {}, None)
+
+        monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+        with pytest.raises(error) as raised:
+            provider._post({}, timeout=1)
+        assert isinstance(raised.value, RetryableLLMError) == (error is RetryableLLMError)
+
+
+def test_cost_ledger_records_calls_and_halts_at_budget(tmp_path):
+    """Test that calls are priced per model and refused once the budget is spent."""
+    ledger = CostLedger(
+        str(tmp_path / "costs.sqlite"), "r",
+        pricing={"standin": {"prompt_per_1k": 1.0, "completion_per_1k": 2.0}},
+        max_cost=0.05, throttle_interval=0.0
+    )
+    extractor = Extractor(StandInLLMClient(), cost_ledger=ledger)
+
+    with pytest.raises(BudgetExceededError):
+        for i in range(20):
+            extractor.extract_from_section(
+                make_section("Boston Temperance Society - President: John Smith", f"s{i}"),
+                run_id="r", raise_on_error=True
+            )
+
+    summary = ledger.summary()
+    assert summary["cost"] >= 0.05
+    assert summary["models"]["standin"]["sections"] == summary["calls"] < 20
+    ledger.close()
+
+    resumed = CostLedger(str(tmp_path / "costs.sqlite"), "r", max_cost=0.05)
+    assert resumed.total_cost == pytest.approx(summary["cost"])
+    with pytest.raises(BudgetExceededError):
+        resumed.acquire()
+
+
+def test_find_gaps_detects_incomplete_extractions():
+    """Test gap detection on members, roles, names and type."""
+    span = "Musical Union — Pres. John Smith; Sec. Mary Jones"
+
+    assert find_gaps({"name": "Musical Union", "members": []}, span) == ["no_members"]
+    assert find_gaps({
+        "name": "Musical Union",
+        "association_type": "singing",
+        "members": [{"full_name": "John Smith"}, {"full_name": "M4ry |ones", "role": "Secretary"}],
+    }, span) == ["missing_roles", "malformed_names", "invalid_type"]
+    assert find_gaps({
+        "name": "Musical Union",
+        "association_type": "musical",
+        "members": [{"full_name": "John Smith", "role": "President"}],
+    }, span) == []
+
+    # Accented names and ordinal suffixes of same-named members are well formed
+    assert find_gaps({
+        "name": "Musical Union",
+        "association_type": "musical",
+        "members": [
+            {"full_name": "Johann Müller", "role": "President"},
+            {"full_name": "José García", "role": "Secretary"},
+            {"full_name": "J. Smith 2d", "role": "Treasurer"},
+            {"full_name": "John McDonald (2d)", "role": "Director"},
+        ],
+    }, span) == []
+
+    # Non-string fields from the model are gaps, not crashes
+    assert find_gaps({
+        "name": ["Musical Union"],
+        "association_type": ["musical"],
+        "members": [{"full_name": 42, "role": "President"}],
+    }, span) == ["malformed_names", "invalid_type"]
+    assert merge_repair(
+        {"name": "Musical Union", "association_type": 7}, {"association_type": 7}, ["invalid_type"]
+    )["association_type"] is None
+
+
+def test_extractor_repairs_gaps_with_entry_span():
+    """Test that a repair call sees only the entry and its fix is merged."""
+    section = make_section(
+        "Boston Temperance Society - President: John Smith, Secretary: Mary Jones\n\n"
+        "Musical Union. Organized 1850. Officers: President A. Brown"
+    )
+    responses = [
+        '[{"name": "Boston Temperance Society", "association_type": "temperance", '
+        '"members": [{"full_name": "John Smith", "role": "President"}, '
+        '{"full_name": "Mary Jones"}]}, {"name": "Musical Union", "members": []}]',
+        '{"name": "Boston Temperance Society", "members": [{"full_name": "John Smith", '
+        '"role": "President"}, {"full_name": "Mary Jones", "role": "Secretary"}]}',
+        '{"name": "Musical Union", "association_type": "musical", '
+        '"members": [{"full_name": "A. Brown", "role": "President"}]}',
+    ]
+    prompts = []
+
+    class RecordingClient(FakeLLMClient):
+        def _generate(self, system_prompt, user_prompt, images=None):
+            prompts.append(user_prompt)
+            return super()._generate(system_prompt, user_prompt, images)
+
+    extractor = Extractor(RecordingClient(responses), repair=True)
+    records = extractor.extract_from_section(section, run_id="r")
+
+    assert [m.role for m in records[0].members] == ["President", "Secretary"]
+    assert records[0].metadata["repair"]["gaps"] == ["missing_roles"]
+    assert records[1].members[0].full_name == "A. Brown"
+    assert records[1].association_type is None  # only member gaps were repaired
+    assert "Musical Union" not in prompts[1] and "Musical Union" in prompts[2]
+    assert extractor.stats["repaired_records"] == 2
+
+
+def test_configured_examples_form_a_cached_prompt_prefix(tmp_path):
+    """Test that examples go in the shared prefix and repeat calls hit the cache."""
+    examples = [{"input": "Hook and Ladder Company - Foreman: A. Brown",
+                 "output": '{"name": "Hook and Ladder Company"}'}]
+    prompts = build_extraction_prompt("Boston", "MA", 1855, "text", examples=examples)
+    assert "Hook and Ladder Company" in prompts["system"]
+    assert "Hook and Ladder Company" not in prompts["user"]
+
+    client = StandInLLMClient()
+    ledger = CostLedger(str(tmp_path / "costs.sqlite"), "r", pricing={
+        "standin": {"prompt_per_1k": 1.0, "cached_prompt_per_1k": 0.25}
+    })
+    extractor = Extractor(client, examples=examples, cost_ledger=ledger)
+    first = extractor.extract_from_section(make_section("Boston Temperance Society", "s1"))
+    second = extractor.extract_from_section(make_section("Musical Union", "s2"))
+
+    assert first[0].metadata["prompt_prefix"] == second[0].metadata["prompt_prefix"]
+    assert "cached_tokens" not in first[0].metadata
+    assert second[0].metadata["cached_tokens"] > 0
+    assert client.stats["prefix_cache_hits"] == 1
+    assert ledger.summary()["cached_tokens"] == second[0].metadata["cached_tokens"]
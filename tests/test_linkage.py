@@ -0,0 +1,311 @@
+"""Tests for person linkage."""
+
+import sqlite3
+
+from civic_associations.db import DatabaseWriter
+from civic_associations.linkage import PersonLinker, blocking_keys, nysiis, soundex, split_name
+from civic_associations.models import AssociationRecord, Member
+
+
+def _record(association_id, year, names):
+    return AssociationRecord(
+        association_id=association_id,
+        name=f"Society {association_id}",
+        city="Boston",
+        state="MA",
+        year=year,
+        source_pages=["test_p001"],
+        raw_section_text="Test text",
+        members=[Member(full_name=name) for name in names],
+        extraction_run_id="test_run"
+    )
+
+
+def _persons(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT p.person_id, m.full_name FROM person_clusters p
+            JOIN members m ON m.member_id = p.member_id
+        """).fetchall()
+    finally:
+        conn.close()
+    persons = {}
+    for person_id, full_name in rows:
+        persons.setdefault(person_id, set()).add(full_name)
+    return sorted(persons.values(), key=lambda names: sorted(names))
+
+
+def test_phonetic_codes():
+    """Test Soundex and NYSIIS codes of surnames."""
+    assert soundex("Robert") == soundex("Rupert") == "R163"
+    assert soundex("Ashcraft") == "A261"
+    assert soundex("Smith") == soundex("Smyth") == "S530"
+    assert nysiis("Macintosh") == "MCANT"
+    assert nysiis("Johnson") == nysiis("Jonson")
+
+
+def test_split_name_and_keys():
+    """Test name normalization and blocking keys."""
+    assert split_name("Smith, John H.") == ("john h", "smith")
+    assert split_name("Rev. John Smith, Jr.") == ("john", "smith")
+    assert split_name("") == ("", "")
+    assert split_name("Johann Müller") == ("johann", "muller")
+    assert split_name("García, José") == ("jose", "garcia")
+
+    keys = blocking_keys("john h", "smith")
+    assert keys == ["S:S530:j", "N:SNAT:j", "I:jh:smith"]
+    assert blocking_keys("", "") == []
+
+
+def test_person_linker_incremental(tmp_path):
+    """Test linking across directories, then adding a new directory."""
+    db_path = str(tmp_path / "test.sqlite")
+    writer = DatabaseWriter(db_path)
+    writer.write_records([
+        _record("a1855", 1855, ["John Smith", "Mary Jones", "Wm. Brown"]),
+        _record("b1860", 1860, ["Smyth, John", "Mary A. Jones", "Thomas Brown"]),
+    ])
+
+    stats = PersonLinker(db_path).link()
+
+    assert stats["new_members"] == 6
+    assert _persons(db_path) == [
+        {"John Smith", "Smyth, John"},
+        {"Mary A. Jones", "Mary Jones"},
+        {"Thomas Brown"},
+        {"Wm. Brown"},
+    ]
+
+    # A new directory links into existing persons; old pairs are not re-scored
+    writer.write_records([_record("c1865", 1865, ["J. Smith", "Mrs. Mary Jones"])])
+    stats = PersonLinker(db_path).link()
+
+    assert stats["new_members"] == 2
+    assert stats["updated"] == 2
+    persons = _persons(db_path)
+    assert {"John Smith", "Smyth, John", "J. Smith"} in persons
+    assert {"Mary A. Jones", "Mary Jones", "Mrs. Mary Jones"} in persons
+
+    assert PersonLinker(db_path).link()["new_members"] == 0
+
+
+def test_person_linker_initial_does_not_bridge_names(tmp_path):
+    """Test that an initial cannot merge members with different given names."""
+    db_path = str(tmp_path / "test.sqlite")
+    writer = DatabaseWriter(db_path)
+    writer.write_records([
+        _record("a1855", 1855, ["John Smith", "J. Smith"]),
+        _record("b1860", 1860, ["James Smith", "Jane Smith", "Joseph Smith"]),
+    ])
+
+    PersonLinker(db_path).link()
+    full_names = {"John Smith", "James Smith", "Jane Smith", "Joseph Smith"}
+
+    # "J. Smith" joins at most one of them
+    persons = _persons(db_path)
+    assert len(persons) == 4
+    assert all(len(person & full_names) == 1 for person in persons)
+
+    # A later "J." member cannot bridge the existing persons either
+    writer.write_records([_record("c1865", 1865, ["J. Smith"])])
+    PersonLinker(db_path).link()
+    persons = _persons(db_path)
+    assert all(len(person & full_names) == 1 for person in persons)
+
+
+def test_minhash_estimates_jaccard():
+    """Test that MinHash signatures estimate Jaccard similarity."""
+    from civic_associations.linkage import MinHasher, estimate_jaccard, lsh_candidates
+
+    hasher = MinHasher(num_perm=256, seed=3)
+    a = {f"t{i}" for i in range(100)}
+    b = {f"t{i}" for i in range(20, 120)}  # Jaccard 80/120
+    c = {f"x{i}" for i in range(100)}
+
+    sig_a, sig_b, sig_c = (hasher.signature(s) for s in (a, b, c))
+
+    assert abs(estimate_jaccard(sig_a, sig_b) - 80 / 120) < 0.1
+    assert estimate_jaccard(sig_a, sig_c) < 0.1
+    assert lsh_candidates({"a": sig_a, "b": sig_b, "c": sig_c}, bands=64) == {("a", "b")}
+
+
+def test_association_linker_builds_lineage(tmp_path):
+    """Test chaining renamed associations across years, but not unrelated ones."""
+    from civic_associations.linkage import AssociationLinker
+
+    db_path = str(tmp_path / "test.sqlite")
+    writer = DatabaseWriter(db_path)
+    officers = ["John Smith", "Mary Jones", "William Brown", "Thomas Clark"]
+    records = [
+        _record("lodge1855", 1855, officers),
+        _record("lodge1856", 1856, officers[:3] + ["Henry Adams"]),
+        _record("lodge1857", 1857, officers),
+        _record("choir1856", 1856, ["Sarah Wells", "James Hart"]),
+    ]
+    records[0].name = "Boston Lodge No. 12, I.O.O.F."
+    records[1].name = "Boston Lodge, No. 12 I. O. O. F."
+    records[2].name = "Boston Lodge No 12 IOOF"
+    records[3].name = "Handel and Haydn Society"
+    writer.write_records(records[:2] + records[3:])
+
+    linker = AssociationLinker(db_path)
+    stats = linker.link()
+    assert stats["sketched"] == 3
+    assert stats["links"] == 1
+
+    # A later directory extends the chain; only it is sketched
+    writer.write_records([records[2]])
+    stats = linker.link()
+    assert stats["sketched"] == 1
+
+    conn = sqlite3.connect(db_path)
+    try:
+        lineage = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT association_id, lineage_id, predecessor_id, position FROM association_lineage"
+            )
+        }
+    finally:
+        conn.close()
+
+    assert lineage["lodge1855"] == ("lodge1855", None, 0)
+    assert lineage["lodge1856"] == ("lodge1855", "lodge1855", 1)
+    assert lineage["lodge1857"] == ("lodge1855", "lodge1856", 2)
+    assert lineage["choir1856"] == ("choir1856", None, 0)
+
+
+def test_parse_name():
+    """Test splitting honorifics, given names, initials, surnames and suffixes."""
+    from civic_associations.utils.names import parse_name, parse_names
+
+    parsed = parse_name("Jno. W. Smith, jr.")
+    assert parsed.given_names == "John W."
+    assert parsed.initials == "JW"
+    assert parsed.surname == "Smith"
+    assert parsed.name_suffix == "Jr."
+    assert parsed.normalized_name == "john w smith"
+
+    assert parse_name("Rev. Chas. H. de la Mare").honorific == "Rev."
+    assert parse_name("Rev. Chas. H. de la Mare").surname == "de la Mare"
+    assert parse_name("SMITH, WM.").normalized_name == "william smith"
+    assert parse_name("J.W. McNeil").given_names == "J. W."
+
+    # Non-ASCII letters belong to the name; matching keys fold them to ASCII
+    parsed = parse_name("José García")
+    assert (parsed.given_names, parsed.surname) == ("José", "García")
+    assert parsed.normalized_name == "jose garcia"
+    assert parse_name("Johann Müller").surname == "Müller"
+
+    # Dotted post-nominals, after a comma or not, are suffixes
+    for name in ("Dr. Geo. Hall, M.D.", "Dr. Geo. Hall M. D."):
+        parsed = parse_name(name)
+        assert (parsed.honorific, parsed.given_names, parsed.surname, parsed.name_suffix) == (
+            "Dr.", "George", "Hall", "M.D."
+        )
+
+    columns = parse_names(["Wm. Brown", "Thos. Clark", "Wm. Brown"])
+    assert columns["given_names"] == ["William", "Thomas", "William"]
+
+
+def test_member_name_columns_migrated_and_backfilled(tmp_path):
+    """Test that an old members table gains parsed columns for existing rows."""
+    db_path = str(tmp_path / "old.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE members (
+            member_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            association_id TEXT,
+            full_name TEXT NOT NULL,
+            role TEXT,
+            notes TEXT
+        );
+        INSERT INTO members (association_id, full_name, role) VALUES ('a', 'Chas. Brown', 'Sec''y');
+    """)
+    conn.close()
+
+    DatabaseWriter(db_path).write_records([_record("b", 1860, ["Geo. Hall, Esq."])])
+
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT given_names, surname, name_suffix, role_normalized FROM members ORDER BY member_id"
+        ).fetchall()
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(members)")}
+    finally:
+        conn.close()
+
+    assert rows == [("Charles", "Brown", None, "Secretary"), ("George", "Hall", "Esq.", None)]
+    assert "idx_members_surname" in indexes
+
+
+def _network(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        persons = sorted(conn.execute("""
+            SELECT ma.full_name, mb.full_name, n.shared_associations FROM person_network n
+            JOIN members ma ON ma.member_id = n.person_a
+            JOIN members mb ON mb.member_id = n.person_b
+        """))
+        associations = sorted(conn.execute("SELECT * FROM association_network"))
+    finally:
+        conn.close()
+    return persons, associations
+
+
+def test_membership_network_incremental(tmp_path):
+    """Test projections after loads and relinking match a full rebuild."""
+    import numpy as np
+    from civic_associations.linkage import MembershipNetwork, cooccurrence
+
+    i, j, counts = cooccurrence(np.array([0, 1, 2, 0, 1]), np.array([0, 0, 0, 1, 1]), 3)
+    assert sorted(zip(i.tolist(), j.tolist(), counts.tolist())) == [(0, 1, 2), (0, 2, 1), (1, 2, 1)]
+
+    db_path = str(tmp_path / "test.sqlite")
+    writer = DatabaseWriter(db_path)
+    writer.write_records([
+        _record("a", 1855, ["John Smith", "Mary Jones", "Wm. Brown"]),
+        _record("b", 1855, ["John Smith", "Mary Jones"]),
+        _record("c", 1855, ["Sarah Wells"]),
+    ])
+    network = MembershipNetwork(db_path)
+    assert network.update()["associations"] == 3
+
+    # Unlinked members are persons of their own
+    persons, associations = _network(db_path)
+    assert ("John Smith", "Mary Jones", 1) in persons
+    assert associations == []
+
+    # Linking merges the two John Smiths and Mary Joneses into persons
+    PersonLinker(db_path).link()
+    network.update()
+    persons, associations = _network(db_path)
+    assert ("John Smith", "Mary Jones", 2) in persons
+    assert associations == [("a", "b", 2)]
+
+    # A changed association only rewrites its own pairs
+    writer.write_records([_record("c", 1855, ["Sarah Wells", "Wm. Brown"])])
+    PersonLinker(db_path).link()
+    stats = network.update()
+    assert stats["associations"] == 1
+    incremental = _network(db_path)
+    assert ("a", "c", 1) in incremental[1]
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        "DELETE FROM membership_edges; DELETE FROM person_network; DELETE FROM association_network;"
+    )
+    conn.close()
+    network.update()
+    assert _network(db_path) == incremental
+
+    paths = network.export(str(tmp_path / "export"))
+    assert {path.name for path in paths} >= {"persons.csv", "person_network.npz", "membership.mtx"}
+    matrix = np.load(tmp_path / "export" / "association_network.npz")
+    assert matrix["format"].item() == b"csr"
+    assert tuple(matrix["shape"]) == (3, 3)
+    assert matrix["data"].tolist() == [2, 1, 2, 1]
+    header = (tmp_path / "export" / "association_network.mtx").read_text().splitlines()
+    assert header[0] == "%%MatrixMarket matrix coordinate integer symmetric"
+    assert header[2:] == ["3 3 2", "2 1 2", "3 1 1"]
@@ -40,3 +40,62 @@ def test_find_sections_single_page():
     
     sections = finder.find_sections([ocr_result], "Boston", "MA", 1855)
     assert len(sections) > 0
+
+
+def _block(text, bbox, label="text"):
+    return {"text": text, "label": label, "bbox": bbox}
+
+
+def test_section_regions_cover_only_section_blocks():
+    """Test that page regions are cut to the section's blocks, not the whole page."""
+    finder = SectionFinder()
+    first = PageOCR(
+        page_id="test_p001", text_md="", text_plain="Associations",
+        blocks=[
+            _block("BOSTON DIRECTORY", [0.1, 0.02, 0.9, 0.05], "page_header"),
+            _block("Adams John, grocer, 12 Main", [0.1, 0.1, 0.9, 0.4]),
+            _block("SOCIETIES AND ASSOCIATIONS", [0.3, 0.45, 0.7, 0.48], "section_header"),
+            _block("Boston Temperance Society", [0.1, 0.5, 0.9, 0.8]),
+            _block("12", [0.45, 0.95, 0.55, 0.97], "page_footer"),
+        ]
+    )
+    second = PageOCR(
+        page_id="test_p002", text_md="", text_plain="Masonic Lodge",
+        blocks=[
+            _block("BOSTON DIRECTORY", [0.1, 0.02, 0.9, 0.05], "page_header"),
+            _block("Masonic Lodge", [0.12, 0.1, 0.88, 0.6]),
+        ]
+    )
+    no_layout = PageOCR(page_id="test_p003", text_md="", text_plain="Odd Fellows")
+
+    section = finder.find_sections([first, second, no_layout], "Boston", "MA", 1855)[0]
+
+    assert section.page_regions == {
+        "test_p001": [0.1, 0.45, 0.9, 0.8],
+        "test_p002": [0.12, 0.1, 0.88, 0.6],
+    }
+
+
+def test_docling_layout_blocks():
+    """Test conversion of Docling provenance boxes to normalized top-left blocks."""
+    from types import SimpleNamespace
+    from civic_associations.ocr.docling_client import layout_blocks
+
+    class BoundingBox(SimpleNamespace):
+        def to_top_left_origin(self, page_height):
+            # Bottom-left origin, as in PDF coordinates
+            return BoundingBox(l=self.l, t=page_height - self.t, r=self.r, b=page_height - self.b)
+
+    heading = SimpleNamespace(
+        text="SOCIETIES", label=SimpleNamespace(value="section_header"),
+        prov=[SimpleNamespace(page_no=1, bbox=BoundingBox(l=100, t=900, r=300, b=850))]
+    )
+    document = SimpleNamespace(
+        pages={1: SimpleNamespace(size=SimpleNamespace(width=1000, height=1000))},
+        iterate_items=lambda: iter([(heading, 1)])
+    )
+
+    assert layout_blocks(document) == [{
+        "text": "SOCIETIES", "label": "section_header", "page_no": 1,
+        "bbox": [0.1, 0.1, 0.3, 0.15],
+    }]
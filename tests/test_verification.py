@@ -2,7 +2,22 @@
 
 import pytest
 from civic_associations.models import AssociationRecord, Member
-from civic_associations.verification import compute_similarity, verify_record
+from civic_associations.verification import (
+    RuleEngine,
+    ShardedVerifier,
+    SimilarityEngine,
+    aggregate_records,
+    compute_similarity,
+    iter_groups_external,
+    iter_groups_in_memory,
+    levenshtein_distance,
+    mean_pairwise_similarity,
+    verify_record,
+)
+from civic_associations.verification.similarity import (
+    batch_levenshtein_distance,
+    batch_token_set_similarity,
+)
 
 
 def test_verify_record_valid():
@@ -59,6 +74,41 @@ def test_verify_record_missing_location():
     assert "location" in error.lower() or "fields" in error.lower()
 
 
+def test_rule_engine_batch_masks_and_reasons():
+    """Test config-driven rules evaluated over a batch of records."""
+    engine = RuleEngine({
+        "name": {"required": True, "similarity_weight": 2.0},
+        "year": {"min": 1800, "max": 1950},
+        "association_type": {"allowed": ["temperance", "fraternal"]},
+    })
+    base = {
+        "association_id": "a",
+        "name": "Boston Temperance Society",
+        "association_type": "temperance",
+        "city": "Boston",
+        "state": "MA",
+        "year": 1855,
+        "source_pages": ["test_p001"],
+    }
+    records = [
+        base,
+        dict(base, name="X", year=1999),
+        dict(base, city="", state=None, association_type="Social"),
+        AssociationRecord(**base, raw_section_text="Test", extraction_run_id="run"),
+    ]
+
+    results = engine.evaluate(records)
+
+    assert results.valid.tolist() == [True, False, False, True]
+    assert results.masks["year.max"].tolist() == [False, True, False, False]
+    assert results.failed_rules(1) == ["name.min_length", "year.max"]
+    assert results.reasons(2) == [
+        "Missing required fields: city, state",
+        "association_type not an allowed value: 'Social'",
+    ]
+    assert results.failure_counts()["name.min_length"] == 1
+
+
 def test_compute_similarity_exact_match():
     """Test similarity computation with exact match."""
     record1 = AssociationRecord(
@@ -87,3 +137,185 @@ def test_compute_similarity_exact_match():
     
     similarity = compute_similarity(record1, record2)
     assert similarity == 1.0
+
+
+
+def make_record(name, run_id, association_type="temperance", members=None):
+    """Build a test record for one extraction run."""
+    return AssociationRecord(
+        association_id="test_id",
+        name=name,
+        association_type=association_type,
+        city="Boston",
+        state="MA",
+        year=1855,
+        source_pages=["test_p001"],
+        raw_section_text="Test",
+        members=members or [],
+        extraction_run_id=run_id
+    )
+
+
+def _reference_distance(a, b):
+    """Textbook dynamic-programming edit distance."""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def test_bit_parallel_levenshtein_matches_reference():
+    """Test scalar and batched edit distance against dynamic programming."""
+    import random
+
+    rng = random.Random(0)
+    alphabet = "abcé .'"
+    left = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 90))) for _ in range(300)]
+    right = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 90))) for _ in range(300)]
+    expected = [_reference_distance(a, b) for a, b in zip(left, right)]
+
+    assert [levenshtein_distance(a, b) for a, b in zip(left, right)] == expected
+    assert batch_levenshtein_distance(left, right).tolist() == expected
+
+
+def test_token_set_ignores_order_and_extra_words():
+    """Test token-set similarity on reordered and extended names."""
+    scores = batch_token_set_similarity(
+        ["boston temperance society", "boston temperance society", "hunting club"],
+        ["temperance society boston", "boston temperance society inc", "musical union"]
+    )
+    assert scores[0] == 1.0
+    assert scores[1] == 1.0
+    assert scores[2] < 0.5
+
+
+def test_similarity_matrix_uses_field_weights():
+    """Test run-by-run matrices and configured field weights."""
+    runs = [
+        make_record("Boston Temperance Society", "r1", members=[Member(full_name="John Smith", role="President")]),
+        make_record("Boston Temperance Society", "r2", members=[Member(full_name="John Smith", role="President")]),
+        make_record("Boston Temperence Society", "r3", members=[Member(full_name="Jon Smith", role="President")]),
+    ]
+    engine = SimilarityEngine.from_config({
+        "metrics": ["levenshtein"],
+        "field_rules": {"name": {"similarity_weight": 1.0}, "members": {"similarity_weight": 0.0}},
+    })
+
+    (matrix,) = engine.similarity_matrices([runs])
+
+    assert matrix.shape == (3, 3)
+    assert matrix[0, 1] == 1.0
+    assert matrix[0, 2] == pytest.approx(1 - 1 / 25)
+    assert mean_pairwise_similarity(matrix) == pytest.approx((1 + 2 * (1 - 1 / 25)) / 3)
+    assert 0.9 < compute_similarity(runs[0], runs[2]) < 1.0
+
+
+def test_aggregate_records_votes_and_aligns_members():
+    """Test consensus name, type and members across runs."""
+    runs = [
+        make_record("Boston Temperance Society", "r1", members=[
+            Member(full_name="John Smith", role="President"),
+            Member(full_name="Mary Jones", role="Secretary"),
+        ]),
+        make_record("Boston Temperance Society", "r2", association_type="benevolent", members=[
+            Member(full_name="Mary Jones"),
+            Member(full_name="John Smith", role="President"),
+            Member(full_name="Page 12"),
+        ]),
+        make_record("Boston Temperence Society", "r3", members=[
+            Member(full_name="Jon Smith", role="President"),
+            Member(full_name="Mary Jones", role="Secretary"),
+        ]),
+    ]
+
+    consensus = aggregate_records(runs)
+
+    assert consensus.name == "Boston Temperance Society"
+    assert consensus.association_type == "temperance"
+    assert [(m.full_name, m.role) for m in consensus.members] == [
+        ("John Smith", "President"), ("Mary Jones", "Secretary")
+    ]
+    aggregation = consensus.metadata["aggregation"]
+    assert aggregation["agreement"]["name"] == pytest.approx(2 / 3, abs=1e-3)
+    assert aggregation["member_agreement"] == [1.0, 1.0]
+    assert aggregation["members_dropped"] == 1
+
+
+def test_aggregate_records_scales_to_large_member_lists():
+    """Test alignment of hundreds of members over dozens of runs."""
+    import random
+
+    rng = random.Random(0)
+    surnames = sorted({
+        "".join(rng.choice("bcdfghklmnprstvw") + rng.choice("aeiou") for _ in range(3)).title()
+        for _ in range(300)
+    })
+    people = [f"{rng.choice(['John', 'Mary', 'Wm.', 'Chas.'])} {surname}" for surname in surnames]
+    runs = []
+    for r in range(24):
+        members = [Member(full_name=p, role="Member") for p in people if rng.random() > 0.1]
+        rng.shuffle(members)
+        runs.append(make_record("Boston Lodge", f"r{r}", members=members))
+
+    consensus = aggregate_records(runs)
+
+    assert sorted(m.full_name for m in consensus.members) == sorted(people)
+
+
+def test_external_grouping_matches_in_memory(tmp_path):
+    """Test that the spill-file merge sort yields the same groups."""
+    import random
+
+    from civic_associations.utils import write_jsonl
+
+    rng = random.Random(0)
+    run_files = []
+    for run in range(3):
+        records = [
+            {"association_id": f"a{rng.randint(0, 40):02d}", "run": run, "line": i}
+            for i in range(50)
+        ]
+        run_files.append(tmp_path / f"run_{run}.jsonl")
+        write_jsonl(records, str(run_files[-1]))
+
+    expected = sorted(iter_groups_in_memory(run_files))
+    grouped = list(iter_groups_external(
+        run_files, chunk_size=7, spill_dir=str(tmp_path), max_open_files=4
+    ))
+
+    assert grouped == expected
+    assert not list(tmp_path.glob("verify_spill_*"))  # spill files cleaned up
+
+
+def test_sharded_verification_matches_serial():
+    """Test that sharding across processes keeps results and their order."""
+    groups = []
+    for a in range(12):
+        record = {
+            "association_id": f"assoc_{a}",
+            "name": f"Society Number {'ABCDEFGHIJKL'[a]}",
+            "city": "Boston",
+            "state": "MA",
+            "year": 1855,
+            "members": [{"full_name": "John Smith", "role": "President"}],
+            "source_pages": ["test_p001"],
+            "raw_section_text": "Test text",
+        }
+        runs = [dict(record, extraction_run_id=f"run_{r}") for r in range(3)]
+        if a % 4 == 0:
+            runs[1]["name"] = "Something Else Entirely"
+        groups.append((record["association_id"], runs))
+
+    with ShardedVerifier({}, workers=1) as serial:
+        expected = serial.verify_batch(groups)
+    with ShardedVerifier({}, workers=3) as sharded:
+        results = sharded.verify_batch(groups)
+        timings = sharded.timings()
+
+    assert [r[:2] for r in results] == [r[:2] for r in expected]
+    assert [r[2] for r in results] == [r[2] for r in expected]
+    assert {r[1] for r in results} == {"accepted", "needs_review"}
+    assert sum(t["groups"] for t in timings) == len(groups)